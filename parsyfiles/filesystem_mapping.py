@@ -1,8 +1,28 @@
 from abc import abstractmethod, ABCMeta
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from errno import ENOENT, ENOTDIR
+from fnmatch import translate
+from io import BytesIO, TextIOWrapper, StringIO
+from json import load, dump
 from logging import Logger
-from os import listdir
-from os.path import isfile, join, isdir, dirname, basename, exists
-from typing import Dict, List, Any, Tuple, Union
+from os import scandir, stat, replace, getpid, sep, remove
+from os.path import join, isdir, dirname, basename, exists, normpath, abspath
+from shutil import copyfileobj
+from sys import intern
+from tempfile import NamedTemporaryFile
+import bz2
+import gzip
+import lzma
+import posixpath
+import re
+import tarfile
+from threading import RLock, local
+from time import time
+from typing import Dict, List, Any, Tuple, Union, Iterable, Set, Pattern
+from warnings import warn
+from weakref import finalize
+from zipfile import ZipFile, ZipInfo
 
 from parsyfiles.var_checker import check_var
 
@@ -243,6 +263,9 @@ class PersistedObject(metaclass=ABCMeta):
     extension MULTIFILE) or a single file (in which cse it has an extension such as .txt, .cfg, etc.
     """
 
+    # no slots here, but this allows subclasses to declare __slots__ in order to have no __dict__
+    __slots__ = ()
+
     def __init__(self, location: str, is_singlefile: bool, ext: str):
         """
         Constructor. A persisted object has a given filesystem location, is a singlefile or not (in which case it has
@@ -308,6 +331,28 @@ class PersistedObject(metaclass=ABCMeta):
         """
         pass
 
+    def has_local_singlefile_path(self) -> bool:
+        """
+        Returns True if the path returned by get_singlefile_path is a file on the local file system, that can be opened
+        with open(). Implementing classes representing files stored elsewhere (for example in an archive) should
+        return False, and provide their contents through open_singlefile_stream.
+        :return:
+        """
+        return True
+
+    def open_singlefile_stream(self, binary: bool = False):
+        """
+        Opens and returns a stream to read this singlefile object. The caller is responsible for closing it. The default
+        implementation opens the file at get_singlefile_path() with get_singlefile_encoding().
+
+        :param binary: True to get a binary stream, False (default) to get a text stream using the file encoding
+        :return:
+        """
+        if binary:
+            return open(self.get_singlefile_path(), 'rb')
+        else:
+            return open(self.get_singlefile_path(), 'r', encoding=self.get_singlefile_encoding())
+
     @abstractmethod
     def get_multifile_children(self) -> Dict[str, Any]: # actually, not Any but PersistedObject
         """
@@ -331,6 +376,410 @@ class FolderAndFilesStructureError(Exception):
                                             + found_size + ' files')
 
 
+class _DirectorySnapshot(object):
+    """
+    An in-memory snapshot of the contents of a folder, obtained with a single listing of the folder. Files are also
+    indexed by name without extension, so that the singlefile occurrences of an object can be found
+    without iterating over the whole listing again, and by sorted name so that all files starting with a given prefix
+    (flat mode) can be found with a range query.
+    """
+
+    def __init__(self, dir_path: str, contents: Tuple[Iterable[str], Iterable[str]]):
+        """
+        Creates the snapshot of the folder at dir_path from its contents.
+
+        :param dir_path:
+        :param contents: a tuple (subfolders, files) of the names of the entries in this folder, as returned by
+        list_dir() on a file system
+        """
+        self.dir_path = dir_path
+        self.subfolders = set(contents[0])
+        self.files = set(contents[1])
+
+        # index of files by name without extension {stem: {ext: file_name}}
+        self.files_by_stem = dict()
+        for file_name in self.files:
+            if EXT_SEPARATOR in file_name:
+                idx = file_name.rindex(EXT_SEPARATOR)
+                stem = file_name[0:idx]
+                if stem in self.files_by_stem:
+                    self.files_by_stem[stem][file_name[idx:]] = file_name
+                else:
+                    self.files_by_stem[stem] = {file_name[idx:]: file_name}
+
+        # sorted list of file names, created on first prefix query
+        self._sorted_files = None
+
+    def is_subfolder(self, name: str) -> bool:
+        return name in self.subfolders
+
+    def find_files_with_prefix(self, prefix: str) -> List[str]:
+        """
+        Returns the sorted list of file names starting with prefix. Since all such names are contiguous in the sorted
+        list of names, this is a binary search followed by a scan of the matching names only.
+
+        :param prefix:
+        :return:
+        """
+        if self._sorted_files is None:
+            self._sorted_files = sorted(self.files)
+        sorted_files = self._sorted_files
+
+        res = []
+        for i in range(bisect_left(sorted_files, prefix), len(sorted_files)):
+            if not sorted_files[i].startswith(prefix):
+                break
+            res.append(sorted_files[i])
+        return res
+
+
+class _NameFilter(object):
+    """
+    A filter on the names of files and folders, built from include and exclude patterns (see
+    FileMappingConfiguration constructor for their semantics).
+    """
+
+    def __init__(self, include: List[Union[str, Pattern]] = None, exclude: List[Union[str, Pattern]] = None):
+        """
+        :param include: patterns of the names of the files to consider. None means all files.
+        :param exclude: patterns of the names of the files and folders to ignore
+        """
+        check_var(include, var_types=list, var_name='include', enforce_not_none=False)
+        check_var(exclude, var_types=list, var_name='exclude', enforce_not_none=False)
+
+        # include patterns, matched against file names
+        self._include_files = None if include is None else [_compile_name_pattern(p) for p in include]
+
+        # exclude patterns: glob patterns matched against all names, glob patterns matched against folder names
+        # followed by '/', and regular expressions matched against file names or folder names followed by '/'
+        self._exclude_names = []
+        self._exclude_folders = []
+        self._exclude_regexes = []
+        for pattern in (exclude or []):
+            if not isinstance(pattern, str):
+                self._exclude_regexes.append(_compile_name_pattern(pattern))
+            elif pattern.endswith('/'):
+                self._exclude_folders.append(_compile_name_pattern(pattern))
+            else:
+                self._exclude_names.append(_compile_name_pattern(pattern))
+
+    def excludes_name(self, name: str) -> bool:
+        """
+        Returns True if an entry with this name is excluded whatever its type, so that its type does not need to be
+        checked.
+
+        :param name:
+        :return:
+        """
+        return any(p.match(name) for p in self._exclude_names)
+
+    def accepts_folder(self, name: str) -> bool:
+        return not self.excludes_name(name) \
+               and not any(p.match(name + '/') for p in self._exclude_folders + self._exclude_regexes)
+
+    def accepts_file(self, name: str) -> bool:
+        return not self.excludes_name(name) and not any(p.match(name) for p in self._exclude_regexes) \
+               and (self._include_files is None or any(p.match(name) for p in self._include_files))
+
+    def filter(self, subfolders: Iterable[str], files: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        Applies this filter to a folder listing
+
+        :param subfolders:
+        :param files:
+        :return: a tuple (subfolders, files) containing only the accepted names
+        """
+        return {name for name in subfolders if self.accepts_folder(name)}, \
+               {name for name in files if self.accepts_file(name)}
+
+
+# the type of compiled regular expressions (typing.Pattern can not be used with isinstance)
+_REGEX_TYPE = type(re.compile(''))
+
+
+def _compile_name_pattern(pattern: Union[str, Pattern]) -> Pattern:
+    """
+    Utility method to compile a name pattern. Glob patterns are translated to regular expressions matching the whole
+    name. Compiled regular expressions are modified so that they also have to match the whole name.
+
+    :param pattern:
+    :return:
+    """
+    if isinstance(pattern, str):
+        check_var(pattern, var_types=str, var_name='pattern', min_len=1)
+        return re.compile(translate(pattern))
+    elif isinstance(pattern, _REGEX_TYPE):
+        return re.compile('(?:' + pattern.pattern + r')\Z', pattern.flags)
+    else:
+        raise TypeError('Error, patterns should be glob strings or compiled regular expressions, found: '
+                        + str(type(pattern)))
+
+
+class _LocalFileSystem(object):
+    """
+    The file system used by default by file mapping configurations: the local file system, accessed through os
+    functions. Folders are listed with a single os.scandir call. The type of each entry (file or folder) is read from
+    the DirEntry objects so that on most platforms no additional stat call is required.
+
+    Other file systems (archives...) should provide the same methods.
+    """
+
+    # True if the paths on this file system can be opened directly with open()
+    is_local = True
+
+    def list_dir(self, dir_path: str, name_filter: '_NameFilter' = None) -> Tuple[Set[str], Set[str]]:
+        """
+        Lists the folder at dir_path. Entries that are neither files nor folders (for example broken links) are
+        ignored, as os.path.isfile and os.path.isdir would do.
+
+        :param dir_path:
+        :param name_filter: an optional filter. It is applied during the listing, so that the type of the entries
+        excluded by name is never checked.
+        :return: a tuple (subfolders, files) of entry names
+        """
+        subfolders = set()
+        files = set()
+        with scandir(dir_path) as entries:
+            for entry in entries:
+                if name_filter is not None and name_filter.excludes_name(entry.name):
+                    continue
+                if _entry_is_dir(entry):
+                    if name_filter is None or name_filter.accepts_folder(entry.name):
+                        subfolders.add(entry.name)
+                elif _entry_is_file(entry):
+                    if name_filter is None or name_filter.accepts_file(entry.name):
+                        files.add(entry.name)
+        return subfolders, files
+
+    def isdir(self, path: str) -> bool:
+        return isdir(path)
+
+    def exists(self, path: str) -> bool:
+        return exists(path)
+
+    def get_fingerprint(self, folders: List[str], files: List[str], scan_start: float = None) -> Tuple:
+        """
+        Returns a fingerprint made of the modification time of each folder and of the size of each file. Missing paths
+        are part of the fingerprint too. If a folder was modified less than _ScanManifest.RACY_DELAY seconds before
+        scan_start, its modification time may not change on the next modification, and if it was modified after
+        scan_start the scan may have missed the modification: in both cases None is returned.
+
+        :param folders:
+        :param files:
+        :param scan_start: the time at which the scan of the folders started. Default is None, meaning now.
+        :return:
+        """
+        fingerprint = []
+        racy_after = (time() if scan_start is None else scan_start) - _ScanManifest.RACY_DELAY
+        for path in folders:
+            try:
+                mtime_ns = stat(path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            else:
+                if mtime_ns / 1e9 >= racy_after:
+                    return None
+            fingerprint.append((path, mtime_ns))
+        for path in files:
+            try:
+                size = stat(path).st_size
+            except OSError:
+                size = None
+            fingerprint.append((path, size))
+        return tuple(fingerprint)
+
+    def open(self, path: str, encoding: str = None):
+        """
+        Opens the file at path. The caller is responsible for closing the stream.
+
+        :param path:
+        :param encoding: the encoding to use to open a text stream, or None to open a binary stream
+        :return:
+        """
+        if encoding is None:
+            return open(path, 'rb')
+        else:
+            return open(path, 'r', encoding=encoding)
+
+
+_LOCAL_FILE_SYSTEM = _LocalFileSystem()
+
+
+def _entry_is_dir(entry) -> bool:
+    """
+    Utility method to check if a DirEntry is a folder, with the same semantics than os.path.isdir (links are followed
+    and errors mean False)
+
+    :param entry:
+    :return:
+    """
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _entry_is_file(entry) -> bool:
+    """
+    Utility method to check if a DirEntry is a file, with the same semantics than os.path.isfile (links are followed
+    and errors mean False)
+
+    :param entry:
+    :return:
+    """
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+class _ScanManifest(object):
+    """
+    A file storing the listings of local folders between scans, together with the modification time of each folder.
+    Since the modification time of a folder changes whenever an entry is added, removed or renamed in it, a folder
+    whose modification time did not change does not need to be listed again.
+
+    Listings that were made less than RACY_DELAY seconds after the last modification of the folder are not reused:
+    on file systems with a coarse time resolution, the folder could have been modified again without its
+    modification time changing.
+    """
+
+    RACY_DELAY = 2
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str):
+        """
+        Constructor. The manifest file is read on first use.
+
+        :param path: the path of the manifest file. It does not have to exist.
+        """
+        self.path = path
+        self._folders = None
+        self._modified = False
+        self._lock = RLock()
+
+    def __getstate__(self):
+        # copies sent to other processes read the manifest file again on first use
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def list_dir(self, dir_path: str) -> Tuple[Iterable[str], Iterable[str]]:
+        """
+        Returns the contents of the folder at dir_path, from the manifest if the folder did not change since it was last
+        listed, or by listing it and updating the manifest.
+
+        :param dir_path:
+        :return: a tuple (subfolders, files) of entry names
+        """
+        key = abspath(dir_path)
+        mtime_ns = stat(dir_path).st_mtime_ns
+
+        with self._lock:
+            if self._folders is None:
+                self._folders = self._read()
+            entry = self._folders.get(key, None)
+
+        if entry is not None and entry['mtime_ns'] == mtime_ns \
+                and entry['listed_at'] - mtime_ns / 1e9 > _ScanManifest.RACY_DELAY:
+            return entry['subfolders'], entry['files']
+        else:
+            # the listing time is taken before listing, so that a modification during the listing makes it racy
+            listed_at = time()
+            subfolders, files = _LOCAL_FILE_SYSTEM.list_dir(dir_path)
+            with self._lock:
+                self._folders[key] = {'mtime_ns': mtime_ns, 'listed_at': listed_at,
+                                      'subfolders': sorted(subfolders), 'files': sorted(files)}
+                self._modified = True
+            return subfolders, files
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reads the manifest file. A missing, unreadable or incompatible file is considered empty.
+        :return:
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                contents = load(f)
+            if contents.get('version', None) == _ScanManifest.FORMAT_VERSION:
+                return contents['folders']
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+        return dict()
+
+    def save(self):
+        """
+        Writes the manifest file if it was modified. The file is first written under a temporary name and then renamed,
+        so that concurrent readers never see a partially written manifest.
+        :return:
+        """
+        with self._lock:
+            if self._modified:
+                tmp_path = self.path + '.' + str(getpid()) + '.tmp'
+                try:
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        dump({'version': _ScanManifest.FORMAT_VERSION, 'folders': self._folders}, f)
+                    replace(tmp_path, self.path)
+                    self._modified = False
+                except OSError as e:
+                    warn('Could not write the scan manifest ' + self.path + ' : ' + str(e))
+
+
+def _get_snapshot_key(dir_path: str) -> str:
+    """
+    Returns the key used to store the snapshot of a folder, so that 'a/b' and 'a/b/' share the same snapshot. The empty
+    path is kept as is so that scanning it fails as os.listdir would.
+
+    :param dir_path:
+    :return:
+    """
+    return normpath(dir_path) if dir_path != '' else dir_path
+
+
+def _create_descendants(root: PersistedObject, root_location: str, root_contents: Dict[str, str], create_child,
+                        logger: Logger = None) -> Dict[str, PersistedObject]:
+    """
+    Creates the children of the multifile object 'root' and all of their descendants. An explicit stack is used
+    instead of recursion, so that the depth of the tree is not limited by the interpreter's recursion limit. Objects
+    are created in the same order than in a recursive scan (depth-first, sorted by name), and if an error occurs, the
+    locations of the objects being built are logged from the innermost to the outermost, as a recursive scan would do
+    when unwinding. The location of root itself is not logged.
+
+    :param root: the multifile object
+    :param root_location: the location of the multifile object
+    :param root_contents: the dictionary {name: location} of the children of the multifile object
+    :param create_child: a function (location, parent, parent_location) -> (child, child_contents, child_children),
+    creating a child without its own children. child_contents is the dictionary {name: location} of the children of
+    the child if it is multifile (None otherwise), and child_children the dictionary where they should be stored.
+    :param logger:
+    :return: the dictionary {name: child} of the children of root, sorted by name
+    """
+    root_children = dict()
+    stack = [(root, root_location, iter(sorted(root_contents.items())), root_children)]
+    try:
+        while len(stack) > 0:
+            parent, parent_location, remaining_contents, children = stack[-1]
+            for name, location in remaining_contents:
+                child, child_contents, child_children = create_child(location, parent, parent_location)
+                children[name] = child
+                if child_contents is not None:
+                    # go down in this child first, and come back to its siblings later
+                    stack.append((child, location, iter(sorted(child_contents.items())), child_children))
+                    break
+            else:
+                stack.pop()
+
+    except (ObjectNotFoundOnFileSystemError, ObjectPresentMultipleTimesOnFileSystemError, IllegalContentNameError):
+        # -- log the objects that were being built, just for consistency of log messages
+        if logger is not None:
+            for _, location, _, _ in reversed(stack[1:]):
+                logger.info(location)
+        raise
+
+    return root_children
+
+
 class FileMappingConfiguration(AbstractFileMappingConfiguration):
     """
     Abstract class for all file mapping configurations. In addition to be an AbstractFileMappingConfiguration (meaning
@@ -340,20 +789,22 @@ class FileMappingConfiguration(AbstractFileMappingConfiguration):
     class RecursivePersistedObject(PersistedObject):
         """
         Represents an object on the filesystem. It may be multifile or singlefile. When this object is created it
-        recursively scans all of its children if any, and builds the corresponding PersistedObjects. All of this is
-        logged on the provided logger if any.
+        scans all of its children if any, and builds the corresponding PersistedObjects. All of this is logged on the
+        provided logger if any. The scan uses an explicit stack, so that very deep trees can be scanned.
         """
 
         def __init__(self, location: str, file_mapping_conf: AbstractFileMappingConfiguration = None,
-                     logger: Logger = None):
+                     logger: Logger = None, _main_call: bool = True):
             """
             Creates a PersistedObject representing an object on the filesystem at location 'location'. It may be
-            multifile or singlefile. When this object is created it recursively scans all of its children if any, and
-            builds the corresponding PersistedObjects. All of this is logged on the provided logger if any.
+            multifile or singlefile. When this object is created it scans all of its children if any, and builds the
+            corresponding PersistedObjects. All of this is logged on the provided logger if any.
 
             :param location:
             :param file_mapping_conf:
             :param logger:
+            :param _main_call: internal parameter, False when this object is created by the scan of its parent, that
+            creates its children
             """
 
             # -- file mapping
@@ -376,10 +827,8 @@ class FileMappingConfiguration(AbstractFileMappingConfiguration):
                     logger.info(str(self))
 
                 # -- create and attach all the self.children if multifile
-                if not self.is_singlefile:
-                    self.children = {name: FileMappingConfiguration.RecursivePersistedObject(loc,
-                                     file_mapping_conf=self.file_mapping_conf, logger=self.logger)
-                                     for name, loc in sorted(self._contents_or_path.items())}
+                if not self.is_singlefile and _main_call:
+                    self.children = self._create_children()
 
             except (ObjectNotFoundOnFileSystemError, ObjectPresentMultipleTimesOnFileSystemError,
                     IllegalContentNameError) as e:
@@ -388,6 +837,24 @@ class FileMappingConfiguration(AbstractFileMappingConfiguration):
                     logger.info(location)
                 raise e.with_traceback(e.__traceback__)
 
+        def _create_children(self) -> Dict[str, PersistedObject]:
+            """
+            Creates the PersistedObjects representing the children of this multifile object and all of their
+            descendants, with the same class than this object.
+
+            :return: a dictionary {name: child}, sorted by name
+            """
+            def create_child(location, parent, parent_location):
+                child = self.__class__(location, file_mapping_conf=self.file_mapping_conf, logger=self.logger,
+                                       _main_call=False)
+                if child.is_singlefile:
+                    return child, None, None
+                else:
+                    child.children = dict()
+                    return child, child._contents_or_path, child.children
+
+            return _create_descendants(self, self.location, self._contents_or_path, create_child, logger=self.logger)
+
         def get_singlefile_path(self):
             """
             Implementation of the parent method
@@ -411,6 +878,22 @@ class FileMappingConfiguration(AbstractFileMappingConfiguration):
                 raise NotImplementedError('get_file_encoding does not make any sense on a multifile object. Check this '
                                           'object\'s children to know their encoding')
 
+        def has_local_singlefile_path(self) -> bool:
+            """
+            Implementation of the parent method
+            :return:
+            """
+            return self.file_mapping_conf._file_system.is_local
+
+        def open_singlefile_stream(self, binary: bool = False):
+            """
+            Implementation of the parent method: the file is opened on the file system of the file mapping
+            :param binary:
+            :return:
+            """
+            return self.file_mapping_conf._file_system.open(self.get_singlefile_path(),
+                                                            encoding=None if binary else self.get_singlefile_encoding())
+
         def get_multifile_children(self) -> Dict[str, PersistedObject]:
             """
             Implementation of the parent method
@@ -423,41 +906,584 @@ class FileMappingConfiguration(AbstractFileMappingConfiguration):
             else:
                 return self.children
 
-    def __init__(self, encoding:str = None):
+    class LazyPersistedObject(RecursivePersistedObject):
+        """
+        Represents an object on the filesystem. It may be multifile or singlefile. Contrary to RecursivePersistedObject,
+        the children of a multifile object are only created the first time get_multifile_children() is called, and
+        are then cached. Only the folders and files that are actually accessed are therefore scanned. Note that as a
+        consequence, errors such as ObjectPresentMultipleTimesOnFileSystemError in a child are raised by
+        get_multifile_children() and not by the constructor.
+        """
+
+        def _create_children(self):
+            """
+            Overrides the parent method so that children are not created in the constructor.
+            :return:
+            """
+            return None
+
+        def get_multifile_children(self) -> Dict[str, PersistedObject]:
+            """
+            Implementation of the parent method: the children are created on first call.
+            :return:
+            """
+            if not self.is_singlefile and self.children is None:
+                # all children are created in the same scan, so that each folder is listed once
+                self.file_mapping_conf._begin_scan()
+                try:
+                    self.children = {name: self.__class__(loc, file_mapping_conf=self.file_mapping_conf,
+                                                          logger=self.logger)
+                                     for name, loc in sorted(self._contents_or_path.items())}
+                finally:
+                    self.file_mapping_conf._end_scan()
+
+            return super(FileMappingConfiguration.LazyPersistedObject, self).get_multifile_children()
+
+    class CompactPersistedObject(PersistedObject):
+        """
+        Represents an object on the filesystem, like RecursivePersistedObject, but with a compact memory footprint for
+        very large trees: objects have no __dict__, do not keep a reference to the logger, and only store the part of
+        their location that is relative to their parent location (interned, since names are often repeated in a tree).
+        The location and the singlefile path are rebuilt on demand.
+        """
+
+        __slots__ = ('_parent', '_location_suffix', 'is_singlefile', 'ext', 'file_mapping_conf', '_contents')
+
+        def __init__(self, location: str, file_mapping_conf: AbstractFileMappingConfiguration = None,
+                     logger: Logger = None, parent: 'FileMappingConfiguration.CompactPersistedObject' = None,
+                     parent_location: str = None, _main_call: bool = True):
+            """
+            Creates a PersistedObject representing an object on the filesystem at location 'location', and creates
+            all of its children.
+
+            :param location:
+            :param file_mapping_conf:
+            :param logger:
+            :param parent: the parent object, if this object is a child of a multifile object
+            :param parent_location: the location of the parent object if known, to avoid rebuilding it
+            :param _main_call: internal parameter, False when this object is created by the scan of its parent, that
+            creates its children. In that case the children locations are temporarily stored in _contents
+            """
+            # -- file mapping
+            check_var(file_mapping_conf, var_types=FileMappingConfiguration, var_name='file_mapping_conf')
+            self.file_mapping_conf = file_mapping_conf
+
+            # -- logger
+            check_var(logger, var_types=Logger, var_name='logger', enforce_not_none=False)
+
+            # -- location: relative to the parent if possible
+            check_var(location, var_types=str, var_name='location')
+            if parent is not None:
+                parent_location = parent_location if parent_location is not None else parent.location
+            if parent is not None and location.startswith(parent_location):
+                self._parent = parent
+                self._location_suffix = intern(location[len(parent_location):])
+            else:
+                self._parent = None
+                self._location_suffix = location
+
+            try:
+                # -- check single file or multifile thanks to the filemapping
+                self.is_singlefile, ext, contents_or_path = file_mapping_conf.get_unique_object_contents(location)
+                self.ext = intern(ext) if self.is_singlefile else ext
+
+                # -- log this for easy debug
+                if logger is not None:
+                    logger.info(str(self))
+
+                if self.is_singlefile:
+                    # -- only store the path if it can not be rebuilt from the location
+                    self._contents = None if contents_or_path == (location + ext) else contents_or_path
+                elif not _main_call:
+                    self._contents = {intern(name): loc for name, loc in contents_or_path.items()}
+                else:
+                    # -- create and attach all the children
+                    def create_child(child_location, parent, parent_location):
+                        child = FileMappingConfiguration.CompactPersistedObject(
+                            child_location, file_mapping_conf=file_mapping_conf, logger=logger, parent=parent,
+                            parent_location=parent_location, _main_call=False)
+                        if child.is_singlefile:
+                            return child, None, None
+                        else:
+                            child_contents, child._contents = child._contents, dict()
+                            return child, child_contents, child._contents
+
+                    self._contents = _create_descendants(self, location,
+                                                         {intern(name): loc for name, loc in contents_or_path.items()},
+                                                         create_child, logger=logger)
+
+            except (ObjectNotFoundOnFileSystemError, ObjectPresentMultipleTimesOnFileSystemError,
+                    IllegalContentNameError) as e:
+                # -- log the object that was being built, just for consistency of log messages
+                if logger is not None:
+                    logger.info(location)
+                raise e.with_traceback(e.__traceback__)
+
+        @property
+        def location(self) -> str:
+            """
+            The location of this object, rebuilt from the locations of its parents
+            :return:
+            """
+            suffixes = []
+            obj = self
+            while obj is not None:
+                suffixes.append(obj._location_suffix)
+                obj = obj._parent
+            return ''.join(reversed(suffixes))
+
+        def get_singlefile_path(self):
+            """
+            Implementation of the parent method
+            :return:
+            """
+            if self.is_singlefile:
+                return self._contents if self._contents is not None else (self.location + self.ext)
+            else:
+                raise NotImplementedError(
+                    'get_file_path does not make any sense on a multifile object. Use object.location'
+                    ' to get the file prefix')
+
+        def get_singlefile_encoding(self):
+            """
+            Implementation of the parent method
+            :return:
+            """
+            if self.is_singlefile:
+                return self.file_mapping_conf.encoding
+            else:
+                raise NotImplementedError('get_file_encoding does not make any sense on a multifile object. Check this '
+                                          'object\'s children to know their encoding')
+
+        def has_local_singlefile_path(self) -> bool:
+            """
+            Implementation of the parent method
+            :return:
+            """
+            return self.file_mapping_conf._file_system.is_local
+
+        def open_singlefile_stream(self, binary: bool = False):
+            """
+            Implementation of the parent method: the file is opened on the file system of the file mapping
+            :param binary:
+            :return:
+            """
+            return self.file_mapping_conf._file_system.open(self.get_singlefile_path(),
+                                                            encoding=None if binary else self.get_singlefile_encoding())
+
+        def get_multifile_children(self) -> Dict[str, PersistedObject]:
+            """
+            Implementation of the parent method
+            :return:
+            """
+            if self.is_singlefile:
+                raise NotImplementedError(
+                    'get_multifile_children does not mean anything on a singlefile object : a single file'
+                    'object by definition has no children - check your code')
+            else:
+                return self._contents
+
+    def __init__(self, encoding:str = None, scan_workers: int = None, lazy_scan: bool = False,
+                 scan_manifest: str = None, include: List[Union[str, Pattern]] = None,
+                 exclude: List[Union[str, Pattern]] = None, compact: bool = False):
         """
         Constructor, with the encoding registered to open the files.
         :param encoding: the encoding used to open the files default is 'utf-8'
+        :param scan_workers: the default number of threads used to list the folders in create_persisted_object. Default
+        is None, meaning that folders are listed sequentially.
+        :param lazy_scan: the default scan mode of create_persisted_object. If True the children of multifile objects
+        are only scanned when they are first accessed. Default is False.
+        :param scan_manifest: an optional path to a file where folder listings are stored between scans, so that
+        folders whose modification time did not change are not listed again. Default is None (no manifest).
+        :param include: an optional list of patterns. If provided, only the files whose name matches one of them are
+        seen. Folders are not filtered by this list. Patterns may be glob patterns such as '*.csv' or compiled regular
+        expressions, that should match the whole name.
+        :param exclude: an optional list of patterns. Files and folders whose name matches one of them are not seen.
+        Glob patterns ending with '/' such as '__pycache__/' only apply to folders, other glob patterns apply to both
+        files and folders. Compiled regular expressions are matched against the file name, or against the folder name
+        followed by '/'.
+        :param compact: the default tree representation of create_persisted_object. If True the objects are
+        CompactPersistedObjects, that use much less memory for very large trees. Default is False.
         """
         super(FileMappingConfiguration, self).__init__(encoding)
 
-    def create_persisted_object(self, location: str, logger: Logger) -> PersistedObject:
+        # the file system where files and folders are read. Subclasses may replace it (archives...)
+        self._file_system = _LOCAL_FILE_SYSTEM
+
+        # the filter applied while listing folders
+        if include is not None or exclude is not None:
+            self._name_filter = _NameFilter(include, exclude)
+        else:
+            self._name_filter = None
+
+        check_var(scan_manifest, var_types=str, var_name='scan_manifest', enforce_not_none=False, min_len=1)
+        self._scan_manifest = _ScanManifest(scan_manifest) if scan_manifest is not None else None
+
+        check_var(scan_workers, var_types=int, var_name='scan_workers', enforce_not_none=False, min_value=1)
+        self.scan_workers = scan_workers
+
+        check_var(lazy_scan, var_types=bool, var_name='lazy_scan')
+        self.lazy_scan = lazy_scan
+
+        check_var(compact, var_types=bool, var_name='compact')
+        self.compact = compact
+
+        # the folder snapshots of the scans in progress in each thread, see _begin_scan
+        self._scans = local()
+        self._dir_snapshots_lock = RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Releases the resources held to read the files, if any (archive handles, temporary files...). They are acquired
+        again if needed. Configurations may also be used in a with statement, that calls close() at the end. Default
+        implementation does nothing.
+        :return:
+        """
+        pass
+
+    def __getstate__(self):
+        # the configuration may be sent to other processes (see RootParser.parse_collection) : the scans in progress,
+        # if any, are not
+        state = self.__dict__.copy()
+        del state['_scans']
+        del state['_dir_snapshots_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._scans = local()
+        self._dir_snapshots_lock = RLock()
+
+    def create_persisted_object(self, location: str, logger: Logger, scan_workers: int = None,
+                                lazy_scan: bool = None, compact: bool = None) -> PersistedObject:
         """
         Creates a PersistedObject representing the object at location 'location', and recursively creates all of its
-        children
+        children. During this scan each folder is listed at most once : its snapshot is shared between the object and
+        all of its children, and dropped when the scan is over. Scans running at the same time do not share snapshots.
+
+        If scan_workers is greater than 1, the folders are first listed concurrently by a pool of scan_workers threads,
+        which is much faster on file systems with a high latency (network mounts). The tree of objects is then built
+        from these listings exactly as in sequential mode, so the result, the log messages and the errors are the same.
+
+        If lazy_scan is True, only the object at location is created here : the children of multifile objects are
+        created the first time they are accessed (see LazyPersistedObject). In that case scan_workers is not used.
+
+        If compact is True, the tree is made of CompactPersistedObjects, that use much less memory for very large trees.
+        Compact trees can not be scanned lazily.
 
         :param location:
         :param logger:
+        :param scan_workers: the number of threads used to list the folders. Default is None, meaning that the value
+        provided in the constructor is used.
+        :param lazy_scan: True to create the children on first access. Default is None, meaning that the value
+        provided in the constructor is used.
+        :param compact: True to create a compact tree. Default is None, meaning that the value provided in the
+        constructor is used.
         :return:
         """
+        check_var(scan_workers, var_types=int, var_name='scan_workers', enforce_not_none=False, min_value=1)
+        scan_workers = scan_workers or self.scan_workers
+        check_var(lazy_scan, var_types=bool, var_name='lazy_scan', enforce_not_none=False)
+        lazy_scan = self.lazy_scan if lazy_scan is None else lazy_scan
+        check_var(compact, var_types=bool, var_name='compact', enforce_not_none=False)
+        compact = self.compact if compact is None else compact
+        if lazy_scan and compact:
+            raise ValueError('lazy_scan and compact can not be used together')
+
         #print('Checking all files under ' + location)
         logger.info('Checking all files under ' + location)
-        obj = FileMappingConfiguration.RecursivePersistedObject(location=location, file_mapping_conf=self,
-                                                                logger=logger)
+        self._begin_scan()
+        try:
+            if lazy_scan:
+                obj = FileMappingConfiguration.LazyPersistedObject(location=location, file_mapping_conf=self,
+                                                                   logger=logger)
+            else:
+                if scan_workers is not None and scan_workers > 1:
+                    self._prefetch_dir_snapshots(location, scan_workers)
+                if compact:
+                    obj = FileMappingConfiguration.CompactPersistedObject(location=location, file_mapping_conf=self,
+                                                                          logger=logger)
+                else:
+                    obj = FileMappingConfiguration.RecursivePersistedObject(location=location, file_mapping_conf=self,
+                                                                            logger=logger)
+        finally:
+            self._end_scan()
         #print('File checks done')
         logger.info('File checks done')
         return obj
 
+    def iter_children(self, location: str, logger: Logger, lazy_scan: bool = None,
+                      compact: bool = None) -> Iterable[Tuple[str, PersistedObject]]:
+        """
+        Generator yielding the (name, PersistedObject) pairs of the children of the multifile object at location
+        'location', sorted by name. Only the folder of the object is listed before the first child is yielded : each
+        child (and its own children) is created right before being yielded, so that callers may start working on the
+        first children while the next ones are still being scanned.
+
+        No scan is in progress while the caller works on a child : each child is created by its own scan, that only
+        reuses the snapshots of the folder of the object (and of its parent folder) taken at the beginning. The scan manifest, if any, is saved
+        when the generator is exhausted or closed.
+
+        :param location:
+        :param logger:
+        :param lazy_scan: True to create the children of each child on first access. Default is None, meaning that the
+        value provided in the constructor is used.
+        :param compact: True to create compact children. Default is None, meaning that the value provided in the
+        constructor is used.
+        :return:
+        """
+        check_var(lazy_scan, var_types=bool, var_name='lazy_scan', enforce_not_none=False)
+        lazy_scan = self.lazy_scan if lazy_scan is None else lazy_scan
+        check_var(compact, var_types=bool, var_name='compact', enforce_not_none=False)
+        compact = self.compact if compact is None else compact
+        if lazy_scan and compact:
+            raise ValueError('lazy_scan and compact can not be used together')
+
+        if lazy_scan:
+            child_type = FileMappingConfiguration.LazyPersistedObject
+        elif compact:
+            child_type = FileMappingConfiguration.CompactPersistedObject
+        else:
+            child_type = FileMappingConfiguration.RecursivePersistedObject
+
+        logger.info('Checking all files under ' + location)
+        snapshots = self._begin_scan()
+        try:
+            is_singlefile, ext, contents = self.get_unique_object_contents(location)
+        finally:
+            self._end_scan(save_manifest=False)
+        try:
+            if is_singlefile:
+                raise ValueError('Object at location ' + location + ' is a singlefile object with extension ' + ext
+                                 + ', it has no children')
+            for name, child_location in sorted(contents.items()):
+                self._begin_scan(dict(snapshots))
+                try:
+                    child = child_type(child_location, file_mapping_conf=self, logger=logger)
+                finally:
+                    self._end_scan(save_manifest=False)
+                yield name, child
+        finally:
+            if self._scan_manifest is not None:
+                self._scan_manifest.save()
+        logger.info('File checks done')
+
+    def get_fingerprint(self, obj: PersistedObject, scan_start: float = None) -> Tuple:
+        """
+        Returns a cheap fingerprint of the files and folders making the tree of obj: the modification time of each
+        folder and the size of each file. If the fingerprint of the same tree is still equal later on, no file or
+        folder of the tree has been added, removed or renamed in between, so a parsing plan created for obj is still
+        valid. Computing it does not list any folder, it only reads the status of each file and folder of the tree.
+
+        :param obj: a PersistedObject created by this configuration
+        :param scan_start: the time (as returned by time.time()) at which the scan that created obj started. Folders
+        modified after that time, or shortly before, make the fingerprint None, since the scan may not have seen their
+        current contents. Default is None, meaning that obj is assumed to have been scanned just now. Note that all the
+        folders of obj must have been listed after scan_start : this is the case for an object created by
+        create_persisted_object, since scans running at the same time do not share their listings.
+        :return: the fingerprint, or None if it can not be computed (for example if the file system does not support
+        it, or if a folder was modified so recently that its modification time can not be trusted)
+        """
+        # collect the files and folders of the tree
+        folders = set()
+        files = set()
+        to_visit = [obj]
+        while len(to_visit) > 0:
+            o = to_visit.pop()
+            folders.add(dirname(o.location))
+            if o.is_singlefile:
+                files.add(o.get_singlefile_path())
+            else:
+                folders.add(o.location)
+                to_visit.extend(o.get_multifile_children().values())
+
+        return self._file_system.get_fingerprint(sorted(folders), sorted(files), scan_start=scan_start)
+
+    def _begin_scan(self, snapshots: Dict[str, _DirectorySnapshot] = None) -> Dict[str, _DirectorySnapshot]:
+        """
+        Starts a scan in the current thread. Until it ends, the snapshots of the folders listed by this thread are
+        remembered in a dictionary that belongs to this scan only : scans running at the same time in other threads,
+        or nested in this one, list the folders again and therefore see the current state of the file system.
+
+        :param snapshots: an optional dictionary of snapshots to start with. The scan takes ownership of it.
+        :return: the dictionary where the snapshots of this scan are remembered
+        """
+        scans = getattr(self._scans, 'snapshots', None)
+        if scans is None:
+            scans = self._scans.snapshots = []
+        snapshots = dict() if snapshots is None else snapshots
+        scans.append(snapshots)
+        return snapshots
+
+    def _end_scan(self, save_manifest: bool = True):
+        """
+        Ends the current scan of the current thread, and drops its folder snapshots.
+
+        :param save_manifest: if False the scan manifest is not saved, the caller will save it later
+        :return:
+        """
+        scans = self._scans.snapshots
+        scans.pop()
+        if save_manifest and len(scans) == 0 and self._scan_manifest is not None:
+            self._scan_manifest.save()
+
+    def _get_scan_snapshots(self) -> Dict[str, _DirectorySnapshot]:
+        """
+        Returns the dictionary of snapshots of the current scan of the current thread, or None if no scan is in
+        progress in this thread.
+
+        :return:
+        """
+        scans = getattr(self._scans, 'snapshots', None)
+        return scans[-1] if scans else None
+
+    def _create_dir_snapshot(self, dir_path: str) -> _DirectorySnapshot:
+        """
+        Creates a snapshot of the folder at dir_path, using the scan manifest if any.
+
+        :param dir_path:
+        :return:
+        """
+        if self._scan_manifest is None:
+            return _DirectorySnapshot(dir_path, self._file_system.list_dir(dir_path, name_filter=self._name_filter))
+        else:
+            # the manifest stores the complete listings, so that it does not depend on the filter
+            subfolders, files = self._scan_manifest.list_dir(dir_path)
+            if self._name_filter is not None:
+                subfolders, files = self._name_filter.filter(subfolders, files)
+            return _DirectorySnapshot(dir_path, (subfolders, files))
+
+    def _get_dir_snapshot(self, dir_path: str, snapshots: Dict[str, _DirectorySnapshot] = None) \
+            -> _DirectorySnapshot:
+        """
+        Returns a snapshot of the folder at dir_path. If a scan is in progress in this thread the snapshot is
+        remembered until the scan ends, otherwise it is created on each call.
+
+        :param dir_path:
+        :param snapshots: the snapshots of the scan to use, for threads working for a scan started in another thread.
+        Default is None, meaning that the current scan of this thread is used.
+        :return:
+        """
+        if snapshots is None:
+            snapshots = self._get_scan_snapshots()
+        if snapshots is None:
+            return self._create_dir_snapshot(dir_path)
+        else:
+            key = _get_snapshot_key(dir_path)
+            try:
+                return snapshots[key]
+            except KeyError:
+                snapshot = self._create_dir_snapshot(dir_path)
+                with self._dir_snapshots_lock:
+                    # if another thread listed the same folder in the meantime, keep a single snapshot
+                    return snapshots.setdefault(key, snapshot)
+
+    def _prefetch_dir_snapshots(self, location: str, scan_workers: int):
+        """
+        Lists concurrently all the folders that will be needed to create the object at location, and stores their
+        snapshots for the current scan of this thread. The folders to list are discovered as the listings complete, thanks to
+        _get_folders_to_prefetch. Errors are ignored : the folders that could not be listed will be listed again when
+        the object tree is built, and the error will be raised at that time, as in sequential mode.
+
+        :param location:
+        :param scan_workers:
+        :return:
+        """
+        snapshots = self._get_scan_snapshots()
+
+        def try_get_snapshot(dir_path):
+            try:
+                return self._get_dir_snapshot(dir_path, snapshots)
+            except OSError:
+                return None
+
+        location_key = _get_snapshot_key(location)
+        parent_key = _get_snapshot_key(dirname(location))
+        submitted = {location_key, parent_key}
+
+        with ThreadPoolExecutor(max_workers=scan_workers) as executor:
+            # the parent folder is needed to find the object itself, but its other subfolders are not explored
+            pending = {executor.submit(try_get_snapshot, dir_path) for dir_path in submitted}
+            while len(pending) > 0:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    snapshot = future.result()
+                    if snapshot is not None \
+                            and (_get_snapshot_key(snapshot.dir_path) != parent_key or parent_key == location_key):
+                        for dir_path in self._get_folders_to_prefetch(snapshot):
+                            key = _get_snapshot_key(dir_path)
+                            if key not in submitted:
+                                submitted.add(key)
+                                pending.add(executor.submit(try_get_snapshot, dir_path))
+
+    def _get_folders_to_prefetch(self, snapshot: _DirectorySnapshot) -> List[str]:
+        """
+        Returns the paths of the folders that will need to be listed when creating the objects found in the folder
+        described by snapshot. By default there are none: subclasses where objects may be stored in subfolders should
+        override this method.
+
+        :param snapshot:
+        :return:
+        """
+        return []
+
+    def _isdir(self, location: str) -> bool:
+        """
+        Equivalent of os.path.isdir, that relies on the snapshot of the parent folder if it is already available.
+
+        :param location:
+        :return:
+        """
+        snapshots = self._get_scan_snapshots()
+        if snapshots is not None:
+            name = basename(location)
+            parent_snapshot = snapshots.get(_get_snapshot_key(dirname(location)), None)
+            if name != '' and parent_snapshot is not None:
+                return parent_snapshot.is_subfolder(name)
+        return self._file_system.isdir(location)
+
 
 class WrappedFileMappingConfiguration(FileMappingConfiguration):
     """
     A file mapping where multifile objects are represented by folders
     """
-    def __init__(self, encoding:str = None):
+    def __init__(self, encoding:str = None, scan_workers: int = None, lazy_scan: bool = False,
+                 scan_manifest: str = None, include: List[Union[str, Pattern]] = None,
+                 exclude: List[Union[str, Pattern]] = None, compact: bool = False):
         """
         Constructor, with the encoding registered to open the files.
         :param encoding: the encoding used to open the files default is 'utf-8'
+        :param scan_workers: the default number of threads used to list the folders in create_persisted_object. Default
+        is None, meaning that folders are listed sequentially.
+        :param lazy_scan: the default scan mode of create_persisted_object. If True the children of multifile objects
+        are only scanned when they are first accessed. Default is False.
+        :param scan_manifest: an optional path to a file where folder listings are stored between scans, so that
+        folders whose modification time did not change are not listed again. Default is None (no manifest).
+        :param include: an optional list of patterns (glob or compiled regular expressions) for the names of the files
+        to consider. See FileMappingConfiguration for details.
+        :param exclude: an optional list of patterns (glob or compiled regular expressions) for the names of the files
+        and folders to ignore, such as ['*.bak', '.git/']. See FileMappingConfiguration for details.
+        :param compact: the default tree representation of create_persisted_object. If True the objects are
+        CompactPersistedObjects, that use much less memory for very large trees. Default is False.
+        """
+        super(WrappedFileMappingConfiguration, self).__init__(encoding=encoding, scan_workers=scan_workers,
+                                                              lazy_scan=lazy_scan, scan_manifest=scan_manifest,
+                                                              include=include, exclude=exclude, compact=compact)
+
+    def _get_folders_to_prefetch(self, snapshot: _DirectorySnapshot) -> List[str]:
+        """
+        Implementation of the parent method. In this mode all subfolders are multifile objects and need to be listed.
+
+        :param snapshot:
+        :return:
         """
-        super(WrappedFileMappingConfiguration, self).__init__(encoding=encoding)
+        return [join(snapshot.dir_path, subfolder) for subfolder in snapshot.subfolders]
 
     def find_multifile_object_children(self, parent_location, no_errors: bool = False) -> Dict[str, str]:
         """
@@ -480,7 +1506,7 @@ class WrappedFileMappingConfiguration(FileMappingConfiguration):
         """
 
         # (1) Assert that folder_path is a folder
-        if not isdir(parent_location):
+        if not self._isdir(parent_location):
             if no_errors:
                 return dict()
             else:
@@ -488,18 +1514,15 @@ class WrappedFileMappingConfiguration(FileMappingConfiguration):
                                  'not a valid folder')
 
         else:
+            # the folder is listed only once, whatever the number of times its contents are requested during a scan
+            snapshot = self._get_dir_snapshot(parent_location)
+
             # (2) List folders (multifile objects or collections)
-            all_subfolders = [dir_ for dir_ in listdir(parent_location) if isdir(join(parent_location, dir_))]
-            items = {item_name: join(parent_location, item_name) for item_name in all_subfolders}
+            items = {item_name: join(parent_location, item_name) for item_name in snapshot.subfolders}
 
             # (3) List singlefiles *without* their extension
-            items.update({
-                          item_name: join(parent_location, item_name)
-                          for item_name in [file_name[0:file_name.rindex(EXT_SEPARATOR)]
-                                            for file_name in listdir(parent_location)
-                                            if isfile(join(parent_location, file_name))
-                                            and EXT_SEPARATOR in file_name]
-                         })
+            items.update({item_name: join(parent_location, item_name) for item_name in snapshot.files_by_stem})
+
         # (4) return all
         return items
 
@@ -511,7 +1534,7 @@ class WrappedFileMappingConfiguration(FileMappingConfiguration):
         :param location:
         :return:
         """
-        return isdir(location) and len(self.find_multifile_object_children(location)) == 0
+        return self._isdir(location) and len(self.find_multifile_object_children(location)) == 0
 
     def get_multifile_object_child_location(self, parent_item_prefix: str, child_name: str) -> str:
         """
@@ -525,7 +1548,7 @@ class WrappedFileMappingConfiguration(FileMappingConfiguration):
         check_var(child_name, var_types=str, var_name='item_name')
 
         # assert that folder_path is a folder
-        if not isdir(parent_item_prefix):
+        if not self._isdir(parent_item_prefix):
             raise ValueError(
                 'Cannot get attribute item in non-flat mode, parent item path is not a folder : ' + parent_item_prefix)
         return join(parent_item_prefix, child_name)
@@ -540,14 +1563,10 @@ class WrappedFileMappingConfiguration(FileMappingConfiguration):
         parent_dir = dirname(location)
         base_prefix = basename(location)
 
-        possible_object_files = {object_file[len(base_prefix):]: join(parent_dir, object_file)
-                                 for object_file in listdir(parent_dir) if
-                                 isfile(parent_dir + '/' + object_file)
-                                 and object_file.startswith(base_prefix)
-                                 # file must be named base_prefix.something
-                                 and object_file != base_prefix
-                                 and object_file[len(base_prefix)] == EXT_SEPARATOR
-                                 and (object_file[len(base_prefix):]).count(EXT_SEPARATOR) == 1}
+        # file must be named base_prefix.something, with no other dot in something : this is exactly the files whose
+        # name without extension is base_prefix
+        object_files = self._get_dir_snapshot(parent_dir).files_by_stem.get(base_prefix, dict())
+        possible_object_files = {ext: join(parent_dir, object_file) for ext, object_file in object_files.items()}
 
         return possible_object_files
 
@@ -558,13 +1577,29 @@ class FlatFileMappingConfiguration(FileMappingConfiguration):
     with their parent name as the prefix, followed by a configurable separator.
     """
 
-    def __init__(self, separator: str = None, encoding:str = None):
+    def __init__(self, separator: str = None, encoding:str = None, scan_workers: int = None, lazy_scan: bool = False,
+                 scan_manifest: str = None, include: List[Union[str, Pattern]] = None,
+                 exclude: List[Union[str, Pattern]] = None, compact: bool = False):
         """
         :param separator: the character sequence used to separate an item name from an item attribute name. Only
         used in flat mode. Default is '.'
         :param encoding: encoding used to open the files. Default is 'utf-8'
-        """
-        super(FlatFileMappingConfiguration, self).__init__(encoding=encoding)
+        :param scan_workers: the default number of threads used to list the folders in create_persisted_object. Default
+        is None, meaning that folders are listed sequentially.
+        :param lazy_scan: the default scan mode of create_persisted_object. If True the children of multifile objects
+        are only scanned when they are first accessed. Default is False.
+        :param scan_manifest: an optional path to a file where folder listings are stored between scans, so that
+        folders whose modification time did not change are not listed again. Default is None (no manifest).
+        :param include: an optional list of patterns (glob or compiled regular expressions) for the names of the files
+        to consider. See FileMappingConfiguration for details.
+        :param exclude: an optional list of patterns (glob or compiled regular expressions) for the names of the files
+        and folders to ignore, such as ['*.bak', '.git/']. See FileMappingConfiguration for details.
+        :param compact: the default tree representation of create_persisted_object. If True the objects are
+        CompactPersistedObjects, that use much less memory for very large trees. Default is False.
+        """
+        super(FlatFileMappingConfiguration, self).__init__(encoding=encoding, scan_workers=scan_workers,
+                                                           lazy_scan=lazy_scan, scan_manifest=scan_manifest,
+                                                           include=include, exclude=exclude, compact=compact)
 
         # -- check separator
         check_var(separator, var_types=str, var_name='sep_for_flat', enforce_not_none=False, min_len=1)
@@ -603,7 +1638,7 @@ class FlatFileMappingConfiguration(FileMappingConfiguration):
         """
 
         # (1) Find the base directory and base name
-        if isdir(parent_location):  # special case: parent location is the root folder where all the files are.
+        if self._isdir(parent_location):  # special case: parent location is the root folder where all the files are.
             parent_dir = parent_location
             base_prefix = ''
             start_with = ''
@@ -616,15 +1651,13 @@ class FlatFileMappingConfiguration(FileMappingConfiguration):
             start_with = self.separator
 
         # (2) list children files that are singlefiles
-        content_files = [content_file for content_file in listdir(parent_dir)
-                         # -> we are in flat mode : should be a file not a folder :
-                         if isfile(join(parent_dir,content_file))
-                         # -> we are looking for children of a specific item :
-                         and content_file.startswith(base_prefix)
+        # -> we are in flat mode : should be a file not a folder, and we are looking for children of a specific item :
+        # they should start with the item name and the separator (or with nothing in case of the root folder). The
+        # folder snapshot returns them directly with a range query on its sorted file names
+        content_files = [content_file for content_file
+                         in self._get_dir_snapshot(parent_dir).find_files_with_prefix(base_prefix + start_with)
                          # -> we are looking for multifile child items only :
-                         and content_file != base_prefix
-                         # -> they should start with the separator (or with nothing in case of the root folder) :
-                         and (content_file[len(base_prefix):]).startswith(start_with)
+                         if content_file != base_prefix
                          # -> they should have a valid extension :
                          and (content_file[len(base_prefix + start_with):]).count(EXT_SEPARATOR) >= 1
                          ]
@@ -648,11 +1681,11 @@ class FlatFileMappingConfiguration(FileMappingConfiguration):
         :return:
         """
         # (1) Find the base directory and base name
-        if isdir(location):  # special case: parent location is the root folder where all the files are.
+        if self._isdir(location):  # special case: parent location is the root folder where all the files are.
             return len(self.find_multifile_object_children(location)) == 0
         else:
             # TODO same comment than in find_multifile_object_children
-            if exists(location):
+            if self._file_system.exists(location):
                 # location is a file without extension. We can accept that as being a multifile object without children
                 return True
             else:
@@ -687,16 +1720,596 @@ class FlatFileMappingConfiguration(FileMappingConfiguration):
 
         # trick : is sep_for_flat is a dot, we have to take into account that there is also a dot for the extension
         min_sep_count = (1 if self.separator == EXT_SEPARATOR else 0)
-        possible_object_files = {object_file[len(base_prefix):]: join(parent_dir, object_file)
-                                 for object_file in listdir(parent_dir) if isfile(parent_dir + '/' + object_file)
-                                 and object_file.startswith(base_prefix)
-                                 # file must be named base_prefix.something
-                                 and object_file != base_prefix
-                                 and object_file[len(base_prefix)] == EXT_SEPARATOR
-                                 and (object_file[len(base_prefix):]).count(EXT_SEPARATOR) == 1
+
+        # file must be named base_prefix.something with no other dot in something : this is exactly the files whose
+        # name without extension is base_prefix
+        object_files = self._get_dir_snapshot(parent_dir).files_by_stem.get(base_prefix, dict())
+        possible_object_files = {ext: join(parent_dir, object_file) for ext, object_file in object_files.items()
                                  # and no other item separator should be present in the something
-                                 and (object_file[len(base_prefix):]).count(self.separator) == min_sep_count}
+                                 if ext.count(self.separator) == min_sep_count}
 
         return possible_object_files
 
 
+def _normalize_member_name(member_name: str) -> str:
+    """
+    Returns the normalized path of an archive member from its name in the archive index: '/'-separated (backslashes
+    written by some Windows tools are converted), without leading './', trailing '/' or '.' segments. Returns None for
+    the names that do not denote a member inside the archive, such as '.' or '../a'.
+
+    :param member_name:
+    :return:
+    """
+    member_path = posixpath.normpath(member_name.replace('\\', '/')).strip('/')
+    if member_path in {'', '.'} or member_path == '..' or member_path.startswith('../'):
+        return None
+    return member_path
+
+
+class _ArchiveFileSystem(metaclass=ABCMeta):
+    """
+    Abstract file system made of the contents of an archive file (or of any other indexed set of members, such as an
+    in-memory structure). The archive is seen as a folder located at the archive path: for example the member 'a/b.txt'
+    of archive 'data.zip' is available at path 'data.zip/a/b.txt'.
+
+    The listing of all folders is built once from the archive index (for example the central directory of a zip
+    file), so that listing a folder does not access the disk. Members are read from a single handle on the archive,
+    opened on first use and closed by close().
+    """
+
+    is_local = False
+
+    def __init__(self, archive_path: str):
+        """
+        Constructor. The archive is opened on first use.
+
+        :param archive_path: the path of the archive on the local file system
+        """
+        check_var(archive_path, var_types=str, var_name='archive_path', min_len=1)
+        self.archive_path = archive_path
+        self._root = normpath(archive_path)
+        self._root_parent = _get_snapshot_key(dirname(self._root))
+        self._archive = None
+        self._folders = None
+        self._lock = RLock()
+
+    def __getstate__(self):
+        # copies sent to other processes open the archive and build its index again on first use
+        state = self.__dict__.copy()
+        state['_archive'] = None
+        state['_folders'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = RLock()
+
+    def get_fingerprint(self, folders: List[str], files: List[str], scan_start: float = None) -> Tuple:
+        """
+        Archives are indexed once, so the changes made to the archive later on would not be seen anyway : fingerprints
+        are not supported.
+
+        :param folders:
+        :param files:
+        :param scan_start:
+        :return: None
+        """
+        return None
+
+    def close(self):
+        """
+        Closes the archive handle if it is open. It will be opened again if needed.
+        :return:
+        """
+        with self._lock:
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
+
+    def _get_archive(self):
+        with self._lock:
+            if self._archive is None:
+                self._archive = self._open_archive()
+            return self._archive
+
+    def _get_folders(self) -> Dict[str, Tuple[Set[str], Set[str]]]:
+        """
+        Returns the index of all folders in the archive: {member_folder_path: (subfolders, files)}. The root folder of
+        the archive has path ''.
+        :return:
+        """
+        with self._lock:
+            if self._folders is None:
+                folders = {'': (set(), set())}
+
+                def add_folder(folder_path):
+                    if folder_path not in folders:
+                        folders[folder_path] = (set(), set())
+                        parent, _, name = folder_path.rpartition('/')
+                        add_folder(parent)
+                        folders[parent][0].add(name)
+
+                for member_name, is_dir in self._list_members():
+                    member_name = _normalize_member_name(member_name)
+                    if member_name is None:
+                        continue
+                    if is_dir:
+                        add_folder(member_name)
+                    else:
+                        parent, _, name = member_name.rpartition('/')
+                        add_folder(parent)
+                        folders[parent][1].add(name)
+                self._folders = folders
+            return self._folders
+
+    def _get_member_path(self, path: str) -> str:
+        """
+        Returns the path of the member of the archive located at path, or None if path is not inside the archive.
+
+        :param path:
+        :return:
+        """
+        path = normpath(path) if path != '' else path
+        if path == self._root:
+            return ''
+        elif path.startswith(self._root + sep):
+            return path[len(self._root) + 1:].replace(sep, '/')
+        else:
+            return None
+
+    def list_dir(self, dir_path: str, name_filter: '_NameFilter' = None) -> Tuple[Set[str], Set[str]]:
+        """
+        Lists the folder at dir_path. The folder containing the archive only contains the archive, seen as a folder.
+
+        :param dir_path:
+        :param name_filter: an optional filter to apply on the entries
+        :return: a tuple (subfolders, files) of entry names
+        """
+        member_path = self._get_member_path(dir_path)
+        if member_path is None:
+            if _get_snapshot_key(dir_path) == self._root_parent:
+                return {basename(self._root)}, set()
+        else:
+            folders = self._get_folders()
+            if member_path in folders:
+                subfolders, files = folders[member_path]
+                if name_filter is None:
+                    return subfolders, files
+                else:
+                    return name_filter.filter(subfolders, files)
+            elif self._is_file_member(member_path):
+                raise NotADirectoryError(ENOTDIR, 'Not a folder in archive ' + self.archive_path, dir_path)
+        raise FileNotFoundError(ENOENT, 'No such folder in archive ' + self.archive_path, dir_path)
+
+    def _is_file_member(self, member_path: str) -> bool:
+        parent, _, name = member_path.rpartition('/')
+        folders = self._get_folders()
+        return parent in folders and name in folders[parent][1]
+
+    def isdir(self, path: str) -> bool:
+        member_path = self._get_member_path(path)
+        if member_path is None:
+            return _get_snapshot_key(path) == self._root_parent
+        else:
+            return member_path in self._get_folders()
+
+    def exists(self, path: str) -> bool:
+        member_path = self._get_member_path(path)
+        return self.isdir(path) or (member_path is not None and self._is_file_member(member_path))
+
+    def open(self, path: str, encoding: str = None):
+        """
+        Opens the archive member at path. Its contents are read in memory, so that the stream can be used concurrently
+        with other members.
+
+        :param path:
+        :param encoding: the encoding to use to open a text stream, or None to open a binary stream
+        :return:
+        """
+        member_path = self._get_member_path(path)
+        if member_path is None or not self._is_file_member(member_path):
+            raise FileNotFoundError(ENOENT, 'No such file in archive ' + self.archive_path, path)
+        with self._lock:
+            stream = BytesIO(self._read_member(member_path))
+        if encoding is None:
+            return stream
+        else:
+            return TextIOWrapper(stream, encoding=encoding)
+
+    @abstractmethod
+    def _open_archive(self):
+        """
+        Implementing classes should open and return the archive handle
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    def _list_members(self) -> Iterable[Tuple[str, bool]]:
+        """
+        Implementing classes should return the name of each member in the archive index, and whether it is a folder
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    def _read_member(self, member_path: str) -> bytes:
+        """
+        Implementing classes should return the contents of the member file at member_path
+        :param member_path:
+        :return:
+        """
+        pass
+
+
+class _ZipFileSystem(_ArchiveFileSystem):
+    """
+    A file system made of the contents of a zip archive
+    """
+
+    def __init__(self, archive_path: str):
+        super(_ZipFileSystem, self).__init__(archive_path)
+        self._members = None
+
+    def __getstate__(self):
+        state = super(_ZipFileSystem, self).__getstate__()
+        state['_members'] = None
+        return state
+
+    def _open_archive(self):
+        return ZipFile(self.archive_path, 'r')
+
+    def _get_members(self) -> Dict[str, ZipInfo]:
+        """
+        Returns a dictionary {member_path: ZipInfo} of all files in the archive, by normalized path
+        :return:
+        """
+        with self._lock:
+            if self._members is None:
+                members = dict()
+                for info in self._get_archive().infolist():
+                    member_path = _normalize_member_name(info.filename)
+                    if member_path is not None and not info.filename.endswith('/'):
+                        members[member_path] = info
+                self._members = members
+            return self._members
+
+    def _list_members(self) -> Iterable[Tuple[str, bool]]:
+        # the central directory is read once when the archive is opened
+        return [(info.filename, info.filename.endswith('/')) for info in self._get_archive().infolist()]
+
+    def _read_member(self, member_path: str) -> bytes:
+        return self._get_archive().read(self._get_members()[member_path])
+
+
+# the magic numbers of the compressed tar archives, and the functions opening them as a decompressed stream
+_TAR_DECOMPRESSORS = [(b'\x1f\x8b', gzip.open), (b'BZh', bz2.open), (b'\xfd7zXZ\x00', lzma.open)]
+
+
+class _TarFileSystem(_ArchiveFileSystem):
+    """
+    A file system made of the contents of a tar archive, compressed or not.
+
+    Compressed archives can only be read sequentially : reading a member located before the previous one would
+    decompress the archive again from its start. Since members are read in parsing order, not in archive order,
+    compressed archives are decompressed once to a temporary uncompressed tar file on first use, where all members can
+    then be read in any order. This temporary file is deleted by close(), or when this object is garbage collected
+    (each copy sent to another process decompresses the archive to its own temporary file).
+    """
+
+    def __init__(self, archive_path: str):
+        super(_TarFileSystem, self).__init__(archive_path)
+        self._members = None
+        self._tmp_path = None
+        self._tmp_finalizer = None
+
+    def __getstate__(self):
+        state = super(_TarFileSystem, self).__getstate__()
+        state['_members'] = None
+        state['_tmp_path'] = None
+        state['_tmp_finalizer'] = None
+        return state
+
+    def _open_archive(self):
+        with open(self.archive_path, 'rb') as f:
+            magic = f.read(6)
+        for magic_prefix, open_decompressed in _TAR_DECOMPRESSORS:
+            if magic.startswith(magic_prefix):
+                tmp_path = None
+                try:
+                    with open_decompressed(self.archive_path, 'rb') as src:
+                        with NamedTemporaryFile(suffix='.tar', delete=False) as tmp_file:
+                            tmp_path = tmp_file.name
+                            copyfileobj(src, tmp_file)
+                    archive = tarfile.open(tmp_path, 'r:')
+                except BaseException:
+                    if tmp_path is not None:
+                        _close_and_remove(None, tmp_path)
+                    raise
+                self._tmp_path = tmp_path
+                self._tmp_finalizer = finalize(self, _close_and_remove, archive, tmp_path)
+                return archive
+        return tarfile.open(self.archive_path, 'r:')
+
+    def close(self):
+        """
+        Overrides the parent method to also delete the temporary uncompressed archive, if any
+        :return:
+        """
+        with self._lock:
+            super(_TarFileSystem, self).close()
+            if self._tmp_finalizer is not None:
+                self._tmp_finalizer()
+                self._tmp_finalizer = None
+                self._tmp_path = None
+
+    def _get_members(self) -> Dict[str, tarfile.TarInfo]:
+        """
+        Returns a dictionary {member_path: TarInfo} of all regular files in the archive, by normalized path
+        :return:
+        """
+        with self._lock:
+            if self._members is None:
+                members = dict()
+                for info in self._get_archive().getmembers():
+                    member_path = _normalize_member_name(info.name)
+                    if member_path is not None and info.isfile():
+                        members[member_path] = info
+                self._members = members
+            return self._members
+
+    def _list_members(self) -> Iterable[Tuple[str, bool]]:
+        # the whole index is read once
+        return [(info.name, info.isdir()) for info in self._get_archive().getmembers()
+                if info.isdir() or info.isfile()]
+
+    def _read_member(self, member_path: str) -> bytes:
+        member_file = self._get_archive().extractfile(self._get_members()[member_path])
+        try:
+            return member_file.read()
+        finally:
+            member_file.close()
+
+
+def _close_and_remove(archive: tarfile.TarFile, tmp_path: str):
+    """
+    Closes the archive if any, and removes the temporary file at tmp_path if it still exists. Used as a finalizer, so it
+    should not reference the object owning the file.
+
+    :param archive:
+    :param tmp_path:
+    :return:
+    """
+    if archive is not None:
+        archive.close()
+    try:
+        remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+
+class _MemoryFileSystem(_ArchiveFileSystem):
+    """
+    A file system made of a nested dictionary {name: contents} where contents are either bytes or str (files) or
+    dictionaries (folders). It is seen as a folder located at root_path.
+    """
+
+    def __init__(self, contents: Dict[str, Any], root_path: str, encoding: str):
+        """
+        :param contents: the nested dictionary of folders and files
+        :param root_path: the virtual path of the root folder
+        :param encoding: the encoding used to convert str contents to bytes, when a binary stream is requested
+        """
+        super(_MemoryFileSystem, self).__init__(root_path)
+        _check_memory_contents(contents, root_path)
+        self._contents = contents
+        self._encoding = encoding
+
+    def _open_archive(self):
+        return self._contents
+
+    def _list_members(self) -> Iterable[Tuple[str, bool]]:
+        members = []
+        folders_to_list = [('', self._contents)]
+        while len(folders_to_list) > 0:
+            folder_path, folder = folders_to_list.pop()
+            for name, contents in folder.items():
+                member_path = name if folder_path == '' else (folder_path + '/' + name)
+                if isinstance(contents, dict):
+                    members.append((member_path, True))
+                    folders_to_list.append((member_path, contents))
+                else:
+                    members.append((member_path, False))
+        return members
+
+    def _get_member(self, member_path: str) -> Union[bytes, str]:
+        contents = self._contents
+        for name in member_path.split('/'):
+            contents = contents[name]
+        return contents
+
+    def _read_member(self, member_path: str) -> bytes:
+        contents = self._get_member(member_path)
+        return contents if isinstance(contents, bytes) else contents.encode(self._encoding)
+
+    def open(self, path: str, encoding: str = None):
+        """
+        Overrides the parent method so that str contents are directly provided as text streams, without encoding
+
+        :param path:
+        :param encoding:
+        :return:
+        """
+        member_path = self._get_member_path(path)
+        if member_path is not None and self._is_file_member(member_path) and encoding is not None:
+            contents = self._get_member(member_path)
+            if isinstance(contents, str):
+                return StringIO(contents)
+        return super(_MemoryFileSystem, self).open(path, encoding=encoding)
+
+
+def _check_memory_contents(contents: Dict[str, Any], path: str):
+    """
+    Utility method to check that a nested dictionary of in-memory contents is valid
+
+    :param contents:
+    :param path: the path of this folder, for error messages
+    :return:
+    """
+    check_var(contents, var_types=dict, var_name='contents')
+    for name, child in contents.items():
+        if not isinstance(name, str) or name in {'', '.', '..'} or '/' in name or '\\' in name:
+            raise ValueError('Invalid name in memory contents at ' + path + ' : ' + repr(name))
+        if isinstance(child, dict):
+            _check_memory_contents(child, path + '/' + name)
+        elif not isinstance(child, (bytes, str)):
+            raise TypeError('Contents at ' + path + '/' + name + ' should be bytes, str or dict, found: '
+                            + str(type(child)))
+
+
+class WrappedZipFileMappingConfiguration(WrappedFileMappingConfiguration):
+    """
+    A wrapped file mapping (multifile objects are represented by folders) over the contents of a zip archive. The
+    archive is seen as a folder at the archive path: for example the object stored in 'a/b.txt' in archive 'data.zip'
+    is found at location 'data.zip/a/b'. Files are read directly from the archive, without extraction.
+    """
+
+    def __init__(self, archive_path: str, encoding: str = None, lazy_scan: bool = False):
+        """
+        :param archive_path: the path of the zip archive
+        :param encoding: the encoding used to open the files default is 'utf-8'
+        :param lazy_scan: the default scan mode of create_persisted_object. If True the children of multifile objects
+        are only scanned when they are first accessed. Default is False.
+        """
+        super(WrappedZipFileMappingConfiguration, self).__init__(encoding=encoding, lazy_scan=lazy_scan)
+        self._file_system = _ZipFileSystem(archive_path)
+
+    def close(self):
+        """
+        Closes the archive. It will be opened again if needed.
+        :return:
+        """
+        self._file_system.close()
+
+
+class FlatZipFileMappingConfiguration(FlatFileMappingConfiguration):
+    """
+    A flat file mapping (multifile objects are groups of files with the same prefix) over the contents of a zip
+    archive. The archive is seen as a folder at the archive path: for example the object stored in 'a.txt' in archive
+    'data.zip' is found at location 'data.zip/a'. Files are read directly from the archive, without extraction.
+    """
+
+    def __init__(self, archive_path: str, separator: str = None, encoding: str = None, lazy_scan: bool = False):
+        """
+        :param archive_path: the path of the zip archive
+        :param separator: the character sequence used to separate an item name from an item attribute name. Default
+        is '.'
+        :param encoding: encoding used to open the files. Default is 'utf-8'
+        :param lazy_scan: the default scan mode of create_persisted_object. If True the children of multifile objects
+        are only scanned when they are first accessed. Default is False.
+        """
+        super(FlatZipFileMappingConfiguration, self).__init__(separator=separator, encoding=encoding,
+                                                              lazy_scan=lazy_scan)
+        self._file_system = _ZipFileSystem(archive_path)
+
+    def close(self):
+        """
+        Closes the archive. It will be opened again if needed.
+        :return:
+        """
+        self._file_system.close()
+
+
+class WrappedTarFileMappingConfiguration(WrappedFileMappingConfiguration):
+    """
+    A wrapped file mapping (multifile objects are represented by folders) over the contents of a tar archive,
+    compressed or not. The archive is seen as a folder at the archive path: for example the object stored in 'a/b.txt'
+    in archive 'data.tar.gz' is found at location 'data.tar.gz/a/b'. Files are read directly from the archive, without
+    extraction. A compressed archive is decompressed once to a temporary file, deleted by close() (or at the end of a
+    with statement), or else when the configuration is garbage collected.
+    """
+
+    def __init__(self, archive_path: str, encoding: str = None, lazy_scan: bool = False):
+        """
+        :param archive_path: the path of the tar archive
+        :param encoding: the encoding used to open the files default is 'utf-8'
+        :param lazy_scan: the default scan mode of create_persisted_object. If True the children of multifile objects
+        are only scanned when they are first accessed. Default is False.
+        """
+        super(WrappedTarFileMappingConfiguration, self).__init__(encoding=encoding, lazy_scan=lazy_scan)
+        self._file_system = _TarFileSystem(archive_path)
+
+    def close(self):
+        """
+        Closes the archive. It will be opened again if needed.
+        :return:
+        """
+        self._file_system.close()
+
+
+class FlatTarFileMappingConfiguration(FlatFileMappingConfiguration):
+    """
+    A flat file mapping (multifile objects are groups of files with the same prefix) over the contents of a tar
+    archive, compressed or not. The archive is seen as a folder at the archive path: for example the object stored in
+    'a.txt' in archive 'data.tar.gz' is found at location 'data.tar.gz/a'. Files are read directly from the archive,
+    without extraction. A compressed archive is decompressed once to a temporary file, deleted by close() (or at the
+    end of a with statement), or else when the configuration is garbage collected.
+    """
+
+    def __init__(self, archive_path: str, separator: str = None, encoding: str = None, lazy_scan: bool = False):
+        """
+        :param archive_path: the path of the tar archive
+        :param separator: the character sequence used to separate an item name from an item attribute name. Default
+        is '.'
+        :param encoding: encoding used to open the files. Default is 'utf-8'
+        :param lazy_scan: the default scan mode of create_persisted_object. If True the children of multifile objects
+        are only scanned when they are first accessed. Default is False.
+        """
+        super(FlatTarFileMappingConfiguration, self).__init__(separator=separator, encoding=encoding,
+                                                              lazy_scan=lazy_scan)
+        self._file_system = _TarFileSystem(archive_path)
+
+    def close(self):
+        """
+        Closes the archive. It will be opened again if needed.
+        :return:
+        """
+        self._file_system.close()
+
+
+class MemoryFileMappingConfiguration(WrappedFileMappingConfiguration):
+    """
+    A wrapped file mapping over an in-memory nested dictionary {name: contents}, where contents are either bytes or
+    str (files, whose name should include the extension) or dictionaries (folders). This allows to parse payloads
+    without writing them to disk. The dictionary is seen as a folder at location root_location (default '<memory>'):
+    for example {'a': {'b.txt': 'hello'}} contains an object at location '<memory>/a/b'.
+    """
+
+    def __init__(self, contents: Dict[str, Any], root_location: str = None, encoding: str = None,
+                 lazy_scan: bool = False):
+        """
+        :param contents: the nested dictionary of folders and files. It should not be modified while it is used.
+        :param root_location: the location of the root folder. Default is '<memory>'
+        :param encoding: the encoding of the files provided as bytes. Default is 'utf-8'
+        :param lazy_scan: the default scan mode of create_persisted_object. If True the children of multifile objects
+        are only scanned when they are first accessed. Default is False.
+        """
+        super(MemoryFileMappingConfiguration, self).__init__(encoding=encoding, lazy_scan=lazy_scan)
+        check_var(root_location, var_types=str, var_name='root_location', enforce_not_none=False, min_len=1)
+        self.root_location = root_location or '<memory>'
+        self._file_system = _MemoryFileSystem(contents, self.root_location, self.encoding)
+
+    def get_location(self, path: str = None) -> str:
+        """
+        Returns the location of the object at path in the dictionary.
+
+        :param path: a '/'-separated path of names in the dictionary, such as 'a/b', without extension. Default is None,
+        meaning the root of the dictionary
+        :return:
+        """
+        check_var(path, var_types=str, var_name='path', enforce_not_none=False)
+        if path is None or path.strip('/') == '':
+            return self.root_location
+        else:
+            return join(self.root_location, *path.strip('/').split('/'))
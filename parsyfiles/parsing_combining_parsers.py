@@ -284,6 +284,31 @@ class CascadingParser(DelegatingParser):
             # -- activate the next one
             self.activate_next_working_parser(logger=logger)
 
+            # -- remember the initial state, so that each execution starts from the same parser
+            self._initial_state = (self.active_parser_idx, self.active_parsing_plan,
+                                   dict(self.parsing_plan_creation_errors))
+
+        def _stamp(self, obj_on_filesystem: PersistedObject) -> ParsingPlan[T]:
+            """
+            Implementation of the parent method: the cascade can be reused if the currently active parsing plan can.
+            The new cascade starts at the same parser, and remembers the same plan creation errors.
+
+            :param obj_on_filesystem:
+            :return:
+            """
+            active_parser_idx, active_parsing_plan, creation_errors = self._initial_state
+            active_pp = active_parsing_plan.pp._stamp(obj_on_filesystem)
+            if active_pp is None:
+                return None
+            pp = object.__new__(self.__class__)
+            pp.__dict__.update(self.__dict__)
+            pp.obj_on_fs_to_parse = obj_on_filesystem
+            pp.active_parser_idx = active_parser_idx
+            pp.active_parsing_plan = CascadingParser.ActiveParsingPlan(active_pp, self.parser)
+            pp.parsing_plan_creation_errors = dict(creation_errors)
+            pp._initial_state = (active_parser_idx, pp.active_parsing_plan, dict(creation_errors))
+            return pp
+
         def activate_next_working_parser(self, already_caught_execution_errors: Dict[AnyParser, Exception] = None,
                                          logger: Logger = None):
             """
@@ -307,7 +332,7 @@ class CascadingParser(DelegatingParser):
                     try:
                         # -- try to rebuild a parsing plan with next parser, and remember it if is succeeds
                         self.active_parsing_plan = CascadingParser.ActiveParsingPlan(p.create_parsing_plan(
-                            self.obj_type, self.obj_on_fs_to_parse, self.logger, _main_call=False), self.parser)
+                            self.obj_type, self.obj_on_fs_to_parse, logger, _main_call=False), self.parser)
                         self.active_parser_idx = i
                         # if i > 0:
                         #     if logger is not None:
@@ -338,12 +363,15 @@ class CascadingParser(DelegatingParser):
         def execute(self, logger: Logger, options: Dict[str, Dict[str, Any]]):
             """
             Delegates execution to currently active parser. In case of an exception, recompute the parsing plan and
-            do it again on the next one.
+            do it again on the next one. Each execution starts from the parser that was active when this plan was
+            created, so that a plan may be executed several times.
 
             :param logger:
             :param options:
             :return:
             """
+            self.active_parser_idx, self.active_parsing_plan, creation_errors = self._initial_state
+            self.parsing_plan_creation_errors = dict(creation_errors)
             if self.active_parsing_plan is not None:
                 execution_errors = dict()
                 while self.active_parsing_plan is not None:
@@ -493,6 +521,17 @@ class ParsingChain(AnyParser):
         # then apply the conversion chain
         return self._converter.convert(desired_type, first, logger, options)
 
+    def _parse_singlefile_object(self, desired_type: Type[T], obj: PersistedObject, logger: Logger,
+                                 options: Dict[str, Dict[str, Any]]) -> T:
+        """
+        Overrides the parent method so that the base parser may read the object its own way (for example from a stream)
+        """
+        # first use the base parser to parse something compliant with the conversion chain
+        first = self._base_parser._parse_singlefile_object(self._converter.from_type, obj, logger, options)
+
+        # then apply the conversion chain
+        return self._converter.convert(desired_type, first, logger, options)
+
     def _get_parsing_plan_for_multifile_children(self, obj_on_fs: PersistedObject, desired_type: Type[Any],
                                                  logger: Logger) -> Dict[str, Any]:
         """
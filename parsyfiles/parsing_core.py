@@ -1,7 +1,11 @@
 import threading
 from abc import abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor, Future, CancelledError
 from io import TextIOBase
 from logging import Logger
+from os import remove
+from shutil import copyfileobj
+from tempfile import NamedTemporaryFile
 from typing import Union, Type, Callable, Dict, Any, Set
 
 from parsyfiles.converting_core import get_options_for_id
@@ -66,6 +70,33 @@ class _BaseParser(Parser):
         """
         pass
 
+    def _parse_singlefile_object(self, desired_type: Type[T], obj: PersistedObject, logger: Logger,
+                                 options: Dict[str, Dict[str, Any]]) -> T:
+        """
+        Method called by (_BaseParsingPlan).execute to parse a singlefile object. The default implementation calls
+        _parse_singlefile with the path of the file. If the file is not on the local file system (for example if it is
+        stored in an archive), its contents are first copied to a temporary file. This copy is only meant for parsers
+        that need a file path, typically because they rely on a third-party library that can not read from a stream:
+        parsers able to read the object from a stream should override this method to avoid it (see
+        SingleFileParserFunction in streaming mode).
+
+        :param desired_type:
+        :param obj:
+        :param logger:
+        :param options:
+        :return:
+        """
+        if obj.has_local_singlefile_path():
+            return self._parse_singlefile(desired_type, obj.get_singlefile_path(), obj.get_singlefile_encoding(),
+                                          logger, options)
+        else:
+            tmp_file_path = _copy_to_temporary_file(obj)
+            try:
+                return self._parse_singlefile(desired_type, tmp_file_path, obj.get_singlefile_encoding(), logger,
+                                              options)
+            finally:
+                remove(tmp_file_path)
+
     @abstractmethod
     def _parse_multifile(self, desired_type: Type[T], obj: PersistedObject,
                          parsing_plan_for_children: Dict[str, ParsingPlan], logger: Logger,
@@ -83,6 +114,23 @@ class _BaseParser(Parser):
         pass
 
 
+def _copy_to_temporary_file(obj: PersistedObject) -> str:
+    """
+    Utility method to copy the contents of a singlefile object to a temporary file, with the same extension. The caller
+    is responsible for deleting the file.
+
+    :param obj:
+    :return: the path of the temporary file
+    """
+    src = obj.open_singlefile_stream(binary=True)
+    try:
+        with NamedTemporaryFile(suffix=obj.ext, delete=False) as tmp_file:
+            copyfileobj(src, tmp_file)
+    finally:
+        src.close()
+    return tmp_file.name
+
+
 class _BaseParsingPlan(ParsingPlan[T]):
     """
     Defines abstract parsing plan objects for _BaseParsers. It
@@ -107,9 +155,15 @@ class _BaseParsingPlan(ParsingPlan[T]):
         check_var(logger, var_types=Logger, var_name='logger', enforce_not_none=False)
         self.logger = logger
 
-    # flag used for create_parsing_plan logs (to prevent recursive print messages)
+    # flags used for execute logs (to prevent recursive print messages), and number of nested multifile parsing plans
+    # being executed
     thrd_locals = threading.local()
 
+    # maximum number of nested multifile parsing plans executed recursively. Deeper plans execute their children
+    # beforehand with _execute_nested_children_plans, so that the depth of the tree is not limited by the interpreter's
+    # recursion limit
+    _MAX_NESTED_EXECUTIONS = 20
+
     def execute(self, logger: Logger, options: Dict[str, Dict[str, Any]]) -> T:
         """
         Overrides the parent method to add log messages.
@@ -128,8 +182,11 @@ class _BaseParsingPlan(ParsingPlan[T]):
                 _BaseParsingPlan.thrd_locals.flag_exec = 1
                 in_root_call = True
 
-        # Common log message
-        logger.info('Parsing ' + str(self))
+        # Common log message, unless _execute_nested_children_plans already logged it when it started with this plan
+        if getattr(_BaseParsingPlan.thrd_locals, 'flag_logged', False):
+            _BaseParsingPlan.thrd_locals.flag_logged = False
+        else:
+            logger.info('Parsing ' + str(self))
 
         try:
             res = super(_BaseParsingPlan, self).execute(logger, options)
@@ -155,12 +212,21 @@ class _BaseParsingPlan(ParsingPlan[T]):
         """
         if isinstance(self.parser, _BaseParser):
             if (not self.is_singlefile) and self.parser.supports_multifile():
-                return self.parser._parse_multifile(self.obj_type, self.obj_on_fs_to_parse,
-                                                    self._get_children_parsing_plan(), logger, options)
+                children_plans = self._get_children_parsing_plan()
+                nb_nested_executions = getattr(_BaseParsingPlan.thrd_locals, 'nb_nested_executions', 0)
+                if nb_nested_executions >= _BaseParsingPlan._MAX_NESTED_EXECUTIONS \
+                        and isinstance(self.parser, MultiFileParser) and self.parser._parses_children_now(options):
+                    # too deep: execute the children plans beforehand, without recursion
+                    children_plans = _execute_nested_children_plans(children_plans, logger, options)
+                _BaseParsingPlan.thrd_locals.nb_nested_executions = nb_nested_executions + 1
+                try:
+                    return self.parser._parse_multifile(self.obj_type, self.obj_on_fs_to_parse, children_plans,
+                                                        logger, options)
+                finally:
+                    _BaseParsingPlan.thrd_locals.nb_nested_executions = nb_nested_executions
 
             elif self.is_singlefile and self.parser.supports_singlefile():
-                return self.parser._parse_singlefile(self.obj_type, self.get_singlefile_path(),
-                                                     self.get_singlefile_encoding(), logger, options)
+                return self.parser._parse_singlefile_object(self.obj_type, self.obj_on_fs_to_parse, logger, options)
             else:
                 raise _InvalidParserException.create(self.parser, self.obj_on_fs_to_parse)
         else:
@@ -170,6 +236,21 @@ class _BaseParsingPlan(ParsingPlan[T]):
     def _get_children_parsing_plan(self) -> Dict[str, ParsingPlan]:
         pass
 
+    def _stamp(self, obj_on_filesystem: PersistedObject) -> ParsingPlan[T]:
+        """
+        Implementation of the parent method. Singlefile plans do not depend on the file contents, so a shallow copy
+        pointing to the new object is enough. Multifile plans depend on the children found, so they can not be reused.
+
+        :param obj_on_filesystem:
+        :return:
+        """
+        if not self.obj_on_fs_to_parse.is_singlefile:
+            return None
+        pp = object.__new__(self.__class__)
+        pp.__dict__.update(self.__dict__)
+        pp.obj_on_fs_to_parse = obj_on_filesystem
+        return pp
+
 
 class AnyParser(_BaseParser):
     """
@@ -226,9 +307,13 @@ class AnyParser(_BaseParser):
                 # -- if multifile, get the parsing plan for children
                 elif (not self.obj_on_fs_to_parse.is_singlefile) and parser.supports_multifile():
                     if isinstance(parser, AnyParser):
-                        self._children_parsing_plan = parser._get_parsing_plan_for_multifile_children(self.obj_on_fs_to_parse,
-                                                                                                      object_type,
-                                                                                                      logger=logger)
+                        pending_plans = getattr(AnyParser.thrd_locals, 'pending_plans', None)
+                        if pending_plans is not None and getattr(AnyParser.thrd_locals, 'nb_nested_plans', 0) \
+                                >= AnyParser._MAX_NESTED_PLANS:
+                            # too deep: a call of create_parsing_plan above will create the children plans
+                            pending_plans.append(self)
+                        else:
+                            self._create_children_parsing_plan()
                     else:
                         raise TypeError('Parser attached to this _BaseParsingPlan is not a ' + str(AnyParser))
                 else:
@@ -237,6 +322,19 @@ class AnyParser(_BaseParser):
             except Exception as e:
                 raise e.with_traceback(e.__traceback__)
 
+        def _create_children_parsing_plan(self):
+            """
+            Asks the parser for the parsing plan of all children, and stores it in a field.
+
+            :return:
+            """
+            AnyParser.thrd_locals.nb_nested_plans = getattr(AnyParser.thrd_locals, 'nb_nested_plans', 0) + 1
+            try:
+                self._children_parsing_plan = self.parser._get_parsing_plan_for_multifile_children(
+                    self.obj_on_fs_to_parse, self.obj_type, logger=self.logger)
+            finally:
+                AnyParser.thrd_locals.nb_nested_plans -= 1
+
         def _get_children_parsing_plan(self) -> Dict[str, ParsingPlan]:
             """
             Implementation of the parent method by just getting the field built at init time.
@@ -244,9 +342,27 @@ class AnyParser(_BaseParser):
             """
             return self._children_parsing_plan
 
-    # flag used for create_parsing_plan logs (to prevent recursive print messages)
+        def _replace_children_parsing_plan(self, children_parsing_plan: Dict[str, ParsingPlan]) \
+                -> 'AnyParser._RecursiveParsingPlan[T]':
+            """
+            Returns a shallow copy of this plan, that uses the provided children parsing plans
+
+            :param children_parsing_plan:
+            :return:
+            """
+            pp = object.__new__(self.__class__)
+            pp.__dict__.update(self.__dict__)
+            pp._children_parsing_plan = children_parsing_plan
+            return pp
+
+    # flag used for create_parsing_plan logs (to prevent recursive print messages), and plans whose children are
+    # created iteratively by a call of create_parsing_plan that is not too deep
     thrd_locals = threading.local()
 
+    # maximum number of nested multifile parsing plans creating their children recursively. The children of deeper
+    # plans are created afterwards, so that the depth of the tree is not limited by the interpreter's recursion limit
+    _MAX_NESTED_PLANS = 20
+
     # note: it is normal that signature does not match parent.
     def create_parsing_plan(self, desired_type: Type[T], filesystem_object: PersistedObject, logger: Logger,
                             _main_call: bool = True):
@@ -254,6 +370,12 @@ class AnyParser(_BaseParser):
         Implements the abstract parent method by using the recursive parsing plan impl. Subclasses wishing to produce
         their own parsing plans should rather override _create_parsing_plan in order to benefit from this same log msg.
 
+        Multifile plans nested deeper than _MAX_NESTED_PLANS do not create their children plans right away: the
+        deepest call made less than _MAX_NESTED_PLANS levels deep creates them afterwards, in the order they were found,
+        and raises the errors. A CascadingParser less than _MAX_NESTED_PLANS levels deep therefore falls back on its
+        next parser as usual, but a deeper one can not fall back when the children plans of its first parser fail to be
+        created: the error is raised by the call above it.
+
         :param desired_type:
         :param filesystem_object:
         :param logger:
@@ -271,13 +393,34 @@ class AnyParser(_BaseParser):
             AnyParser.thrd_locals.flag_init = 1
             in_root_call = True
 
+        # -- the calls that are not too deep create the children of the plans that are too deep
+        pending_plans = getattr(AnyParser.thrd_locals, 'pending_plans', None)
+        own_pending_plans = pending_plans is None
+        if own_pending_plans:
+            pending_plans = AnyParser.thrd_locals.pending_plans = []
+        nb_pending_plans = len(pending_plans)
+        creates_pending_plans = getattr(AnyParser.thrd_locals, 'nb_nested_plans', 0) < AnyParser._MAX_NESTED_PLANS
+
         # -- create the parsing plan
         try:
             pp = self._create_parsing_plan(desired_type, filesystem_object, logger)
+            if creates_pending_plans:
+                # note: the list grows while we iterate, with the plans found too deep again
+                i = nb_pending_plans
+                while i < len(pending_plans):
+                    pending_plans[i]._create_children_parsing_plan()
+                    i += 1
+                del pending_plans[nb_pending_plans:]
+        except BaseException:
+            # forget the plans found during this failed attempt, a cascading parser may try another parser
+            del pending_plans[nb_pending_plans:]
+            raise
         finally:
             # remove threadlocal flag if needed
             if in_root_call:
                 AnyParser.thrd_locals.flag_init = 0
+            if own_pending_plans:
+                AnyParser.thrd_locals.pending_plans = None
 
         # -- log success only if in root call
         if in_root_call:
@@ -422,6 +565,317 @@ class MultiFileParser(AnyParser):
         """
         raise Exception('Not implemented since this is a MultiFileParser')
 
+    def _parses_children_later(self, options: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Returns True if, with these options, _parse_multifile does not parse the children right away (lazy parsing
+        for example). Default implementation returns False.
+
+        :param options:
+        :return:
+        """
+        return False
+
+    def _parses_children_now(self, options: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Returns True if, with these options, _parse_multifile parses the children right away and one after the other.
+        The children plans that are themselves assembled from their children are then executed beforehand, without
+        recursion (see _execute_nested_children_plans).
+
+        :param options:
+        :return:
+        """
+        if self._parses_children_later(options):
+            return False
+        opts = self._get_applicable_options(options)
+        return (opts.get('executor', None) is None and opts.get('max_workers', None) is None) \
+            or getattr(MultiFileParser.thrd_locals, 'flag_child', False)
+
+    # flag used to parse the children sequentially in threads that are already parsing a child concurrently
+    thrd_locals = threading.local()
+
+    def _execute_children_plans(self, parsing_plan_for_children: Dict[str, ParsingPlan[Any]], logger: Logger,
+                                options: Dict[str, Dict[str, Any]], executor: Executor = None,
+                                max_workers: int = None) -> Dict[str, Any]:
+        """
+        Executes the parsing plans of all children and returns the results by child name. If an executor or a number
+        of workers is provided, the children are parsed concurrently. In both cases the results are collected in key
+        order, so that the error raised when several children fail is always the one of the first child in key order.
+
+        The descendants of a child parsed concurrently are parsed sequentially by the thread parsing the child, so
+        that they neither create their own pool nor wait for the pool they are running on.
+
+        :param parsing_plan_for_children:
+        :param logger:
+        :param options:
+        :param executor: an optional concurrent.futures.Executor used to parse the children concurrently
+        :param max_workers: if no executor is provided, an optional number of threads of a pool created to parse the
+        children concurrently. Default is None, meaning that the children are parsed one after the other.
+        :return:
+        """
+        check_var(executor, var_types=Executor, var_name='executor', enforce_not_none=False)
+        check_var(max_workers, var_types=int, var_name='max_workers', enforce_not_none=False, min_value=1)
+
+        results = dict()
+        if (executor is None and max_workers is None) or getattr(MultiFileParser.thrd_locals, 'flag_child', False):
+            for child_name, child_plan in sorted(parsing_plan_for_children.items()):
+                results[child_name] = child_plan.execute(logger, options)
+            return results
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [(child_name, executor.submit(MultiFileParser._execute_child_plan, child_plan, logger, options))
+                       for child_name, child_plan in sorted(parsing_plan_for_children.items())]
+            try:
+                # -- collect the results in key order, so that the first error in key order is raised
+                for child_name, future in futures:
+                    results[child_name] = future.result()
+            except BaseException:
+                for _, future in futures:
+                    future.cancel()
+                raise
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True)
+        return results
+
+    @staticmethod
+    def _execute_child_plan(child_plan: ParsingPlan[T], logger: Logger, options: Dict[str, Dict[str, Any]]) -> T:
+        """
+        The task executed concurrently for each child by _execute_children_plans
+
+        :param child_plan:
+        :param logger:
+        :param options:
+        :return:
+        """
+        previous_flag = getattr(MultiFileParser.thrd_locals, 'flag_child', False)
+        MultiFileParser.thrd_locals.flag_child = True
+        try:
+            return child_plan.execute(logger, options)
+        finally:
+            MultiFileParser.thrd_locals.flag_child = previous_flag
+
+
+class _ParsingPlanNode(object):
+    """
+    A node of the graph executed by execute_parsing_plan_concurrently: either a parsing plan executed as a whole, or a
+    multifile parsing plan whose assembly step is executed once all of its children nodes are done.
+    """
+
+    def __init__(self, parsing_plan: ParsingPlan, parent: '_ParsingPlanNode' = None, name: str = None):
+        self.parsing_plan = parsing_plan
+        self.parent = parent
+        self.name = name
+        self.is_assembly = False
+        self.nb_pending_children = 0
+        self.done_children_plans = dict()
+
+
+class _DoneParsingPlan(ParsingPlan[T]):
+    """
+    Wraps a child parsing plan already executed by execute_parsing_plan_concurrently or
+    _execute_nested_children_plans : executing it returns the result, or raises the error caught. All other attributes
+    are the ones of the wrapped plan, so that multifile parsers may read them as usual.
+    """
+
+    def __init__(self, parsing_plan: ParsingPlan[T], result: T = None, error: BaseException = None):
+        super(_DoneParsingPlan, self).__init__(parsing_plan.obj_type, parsing_plan.obj_on_fs_to_parse,
+                                               parsing_plan.parser)
+        self.parsing_plan = parsing_plan
+        self.result = result
+        self.error = error
+
+    def __getattr__(self, item):
+        # this is called only if the attribute was not found the usual way
+        return getattr(object.__getattribute__(self, 'parsing_plan'), item)
+
+    def __str__(self):
+        return str(self.parsing_plan)
+
+    def execute(self, logger: Logger, options: Dict[str, Dict[str, Any]]) -> T:
+        return self._execute(logger, options)
+
+    def _execute(self, logger: Logger, options: Dict[str, Dict[str, Any]]) -> T:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _execute_nested_children_plans(parsing_plan_for_children: Dict[str, ParsingPlan[Any]], logger: Logger,
+                                   options: Dict[str, Dict[str, Any]]) -> Dict[str, ParsingPlan[Any]]:
+    """
+    Executes the children plans in key order, as a MultiFileParser parsing them right away would do, and returns the
+    children plans where these are replaced with their outcome. The children plans that are themselves assembled from
+    their children by such a MultiFileParser are walked depth-first on an explicit stack, and each of them is executed
+    once all of its own children are done, so that the depth of the tree is not limited by the interpreter's recursion
+    limit.
+
+    As in sequential mode, the children in key order following a failing child are not executed.
+
+    :param parsing_plan_for_children:
+    :param logger:
+    :param options:
+    :return:
+    """
+    # each frame holds a plan, its name in its parent, its children plans and the names of the children left to visit
+    children_plans = dict(parsing_plan_for_children)
+    stack = [(None, None, children_plans, sorted(children_plans.keys(), reverse=True))]
+    while True:
+        plan, name, children_plans, names_to_visit = stack[-1]
+        if len(names_to_visit) > 0:
+            child_name = names_to_visit.pop()
+            child_plan = children_plans[child_name]
+            if isinstance(child_plan, AnyParser._RecursiveParsingPlan) and (not child_plan.is_singlefile) \
+                    and isinstance(child_plan.parser, MultiFileParser) and child_plan.parser._parses_children_now(options):
+                # log it now, so that the log messages come in the same order than in recursive mode
+                logger.info('Parsing ' + str(child_plan))
+                grand_children_plans = dict(child_plan._get_children_parsing_plan())
+                stack.append((child_plan, child_name, grand_children_plans,
+                              sorted(grand_children_plans.keys(), reverse=True)))
+            else:
+                try:
+                    children_plans[child_name] = _DoneParsingPlan(child_plan,
+                                                                  result=child_plan.execute(logger, options))
+                except Exception as e:
+                    children_plans[child_name] = _DoneParsingPlan(child_plan, error=e)
+                    # the parent will raise this error: do not execute the next children
+                    names_to_visit.clear()
+            continue
+
+        stack.pop()
+        if plan is None:
+            return children_plans
+        try:
+            plan = plan._replace_children_parsing_plan(children_plans)
+            _BaseParsingPlan.thrd_locals.flag_logged = True
+            done = _DoneParsingPlan(plan, result=plan.execute(logger, options))
+        except Exception as e:
+            done = _DoneParsingPlan(plan, error=e)
+            # the parent will raise this error: do not execute the next children
+            stack[-1][3].clear()
+        stack[-1][2][name] = done
+
+
+def execute_parsing_plan_concurrently(parsing_plan: ParsingPlan[T], logger: Logger,
+                                      options: Dict[str, Dict[str, Any]], executor: ThreadPoolExecutor = None,
+                                      max_workers: int = None) -> T:
+    """
+    Executes a parsing plan with a pool of threads, as a dependency graph over the whole plan tree. The leaves of the
+    tree, at any depth, are all submitted to the executor, and the assembly step of each multifile plan is executed
+    by the thread completing its last child. Unlike the executor option of the multifile parsers that only executes
+    the children of one object concurrently, the threads are therefore never left idle while some ready plan remains,
+    even if the tree is unbalanced.
+
+    The result and the error raised are the same as with parsing_plan.execute: each assembly step receives the
+    results of its children, and raises the error of the first failing child in key order. Multifile plans that
+    parse their children later (lazy or background collection parsing) and plans combining several parsers
+    (cascades, parsing chains) are leaves : they are executed as a whole by one thread.
+
+    :param parsing_plan:
+    :param logger:
+    :param options:
+    :param executor: the thread pool running the leaves. Other executors are rejected, since the tasks are closures
+    that submit no result back to the caller. Default is None, meaning that a ThreadPoolExecutor is created and shut
+    down at the end.
+    :param max_workers: if no executor is provided, the number of threads of the pool created. Default is None,
+    meaning that the default of ThreadPoolExecutor is used.
+    :return:
+    """
+    check_var(executor, var_types=ThreadPoolExecutor, var_name='executor', enforce_not_none=False)
+    check_var(max_workers, var_types=int, var_name='max_workers', enforce_not_none=False, min_value=1)
+
+    # build the graph : children are visited in key order, so that leaves are submitted in a reproducible order
+    root = _ParsingPlanNode(parsing_plan)
+    leaves = []
+    nodes_to_visit = [root]
+    while len(nodes_to_visit) > 0:
+        node = nodes_to_visit.pop()
+        plan = node.parsing_plan
+        if isinstance(plan, AnyParser._RecursiveParsingPlan) and isinstance(plan.parser, MultiFileParser) \
+                and not plan.parser._parses_children_later(options):
+            children_plans = plan._get_children_parsing_plan()
+            if len(children_plans) > 0:
+                node.is_assembly = True
+                node.nb_pending_children = len(children_plans)
+                nodes_to_visit += [_ParsingPlanNode(child_plan, node, child_name)
+                                   for child_name, child_plan in sorted(children_plans.items(), reverse=True)]
+                continue
+        leaves.append(node)
+
+    result = Future()
+    lock = threading.Lock()
+
+    def set_result(res: T = None, error: BaseException = None):
+        # the first outcome wins : a task failing outside of execute_node may report after the root is done
+        with lock:
+            if not result.done():
+                if error is not None:
+                    result.set_exception(error)
+                else:
+                    result.set_result(res)
+
+    def execute_node(node: _ParsingPlanNode):
+        # the nodes are not logged as root plans : the calling thread logs the whole plan
+        previous_flag = getattr(_BaseParsingPlan.thrd_locals, 'flag_exec', 0)
+        _BaseParsingPlan.thrd_locals.flag_exec = 1
+        try:
+            while node is not None:
+                try:
+                    if node.is_assembly:
+                        plan = node.parsing_plan._replace_children_parsing_plan(node.done_children_plans)
+                    else:
+                        plan = node.parsing_plan
+                    # the descendants of a leaf are parsed sequentially by the thread executing it
+                    done = _DoneParsingPlan(node.parsing_plan,
+                                            result=MultiFileParser._execute_child_plan(plan, logger, options))
+                except BaseException as e:
+                    done = _DoneParsingPlan(node.parsing_plan, error=e)
+
+                if node.parent is None:
+                    set_result(done.result, done.error)
+                    node = None
+                else:
+                    with lock:
+                        node.parent.done_children_plans[node.name] = done
+                        node.parent.nb_pending_children -= 1
+                        parent_is_ready = node.parent.nb_pending_children == 0
+                    # the thread completing the last child of a node executes its assembly step
+                    node = node.parent if parent_is_ready else None
+        finally:
+            _BaseParsingPlan.thrd_locals.flag_exec = previous_flag
+
+    def forward_task_failure(future: Future):
+        # execute_node catches all parsing errors : this only happens if the task itself could not run
+        if future.cancelled():
+            set_result(error=CancelledError())
+        elif future.exception() is not None:
+            set_result(error=future.exception())
+
+    if logger is not None:
+        logger.info('Executing Parsing Plan for ' + str(parsing_plan))
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for leaf in leaves:
+            try:
+                executor.submit(execute_node, leaf).add_done_callback(forward_task_failure)
+            except BaseException as e:
+                set_result(error=e)
+                break
+        # the root is executed last, once all other nodes are done
+        res = result.result()
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+
+    if logger is not None:
+        logger.info('Completed parsing successfully')
+    return res
+
 
 # aliases used in SingleFileParserFunction
 ParsingMethodForStream = Callable[[Type[T], TextIOBase, Logger], T]
@@ -480,11 +934,15 @@ class SingleFileParserFunction(SingleFileParser): #metaclass=ABCMeta
     have a signature such as my_func(desired_type: Type[T], opened_file: TextIOBase, logger: Logger, **kwargs) -> T
     * if streaming_mode=False, this class does not handle opening and closing the file. parser_function should be a
     my_func(desired_type: Type[T], file_path: str, encoding: str, logger: Logger, **kwargs) -> T
+
+    Streaming mode should be preferred: files that are not on the local file system (for example stored in an
+    archive) are then read directly, whereas they are first copied to a temporary file to provide a file path.
     """
 
     def __init__(self, parser_function: Union[ParsingMethodForStream, ParsingMethodForFile],
                  supported_types: Set[Type[T]], supported_exts: Set[str], streaming_mode: bool = True,
-                 custom_name: str = None, function_args: dict = None, option_hints: Callable[[], str] = None):
+                 custom_name: str = None, function_args: dict = None, option_hints: Callable[[], str] = None,
+                 binary_mode: bool = False):
         """
         Constructor from a parser function , a mandatory set of supported types, and a mandatory set of supported
         extensions.
@@ -502,6 +960,9 @@ class SingleFileParserFunction(SingleFileParser): #metaclass=ABCMeta
         :param supported_exts: mandatory set of supported singlefile extensions ('.txt', '.json' ...)
         :param function_args: kwargs that will be passed to the function at every call
         :param option_hints: an optional method returning a string containing the options descriptions
+        :param binary_mode: an optional boolean (default False) indicating if, in streaming mode, the stream should be
+        opened in binary mode rather than decoded with the file encoding. This is needed for binary formats such as
+        pickle or excel files.
         """
         super(SingleFileParserFunction, self).__init__(supported_types=supported_types, supported_exts=supported_exts)
 
@@ -517,6 +978,8 @@ class SingleFileParserFunction(SingleFileParser): #metaclass=ABCMeta
         # -- check the streaming mode
         check_var(streaming_mode, var_types=bool, var_name='streaming_mode')
         self._streaming_mode = streaming_mode
+        check_var(binary_mode, var_types=bool, var_name='binary_mode')
+        self._binary_mode = binary_mode
 
         # -- remember the static args values
         check_var(function_args, var_types=dict, var_name='function_args', enforce_not_none=False)
@@ -551,6 +1014,49 @@ class SingleFileParserFunction(SingleFileParser): #metaclass=ABCMeta
         return self.get_id_for_options() + ': ' \
                + ('No declared option' if self._option_hints_func is None else self._option_hints_func())
 
+    def _parse_singlefile_object(self, desired_type: Type[T], obj: PersistedObject, logger: Logger,
+                                 options: Dict[str, Dict[str, Any]]) -> T:
+        """
+        Overrides the parent method so that in streaming mode, the stream is directly obtained from the object. This
+        allows to parse files that are not on the local file system (for example stored in an archive) without copy.
+
+        :param desired_type:
+        :param obj:
+        :param logger:
+        :param options:
+        :return:
+        """
+        if self._streaming_mode:
+            opts = get_options_for_id(options, self.get_id_for_options())
+            return self._parse_stream(desired_type, obj.open_singlefile_stream(binary=self._binary_mode), logger, opts)
+        else:
+            return super(SingleFileParserFunction, self)._parse_singlefile_object(desired_type, obj, logger, options)
+
+    def _parse_stream(self, desired_type: Type[T], file_stream: TextIOBase, logger: Logger,
+                      opts: Dict[str, Any]) -> T:
+        """
+        Applies the inner parsing function on the provided stream, and closes it in any case.
+
+        :param desired_type:
+        :param file_stream:
+        :param logger:
+        :param opts: the options for this parser
+        :return:
+        """
+        try:
+            # Apply the parsing function
+            if self.function_args is None:
+                return self._parser_func(desired_type, file_stream, logger, **opts)
+            else:
+                return self._parser_func(desired_type, file_stream, logger, **self.function_args, **opts)
+
+        except TypeError as e:
+            raise CaughtTypeError.create(self._parser_func, e)
+
+        finally:
+            # Close the File in any case
+            file_stream.close()
+
     def _parse_singlefile(self, desired_type: Type[T], file_path: str, encoding: str, logger: Logger,
                           options: Dict[str, Dict[str, Any]]) -> T:
         """
@@ -567,26 +1073,12 @@ class SingleFileParserFunction(SingleFileParser): #metaclass=ABCMeta
         opts = get_options_for_id(options, self.get_id_for_options())
 
         if self._streaming_mode:
-
-            # We open the stream, and let the function parse from it
-            file_stream = None
-            try:
-                # Open the file with the appropriate encoding
+            # We open the stream with the appropriate encoding, and let the function parse from it
+            if self._binary_mode:
+                file_stream = open(file_path, 'rb')
+            else:
                 file_stream = open(file_path, 'r', encoding=encoding)
-
-                # Apply the parsing function
-                if self.function_args is None:
-                    return self._parser_func(desired_type, file_stream, logger, **opts)
-                else:
-                    return self._parser_func(desired_type, file_stream, logger, **self.function_args, **opts)
-
-            except TypeError as e:
-                raise CaughtTypeError.create(self._parser_func, e)
-
-            finally:
-                if file_stream is not None:
-                    # Close the File in any case
-                    file_stream.close()
+            return self._parse_stream(desired_type, file_stream, logger, opts)
 
         else:
             # the parsing function will open the file itself
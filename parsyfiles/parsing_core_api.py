@@ -369,6 +369,22 @@ class ParsingPlan(Generic[T], PersistedObject):
         """
         return self.obj_on_fs_to_parse.get_singlefile_encoding()
 
+    def has_local_singlefile_path(self) -> bool:
+        """
+        Delegates to the inner PersistedObject
+        We have to implement this explicitly because there is a default implementation in the parent class
+        :return:
+        """
+        return self.obj_on_fs_to_parse.has_local_singlefile_path()
+
+    def open_singlefile_stream(self, binary: bool = False):
+        """
+        Delegates to the inner PersistedObject
+        We have to implement this explicitly because there is a default implementation in the parent class
+        :return:
+        """
+        return self.obj_on_fs_to_parse.open_singlefile_stream(binary=binary)
+
     def get_multifile_children(self) -> Dict[str, Any]:
         """
         Delegates to the inner PersistedObject
@@ -383,6 +399,21 @@ class ParsingPlan(Generic[T], PersistedObject):
     def get_pretty_type_str(self) -> str:
         return get_pretty_type_str(self.obj_type)
 
+    def _stamp(self, obj_on_filesystem: PersistedObject) -> 'ParsingPlan[T]':
+        """
+        Returns a new parsing plan identical to this one, but for another persisted object with the same type, file
+        extension and singlefile/multifile nature. This enables collections to create a plan for the first of their
+        children and to stamp out the plans of similar children from it. It should only be called before this plan
+        is executed.
+
+        The default implementation returns None, meaning that the plan depends on the object contents so it can not
+        be reused: a new plan should be created for each object.
+
+        :param obj_on_filesystem:
+        :return:
+        """
+        return None
+
     def execute(self, logger: Logger, options: Dict[str, Dict[str, Any]]) -> T:
         """
         Called to parse the object as described in this parsing plan, using the provided arguments for the parser.
@@ -1,16 +1,26 @@
+import asyncio
 import sys
 import traceback
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
 from io import StringIO
 from logging import getLogger, StreamHandler, Logger
-from typing import Type, Dict, Any
+from threading import Lock, RLock, local
+from time import time
+from typing import Type, Dict, Any, Iterable, Tuple, Callable, Set, List
 from warnings import warn
 
-from parsyfiles.filesystem_mapping import FileMappingConfiguration, WrappedFileMappingConfiguration
+from parsyfiles.filesystem_mapping import FileMappingConfiguration, WrappedFileMappingConfiguration, PersistedObject, \
+    MemoryFileMappingConfiguration
 from parsyfiles.parsing_core_api import T
 from parsyfiles.parsing_registries import ParserRegistryWithConverters
+from parsyfiles.converting_core import is_any_type
+from parsyfiles.parsing_core_api import Parser
+from parsyfiles.parsing_core import execute_parsing_plan_concurrently
 from parsyfiles.plugins_base.support_for_collections import MultifileCollectionParser
 from parsyfiles.plugins_base.support_for_objects import MultifileObjectParser
-from parsyfiles.type_inspection_tools import get_pretty_type_str
+from parsyfiles.type_inspection_tools import get_pretty_type_str, get_base_generic_type
 from parsyfiles.var_checker import check_var
 
 
@@ -30,14 +40,19 @@ def warn_import_error(type_of_obj_support: str, caught: ImportError):
     warn(msg.getvalue())
 
 
-def create_parser_options(lazy_mfcollection_parsing: bool = False) -> Dict[str, Dict[str, Any]]:
+def create_parser_options(lazy_mfcollection_parsing: bool = False,
+                          background_mfcollection_parsing: bool = False) -> Dict[str, Dict[str, Any]]:
     """
     Utility method to create a default options structure with the lazy parsing inside
 
     :param lazy_mfcollection_parsing:
+    :param background_mfcollection_parsing:
     :return: the options structure filled with lazyparsing option (for the MultifileCollectionParser)
     """
-    return {MultifileCollectionParser.__name__: {'lazy_parsing': lazy_mfcollection_parsing}}
+    opts = {'lazy_parsing': lazy_mfcollection_parsing}
+    if background_mfcollection_parsing:
+        opts['background_parsing'] = True
+    return {MultifileCollectionParser.__name__: opts}
 
 
 def add_parser_options(options: Dict[str, Dict[str, Any]], parser_id: str, parser_options: Dict[str, Dict[str, Any]],
@@ -56,6 +71,202 @@ def add_parser_options(options: Dict[str, Dict[str, Any]], parser_id: str, parse
     return options
 
 
+class PluginDeclaration(object):
+    """
+    A lightweight declaration of an optional plugin: its name, the file extensions it is able to read, and the modules
+    of the types it is able to produce. The plugin itself (and the library behind it) is only imported when
+    load_function is called.
+    """
+
+    def __init__(self, name: str, load_function: Callable[['RootParser'], None], supported_exts: Set[str] = None,
+                 types_modules: Set[str] = None, shared_exts: Set[str] = None, shared_types: Set[Type[Any]] = None):
+        """
+        Constructor
+
+        :param name: the name of the plugin, as reported by RootParser.get_loaded_plugins()
+        :param load_function: a function that imports the plugin and registers its parsers and converters in the
+        provided RootParser. It may raise an ImportError.
+        :param supported_exts: the file extensions that should trigger the plugin loading
+        :param types_modules: the root modules of the types that should trigger the plugin loading (e.g. 'pandas')
+        :param shared_exts: the file extensions that the plugin is able to read, but that are commonly read into other
+        types (e.g. '.txt'). They only trigger the plugin loading if the desired type is unknown, is 'Any', or is
+        defined in one of types_modules.
+        :param shared_types: the types that the plugin reads its shared extensions into (e.g. dict). Asking for one of
+        them (or a subclass) from a shared extension also triggers the plugin loading.
+        """
+        check_var(name, var_types=str, var_name='name')
+        self.name = name
+        self.load_function = load_function
+        self.supported_exts = supported_exts or set()
+        self.types_modules = types_modules or set()
+        self.shared_exts = shared_exts or set()
+        self.shared_types = shared_types or set()
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return 'PluginDeclaration<' + self.name + '>'
+
+    def is_relevant_for_type(self, typ: Type[Any]) -> bool:
+        """
+        Returns True if the type is defined in one of the modules declared by this plugin
+
+        :param typ:
+        :return:
+        """
+        module = getattr(typ, '__module__', None) or ''
+        return module.split('.')[0] in self.types_modules
+
+    def is_relevant_for_ext(self, ext: str, desired_types: List[Type[Any]]) -> bool:
+        """
+        Returns True if the file extension is one of the extensions declared by this plugin, or one of its shared
+        extensions and desired_types are not specific to other modules
+
+        :param ext:
+        :param desired_types: the desired types of the query. An empty list means 'unknown'
+        :return:
+        """
+        if ext in self.supported_exts:
+            return True
+        elif ext in self.shared_exts:
+            return len(desired_types) == 0 or any(typ in {Any, object} or is_any_type(typ)
+                                                  or self.is_relevant_for_type(typ) or self._is_shared_type(typ)
+                                                  for typ in desired_types)
+        else:
+            return False
+
+    def _is_shared_type(self, typ: Type[Any]) -> bool:
+        """
+        Returns True if the type (or its base generic type) is a subclass of one of the declared shared types
+
+        :param typ:
+        :return:
+        """
+        try:
+            return any(issubclass(get_base_generic_type(typ), shared_type) for shared_type in self.shared_types)
+        except TypeError:
+            # not a class
+            return False
+
+
+def _load_jprops_plugin(root_parser: 'RootParser'):
+    from parsyfiles.plugins_optional.support_for_jprops import get_default_jprops_parsers
+    root_parser.register_parsers(get_default_jprops_parsers(root_parser, root_parser))
+
+
+def _load_yaml_plugin(root_parser: 'RootParser'):
+    from parsyfiles.plugins_optional.support_for_yaml import get_default_yaml_parsers
+    root_parser.register_parsers(get_default_yaml_parsers(root_parser, root_parser))
+
+
+def _load_numpy_plugin(root_parser: 'RootParser'):
+    from parsyfiles.plugins_optional.support_for_numpy import get_default_np_parsers, get_default_np_converters
+    root_parser.register_parsers(get_default_np_parsers())
+    root_parser.register_converters(get_default_np_converters())
+
+
+def _load_pandas_plugin(root_parser: 'RootParser'):
+    from parsyfiles.plugins_optional.support_for_pandas import get_default_pandas_parsers, \
+        get_default_pandas_converters
+    root_parser.register_parsers(get_default_pandas_parsers())
+    root_parser.register_converters(get_default_pandas_converters())
+
+
+# the optional plugins of the default RootParser, in registration order. Reading a '.txt' file into a type that is not
+# a dict nor a pandas type does not load jprops nor pandas
+DEFAULT_OPTIONAL_PLUGINS = [PluginDeclaration('jprops', _load_jprops_plugin, supported_exts={'.properties'},
+                                              shared_exts={'.txt'}, shared_types={dict}),
+                            PluginDeclaration('yaml', _load_yaml_plugin, supported_exts={'.yaml', '.yml'}),
+                            PluginDeclaration('numpy', _load_numpy_plugin, types_modules={'numpy'}),
+                            PluginDeclaration('pandas', _load_pandas_plugin,
+                                              supported_exts={'.xls', '.xlsx', '.xlsm', '.csv'},
+                                              types_modules={'pandas'}, shared_exts={'.txt'})]
+
+
+class ReusableParsingPlan(object):
+    """
+    A parsing plan for the item at a given location, that may be executed many times. The files are scanned and the
+    plan is created on first execution. The next executions reuse them as long as the fingerprint of the files (see
+    FileMappingConfiguration.get_fingerprint) does not change and no parser or converter is registered in the
+    RootParser. Otherwise the files are scanned and the plan is created again. Executions are serialized.
+
+    Plans can not be persisted since parsers are made of arbitrary functions, but the folder listings can : use a
+    file mapping configuration with a scan_manifest so that scanning again after a change only lists the folders that
+    were modified.
+    """
+
+    def __init__(self, root_parser: 'RootParser', item_type: Type[T], location: str,
+                 file_mapping_conf: FileMappingConfiguration = None):
+        """
+        Constructor. Nothing is scanned here.
+
+        :param root_parser:
+        :param item_type:
+        :param location:
+        :param file_mapping_conf: the file mapping configuration to use. Default is None, meaning that a
+        WrappedFileMappingConfiguration is created once and reused for all executions.
+        """
+        check_var(location, var_types=str, var_name='location')
+        self.root_parser = root_parser
+        self.item_type = item_type
+        self.location = location
+        self.file_mapping_conf = file_mapping_conf or WrappedFileMappingConfiguration()
+
+        # the persisted object and the parsing plan, with the fingerprint of the files and the registry version
+        self._obj = None
+        self._parsing_plan = None
+        self._fingerprint = None
+        self._plans_version = None
+        self._lock = RLock()
+
+    def __str__(self):
+        return 'Reusable parsing plan for ' + self.location + ' > ' + get_pretty_type_str(self.item_type)
+
+    def is_up_to_date(self) -> bool:
+        """
+        Returns True if the current parsing plan can be executed as is
+
+        :return:
+        """
+        return self._parsing_plan is not None and self._fingerprint is not None \
+            and self._plans_version == self.root_parser._plans_version \
+            and self.file_mapping_conf.get_fingerprint(self._obj) == self._fingerprint
+
+    def execute(self, options: Dict[str, Dict[str, Any]] = None, plan_executor: ThreadPoolExecutor = None) -> T:
+        """
+        Executes the parsing plan, after scanning the files and creating it again if it is not up to date.
+
+        :param options:
+        :param plan_executor: an optional ThreadPoolExecutor executing the parsing plan as a dependency graph (see
+        execute_parsing_plan_concurrently)
+        :return:
+        """
+        # for consistency : if options is None, default to the default values of create_parser_options
+        options = options or create_parser_options()
+        logger = self.root_parser._logger
+
+        with self._lock:
+            if self.is_up_to_date():
+                logger.info('Reusing the parsing plan created for ' + str(self._obj))
+            else:
+                # folders modified during the scan make the fingerprint None, so that the plan is not reused. The scan
+                # lists all folders itself, even if another scan is in progress, so they are all listed after scan_start
+                scan_start = time()
+                self._obj = self.file_mapping_conf.create_persisted_object(self.location, logger=logger)
+                self._fingerprint = self.file_mapping_conf.get_fingerprint(self._obj, scan_start=scan_start)
+                logger.info('')
+                self._parsing_plan = self.root_parser.create_parsing_plan(self.item_type, self._obj, logger=logger)
+                # the registry version is read after planning, since optional plugins may be loaded while planning
+                self._plans_version = self.root_parser._plans_version
+            logger.info('')
+
+            if plan_executor is None:
+                return self._parsing_plan.execute(logger=logger, options=options)
+            else:
+                return execute_parsing_plan_concurrently(self._parsing_plan, logger, options, executor=plan_executor)
+
+
 class RootParser(ParserRegistryWithConverters):
     """
     The root parser
@@ -67,7 +278,8 @@ class RootParser(ParserRegistryWithConverters):
     _default_logger.addHandler(ch)
 
     def __init__(self, pretty_name: str = None, strict_matching: bool = False,
-                 register_default_parsers: bool = True, logger: Logger = _default_logger):
+                 register_default_parsers: bool = True, logger: Logger = _default_logger,
+                 lazy_plugins: bool = True, max_reusable_plans: int = 128):
         """
         Constructor. Initializes the dictionary of parsers with the optionally provided initial_parsers, and
         inits the lock that will be used for access in multithreading context.
@@ -76,19 +288,46 @@ class RootParser(ParserRegistryWithConverters):
         :param strict_matching:
         :param register_default_parsers:
         :param logger:
+        :param lazy_plugins: if True (default), the optional plugins (jprops, yaml, numpy, pandas) are only declared
+        at construction, and each of them is imported the first time a matching file extension or type is looked up
+        (see DEFAULT_OPTIONAL_PLUGINS). Its parsers and converters are then registered at the position they would have
+        had if it had been loaded at construction. If False they are all imported at construction.
+        :param max_reusable_plans: the maximum number of reusable parsing plans kept by parse_item and parse_collection
+        when called with reuse_plan=True. When it is reached, the least recently used plan is dropped. Default is 128.
         """
+        check_var(max_reusable_plans, var_types=int, var_name='max_reusable_plans', min_value=1)
+
+        # the optional plugins that are declared, the plugins that have been loaded, and the optional plugins that
+        # are declared but not loaded yet. The registration rank (see _get_registration_rank) is set by the thread
+        # registering the parsers and converters of a plugin
+        self._declared_plugins = list(DEFAULT_OPTIONAL_PLUGINS) if register_default_parsers else []
+        self._loaded_plugins = []
+        self._pending_plugins = []
+        self._plugins_lock = RLock()
+        self._registration = local()
+
         super(RootParser, self).__init__(pretty_name or 'parsyfiles defaults', strict_matching)
 
+        # the reusable parsing plans created by parse_item and parse_collection, from the least to the most recently
+        # used, and the version of the registry : it changes whenever a parser or converter is registered, so that
+        # existing plans are created again
+        self._reusable_plans = OrderedDict()
+        self._max_reusable_plans = max_reusable_plans
+        self._reusable_plans_lock = Lock()
+        self._plans_version = 0
+
         # remember if the user registers the default parsers - for future calls to install_basic_multifile_support()
         self.multifile_installed = register_default_parsers
 
         if register_default_parsers:
             # -------------------- CORE ---------------------------
+            self._registration.rank = 0
             try:
                 # -- primitive types
                 from parsyfiles.plugins_base.support_for_primitive_types import get_default_primitive_parsers, get_default_primitive_converters
                 self.register_parsers(get_default_primitive_parsers())
                 self.register_converters(get_default_primitive_converters())
+                self._loaded_plugins.append('primitive types')
             except ImportError as e:
                 warn_import_error('primitive types', e)
 
@@ -97,6 +336,7 @@ class RootParser(ParserRegistryWithConverters):
                 from parsyfiles.plugins_base.support_for_collections import get_default_collection_parsers, get_default_collection_converters
                 self.register_parsers(get_default_collection_parsers(self, self))
                 self.register_converters(get_default_collection_converters(self))
+                self._loaded_plugins.append('collections')
             except ImportError as e:
                 warn_import_error('dict', e)
 
@@ -105,6 +345,7 @@ class RootParser(ParserRegistryWithConverters):
                 from parsyfiles.plugins_base.support_for_objects import get_default_object_parsers, get_default_object_converters
                 self.register_parsers(get_default_object_parsers(self, self))
                 self.register_converters(get_default_object_converters(self))
+                self._loaded_plugins.append('objects')
             except ImportError as e:
                 warn_import_error('objects', e)
 
@@ -113,46 +354,185 @@ class RootParser(ParserRegistryWithConverters):
                 from parsyfiles.plugins_base.support_for_configparser import get_default_config_parsers, get_default_config_converters
                 self.register_parsers(get_default_config_parsers())
                 self.register_converters(get_default_config_converters(self))
+                self._loaded_plugins.append('config')
             except ImportError as e:
                 warn_import_error('config', e)
+            del self._registration.rank
 
             # ------------------------- OPTIONAL -----------------
-            try:
-                # -- jprops
-                from parsyfiles.plugins_optional.support_for_jprops import get_default_jprops_parsers
-                self.register_parsers(get_default_jprops_parsers(self, self))
-                # self.register_converters()
-            except ImportError as e:
-                warn_import_error('DataFrame', e)
-
-            try:
-                # -- yaml
-                from parsyfiles.plugins_optional.support_for_yaml import get_default_yaml_parsers
-                self.register_parsers(get_default_yaml_parsers(self, self))
-                # self.register_converters()
-            except ImportError as e:
-                warn_import_error('DataFrame', e)
-
-            try:
-                # -- numpy
-                from parsyfiles.plugins_optional.support_for_numpy import get_default_np_parsers, get_default_np_converters
-                self.register_parsers(get_default_np_parsers())
-                self.register_converters(get_default_np_converters())
-            except ImportError as e:
-                warn_import_error('numpy', e)
-
-            try:
-                # -- pandas
-                from parsyfiles.plugins_optional.support_for_pandas import get_default_pandas_parsers, get_default_pandas_converters
-                self.register_parsers(get_default_pandas_parsers())
-                self.register_converters(get_default_pandas_converters())
-            except ImportError as e:
-                warn_import_error('DataFrame', e)
+            self._pending_plugins = list(self._declared_plugins)
+            if not lazy_plugins:
+                self.load_all_plugins()
 
         logger = logger or RootParser._default_logger
         check_var(logger, var_types=Logger, var_name='logger')
         self._logger = logger
 
+    def get_loaded_plugins(self) -> List[str]:
+        """
+        Returns the names of the plugins that are currently loaded, in loading order. Optional plugins that failed to
+        import are not listed.
+
+        :return:
+        """
+        return list(self._loaded_plugins)
+
+    def get_pending_plugins(self) -> List[str]:
+        """
+        Returns the names of the optional plugins that are declared but not loaded yet.
+
+        :return:
+        """
+        return [plugin.name for plugin in self._pending_plugins]
+
+    def load_all_plugins(self):
+        """
+        Loads all the optional plugins that are not loaded yet.
+
+        :return:
+        """
+        self._load_plugins(lambda plugin: True)
+
+    def _load_plugins_for(self, types: List[Type[Any]], ext: str = None):
+        """
+        Loads the pending plugins relevant for the provided types and file extension. If no type and no extension is
+        provided, the query is a 'wildcard' query, so all pending plugins are loaded.
+
+        :param types:
+        :param ext:
+        :return:
+        """
+        if len(self._pending_plugins) == 0:
+            return
+        types = [typ for typ in types if typ is not None]
+        if len(types) == 0 and ext is None:
+            self.load_all_plugins()
+        else:
+            self._load_plugins(lambda plugin: (ext is not None and plugin.is_relevant_for_ext(ext, types))
+                               or any(plugin.is_relevant_for_type(typ) for typ in types))
+
+    def _load_plugins(self, is_relevant: Callable[[PluginDeclaration], bool]):
+        """
+        Loads the pending plugins for which is_relevant returns True. Their parsers and converters are registered with
+        the rank of the plugin, so that they are stored in the same order than when all plugins are loaded at
+        construction. A plugin is removed from the pending plugins only once it is fully registered.
+
+        :param is_relevant:
+        :return:
+        """
+        if len(self._pending_plugins) == 0:
+            return
+        with self._plugins_lock:
+            for plugin in [plugin for plugin in self._pending_plugins if is_relevant(plugin)]:
+                self._registration.rank = self._declared_plugins.index(plugin) + 1
+                try:
+                    plugin.load_function(self)
+                    self._loaded_plugins.append(plugin.name)
+                except ImportError as e:
+                    warn_import_error(plugin.name, e)
+                finally:
+                    del self._registration.rank
+                    self._pending_plugins = [p for p in self._pending_plugins if p is not plugin]
+
+    def _get_registration_rank(self) -> int:
+        """
+        Overrides the parent method : the parsers and converters registered at construction come first, then the ones
+        of each optional plugin in declaration order (whenever the plugin is loaded), and then the custom ones, so that
+        custom parsers and converters always take precedence over the plugins.
+
+        :return:
+        """
+        return getattr(self._registration, 'rank', len(self._declared_plugins) + 1)
+
+    def _lookup(self, lookup: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Performs a lookup in the registry. While some optional plugins are pending, another thread may be registering
+        one of them : the lookup is then made under the plugins lock, so that its memoized result never misses part of
+        a plugin.
+
+        :param lookup:
+        :param args:
+        :param kwargs:
+        :return:
+        """
+        if len(self._pending_plugins) == 0:
+            return lookup(*args, **kwargs)
+        else:
+            with self._plugins_lock:
+                return lookup(*args, **kwargs)
+
+    def find_all_matching_parsers(self, strict: bool, desired_type: Type[Any] = None, required_ext: str = None):
+        """
+        Overrides the parent method to first load the optional plugins relevant for this query. Queries without
+        extension (such as capabilities queries) load all pending plugins.
+
+        :param strict:
+        :param desired_type:
+        :param required_ext:
+        :return:
+        """
+        if required_ext is None:
+            self.load_all_plugins()
+        else:
+            self._load_plugins_for([desired_type], required_ext)
+        return self._lookup(super(RootParser, self).find_all_matching_parsers, strict, desired_type=desired_type,
+                            required_ext=required_ext)
+
+    def build_parser_for_fileobject_and_desiredtype(self, obj_on_filesystem: PersistedObject, object_typ: Type[T],
+                                                    logger: Logger = None) -> Parser:
+        """
+        Overrides the parent method so that the memoized parser never misses part of a plugin, see _lookup
+
+        :param obj_on_filesystem:
+        :param object_typ:
+        :param logger:
+        :return:
+        """
+        return self._lookup(super(RootParser, self).build_parser_for_fileobject_and_desiredtype, obj_on_filesystem,
+                            object_typ, logger=logger)
+
+    def get_all_conversion_chains(self, from_type: Type[Any] = None, to_type: Type[Any] = None):
+        """
+        Overrides the parent method to first load the optional plugins relevant for the source and destination types.
+
+        :param from_type:
+        :param to_type:
+        :return:
+        """
+        self._load_plugins_for([from_type, to_type])
+        return self._lookup(super(RootParser, self).get_all_conversion_chains, from_type=from_type, to_type=to_type)
+
+    def _clear_caches(self):
+        """
+        Overrides the parent method to also invalidate the reusable parsing plans : they will create their plan again
+        on next execution
+        :return:
+        """
+        super(RootParser, self)._clear_caches()
+        self._plans_version += 1
+
+    def create_reusable_parsing_plan(self, location: str, item_type: Type[T],
+                                     file_mapping_conf: FileMappingConfiguration = None) -> ReusableParsingPlan:
+        """
+        Creates a parsing plan for the item at location, that may be executed many times without scanning the files
+        and creating the plan again, as long as the files do not change (see ReusableParsingPlan).
+
+        :param location:
+        :param item_type:
+        :param file_mapping_conf:
+        :return:
+        """
+        return ReusableParsingPlan(self, item_type, location, file_mapping_conf=file_mapping_conf)
+
+    def freeze(self):
+        """
+        Overrides the parent method to load all pending optional plugins before freezing
+
+        :return:
+        """
+        self.load_all_plugins()
+        return super(RootParser, self).freeze()
+
     def install_basic_multifile_support(self):
         """
         Utility method for users who created a RootParser with register_default_parsers=False, in order to register only
@@ -168,7 +548,9 @@ class RootParser(ParserRegistryWithConverters):
 
     def parse_collection(self, item_file_prefix: str, base_item_type: Type[T], item_name_for_log: str = None,
                          file_mapping_conf: FileMappingConfiguration = None,
-                         options: Dict[str, Dict[str, Any]] = None) -> Dict[str, T]:
+                         options: Dict[str, Dict[str, Any]] = None, reuse_plan: bool = False,
+                         process_pool: Executor = None, root_parser_factory: Callable[[], 'RootParser'] = None,
+                         plan_executor: ThreadPoolExecutor = None) -> Dict[str, T]:
         """
         Main method to parse a collection of items of type 'base_item_type'.
 
@@ -177,8 +559,27 @@ class RootParser(ParserRegistryWithConverters):
         :param item_name_for_log:
         :param file_mapping_conf:
         :param options:
+        :param reuse_plan: if True, the parsing plan is kept and reused by the next calls with the same location, type
+        and file mapping configuration, as long as the files do not change (see ReusableParsingPlan). Default is False.
+        At most max_reusable_plans plans are kept (see constructor). A reusable plan is locked during its whole
+        execution, so concurrent calls with reuse_plan=True for the same item are executed one after the other.
+        It is not used when process_pool is provided.
+        :param process_pool: an optional executor, typically a concurrent.futures.ProcessPoolExecutor, in which the
+        items of the collection are parsed (see iter_collection)
+        :param root_parser_factory: when process_pool is provided, a picklable callable (for example a module-level
+        function) returning the RootParser used by the workers. It is called once per worker process. Default is
+        None, meaning that a RootParser with default configuration is used: parsers and converters registered on this
+        RootParser are not available to the workers unless the factory registers them too.
+        :param plan_executor: an optional ThreadPoolExecutor executing the parsing plan as a dependency graph, so that
+        all files at any depth are parsed concurrently (see execute_parsing_plan_concurrently). Other executors are
+        rejected with a TypeError. Default is None, meaning that the plan is executed by the calling thread.
         :return:
         """
+        if process_pool is not None:
+            return dict(self.iter_collection(item_file_prefix, base_item_type, item_name_for_log=item_name_for_log,
+                                             file_mapping_conf=file_mapping_conf, options=options,
+                                             process_pool=process_pool, root_parser_factory=root_parser_factory))
+
         # -- item_name_for_log
         item_name_for_log = item_name_for_log or ''
         check_var(item_name_for_log, var_types=str, var_name='item_name_for_log')
@@ -189,10 +590,149 @@ class RootParser(ParserRegistryWithConverters):
                           + get_pretty_type_str(base_item_type) + '> at location ' + item_file_prefix +' ****')
 
         # common steps
-        return self._parse__item(collection_type, item_file_prefix, file_mapping_conf, options=options)
+        return self._parse__item(collection_type, item_file_prefix, file_mapping_conf, options=options,
+                                 reuse_plan=reuse_plan, plan_executor=plan_executor)
+
+    def iter_collection(self, item_file_prefix: str, base_item_type: Type[T], item_name_for_log: str = None,
+                        file_mapping_conf: FileMappingConfiguration = None,
+                        options: Dict[str, Dict[str, Any]] = None, process_pool: Executor = None,
+                        root_parser_factory: Callable[[], 'RootParser'] = None) -> Iterable[Tuple[str, T]]:
+        """
+        Generator version of parse_collection : yields the (name, item) pairs of the collection of items of type
+        'base_item_type', sorted by name. Each item is discovered, planned and parsed right before being yielded, so
+        the first items are available before the rest of the collection has been scanned
+        (see FileMappingConfiguration.iter_children).
+
+        If process_pool is provided, the items are parsed by its workers instead: each item is sent as a parsing task
+        made of its location, the item type, the file mapping configuration and the options, and parsed with the
+        RootParser returned by root_parser_factory in the worker. The parsers are therefore never pickled, but the
+        file mapping configuration, the options and the parsed items need to be picklable (this excludes lazy
+        collection parsing for example). All items are submitted first, and then yielded in name order as they are
+        parsed; if an item can not be parsed, its error is raised when it is reached, and the items not started yet
+        are cancelled.
+
+        :param item_file_prefix:
+        :param base_item_type:
+        :param item_name_for_log:
+        :param file_mapping_conf:
+        :param options:
+        :param process_pool: an optional executor, typically a concurrent.futures.ProcessPoolExecutor, in which the
+        items are parsed.
+        :param root_parser_factory: when process_pool is provided, a picklable callable returning the RootParser used
+        by the workers (see parse_collection). Default is None, meaning that a RootParser with default configuration
+        is used.
+        :return:
+        """
+        # -- item_name_for_log
+        item_name_for_log = item_name_for_log or ''
+        check_var(item_name_for_log, var_types=str, var_name='item_name_for_log')
+
+        self._logger.info('**** Starting to iterate on ' + item_name_for_log + ' collection of <'
+                          + get_pretty_type_str(base_item_type) + '> at location ' + item_file_prefix + ' ****')
+
+        # for consistency : if options is None, default to the default values of create_parser_options
+        options = options or create_parser_options()
+
+        file_mapping_conf = file_mapping_conf or WrappedFileMappingConfiguration()
+
+        if process_pool is not None:
+            check_var(process_pool, var_types=Executor, var_name='process_pool')
+            root_parser_factory = root_parser_factory or RootParser
+            futures = []
+            try:
+                # the children of the items are scanned by the workers
+                for name, obj in file_mapping_conf.iter_children(item_file_prefix, logger=self._logger,
+                                                                 lazy_scan=True, compact=False):
+                    futures.append((name, process_pool.submit(_parse_item_in_worker, root_parser_factory,
+                                                              obj.location, _PicklableType(base_item_type),
+                                                              file_mapping_conf, options)))
+                for name, future in futures:
+                    yield name, future.result()
+            finally:
+                for _, future in futures:
+                    future.cancel()
+            return
+
+        for name, obj in file_mapping_conf.iter_children(item_file_prefix, logger=self._logger):
+            self._logger.info('')
+
+            # create the parsing plan and parse
+            yield name, self._plan_and_execute(base_item_type, obj, options)
+
+    async def parse_collection_async(self, item_file_prefix: str, base_item_type: Type[T],
+                                     item_name_for_log: str = None, file_mapping_conf: FileMappingConfiguration = None,
+                                     options: Dict[str, Dict[str, Any]] = None, executor: Executor = None,
+                                     max_concurrency: int = None) -> Dict[str, T]:
+        """
+        Coroutine version of parse_collection, that never blocks the event loop. The items of the collection are listed
+        in the executor, and then each item is planned and parsed by its own call to the executor, so that items are
+        parsed concurrently. The resulting dictionary is in name order, and if several items can not be parsed the
+        error raised is the one of the first item in name order, as in parse_collection.
+
+        :param item_file_prefix:
+        :param base_item_type:
+        :param item_name_for_log:
+        :param file_mapping_conf:
+        :param options:
+        :param executor: the executor used to run the blocking steps. Default is None, meaning that the default
+        executor of the event loop is used.
+        :param max_concurrency: an optional maximum number of items being parsed at the same time. Default is None,
+        meaning that the only limit is the number of workers of the executor.
+        :return:
+        """
+        # -- item_name_for_log
+        item_name_for_log = item_name_for_log or ''
+        check_var(item_name_for_log, var_types=str, var_name='item_name_for_log')
+        check_var(max_concurrency, var_types=int, var_name='max_concurrency', enforce_not_none=False, min_value=1)
+
+        self._logger.info('**** Starting to parse ' + item_name_for_log + ' collection of <'
+                          + get_pretty_type_str(base_item_type) + '> at location ' + item_file_prefix + ' ****')
+
+        # for consistency : if options is None, default to the default values of create_parser_options
+        options = options or create_parser_options()
+        file_mapping_conf = file_mapping_conf or WrappedFileMappingConfiguration()
+        loop = asyncio.get_event_loop()
+
+        # list the items. The contents of each item are scanned when it is planned
+        children = await loop.run_in_executor(executor, lambda: list(file_mapping_conf.iter_children(
+            item_file_prefix, logger=self._logger, lazy_scan=True, compact=False)))
+
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+
+        async def parse_child(obj: PersistedObject):
+            if semaphore is None:
+                return await loop.run_in_executor(executor, self._plan_and_execute, base_item_type, obj, options)
+            else:
+                async with semaphore:
+                    return await loop.run_in_executor(executor, self._plan_and_execute, base_item_type, obj, options)
+
+        tasks = [(name, asyncio.ensure_future(parse_child(obj))) for name, obj in children]
+        results = dict()
+        try:
+            # -- await the items in name order, so that the first error in name order is raised
+            for name, task in tasks:
+                results[name] = await task
+        finally:
+            for _, task in tasks:
+                task.cancel()
+        return results
+
+    def _plan_and_execute(self, item_type: Type[T], obj: PersistedObject, options: Dict[str, Dict[str, Any]]) -> T:
+        """
+        Creates the parsing plan to parse obj as an item_type, and executes it
+
+        :param item_type:
+        :param obj:
+        :param options:
+        :return:
+        """
+        pp = self.create_parsing_plan(item_type, obj, logger=self._logger)
+        self._logger.info('')
+        return pp.execute(logger=self._logger, options=options)
 
     def parse_item(self, location: str, item_type: Type[T], item_name_for_log: str = None,
-                   file_mapping_conf: FileMappingConfiguration = None, options: Dict[str, Dict[str, Any]] = None) -> T:
+                   file_mapping_conf: FileMappingConfiguration = None, options: Dict[str, Dict[str, Any]] = None,
+                   reuse_plan: bool = False, plan_executor: ThreadPoolExecutor = None) -> T:
         """
         Main method to parse an item of type item_type
 
@@ -201,6 +741,13 @@ class RootParser(ParserRegistryWithConverters):
         :param item_name_for_log:
         :param file_mapping_conf:
         :param options:
+        :param reuse_plan: if True, the parsing plan is kept and reused by the next calls with the same location, type
+        and file mapping configuration, as long as the files do not change (see ReusableParsingPlan). Default is False.
+        At most max_reusable_plans plans are kept (see constructor). A reusable plan is locked during its whole
+        execution, so concurrent calls with reuse_plan=True for the same item are executed one after the other.
+        :param plan_executor: an optional ThreadPoolExecutor executing the parsing plan as a dependency graph, so that
+        all files at any depth are parsed concurrently (see execute_parsing_plan_concurrently). Other executors are
+        rejected with a TypeError. Default is None, meaning that the plan is executed by the calling thread.
         :return:
         """
 
@@ -212,11 +759,71 @@ class RootParser(ParserRegistryWithConverters):
                           + get_pretty_type_str(item_type) + '> at location ' + location + ' ****')
 
         # common steps
-        return self._parse__item(item_type, location, file_mapping_conf, options=options)
+        return self._parse__item(item_type, location, file_mapping_conf, options=options, reuse_plan=reuse_plan,
+                                 plan_executor=plan_executor)
+
+    async def parse_item_async(self, location: str, item_type: Type[T], item_name_for_log: str = None,
+                               file_mapping_conf: FileMappingConfiguration = None,
+                               options: Dict[str, Dict[str, Any]] = None, executor: Executor = None) -> T:
+        """
+        Coroutine version of parse_item, that never blocks the event loop : the scan, plan and execute steps are run
+        one after the other in the executor.
+
+        :param location:
+        :param item_type:
+        :param item_name_for_log:
+        :param file_mapping_conf:
+        :param options:
+        :param executor: the executor used to run the blocking steps. Default is None, meaning that the default
+        executor of the event loop is used.
+        :return:
+        """
+        # -- item_name_for_log
+        item_name_for_log = item_name_for_log or ''
+        check_var(item_name_for_log, var_types=str, var_name='item_name_for_log')
+
+        self._logger.info('**** Starting to parse single object ' + item_name_for_log + ' of type <'
+                          + get_pretty_type_str(item_type) + '> at location ' + location + ' ****')
+
+        # for consistency : if options is None, default to the default values of create_parser_options
+        options = options or create_parser_options()
+        file_mapping_conf = file_mapping_conf or WrappedFileMappingConfiguration()
+        loop = asyncio.get_event_loop()
+
+        obj = await loop.run_in_executor(executor, partial(file_mapping_conf.create_persisted_object, location,
+                                                           logger=self._logger))
+        self._logger.info('')
+        pp = await loop.run_in_executor(executor, partial(self.create_parsing_plan, item_type, obj,
+                                                          logger=self._logger))
+        self._logger.info('')
+        return await loop.run_in_executor(executor, partial(pp.execute, logger=self._logger, options=options))
+
+    def parse_item_from_memory(self, contents: Dict[str, Any], item_type: Type[T], location: str = None,
+                               item_name_for_log: str = None, encoding: str = None,
+                               options: Dict[str, Dict[str, Any]] = None) -> T:
+        """
+        Parses an item of type item_type from in-memory contents, without writing them to disk. contents is a nested
+        dictionary {name: contents} where contents are either bytes or str (files, whose name should include the
+        extension) or dictionaries (folders), see MemoryFileMappingConfiguration.
+
+        :param contents:
+        :param item_type:
+        :param location: the '/'-separated path of the item in contents, without extension. Default is None, meaning
+        that the whole dictionary is the item to parse (multifile)
+        :param item_name_for_log:
+        :param encoding: the encoding used to decode the files provided as bytes. Default is 'utf-8'
+        :param options:
+        :return:
+        """
+        file_mapping_conf = MemoryFileMappingConfiguration(contents, encoding=encoding)
+        return self.parse_item(file_mapping_conf.get_location(location), item_type,
+                               item_name_for_log=item_name_for_log, file_mapping_conf=file_mapping_conf,
+                               options=options)
 
     def _parse__item(self, item_type: Type[T], item_file_prefix: str,
                      file_mapping_conf: FileMappingConfiguration = None,
-                     options: Dict[str, Dict[str, Any]] = None) -> T:
+                     options: Dict[str, Dict[str, Any]] = None, reuse_plan: bool = False,
+                     plan_executor: ThreadPoolExecutor = None) -> T:
         """
         Common parsing steps to parse an item
 
@@ -224,8 +831,37 @@ class RootParser(ParserRegistryWithConverters):
         :param item_file_prefix:
         :param file_mapping_conf:
         :param options:
+        :param reuse_plan:
+        :param plan_executor:
         :return:
         """
+        # fail before scanning the files
+        check_var(plan_executor, var_types=ThreadPoolExecutor, var_name='plan_executor', enforce_not_none=False)
+
+        if reuse_plan:
+            key = (item_type, item_file_prefix, file_mapping_conf)
+            try:
+                hash(key)
+            except TypeError:
+                # unhashable type: the plan is not kept
+                key = None
+            if key is None:
+                pp = self.create_reusable_parsing_plan(item_file_prefix, item_type, file_mapping_conf=file_mapping_conf)
+            else:
+                with self._reusable_plans_lock:
+                    pp = self._reusable_plans.get(key, None)
+                    if pp is None:
+                        # nothing is scanned here, the plan is created on first execution
+                        pp = self.create_reusable_parsing_plan(item_file_prefix, item_type,
+                                                               file_mapping_conf=file_mapping_conf)
+                        self._reusable_plans[key] = pp
+                        if len(self._reusable_plans) > self._max_reusable_plans:
+                            self._reusable_plans.popitem(last=False)
+                    else:
+                        self._reusable_plans.move_to_end(key)
+            res = pp.execute(options=options, plan_executor=plan_executor)
+            self._logger.info('')
+            return res
 
         # for consistency : if options is None, default to the default values of create_parser_options
         options = options or create_parser_options()
@@ -242,18 +878,99 @@ class RootParser(ParserRegistryWithConverters):
         self._logger.info('')
 
         # parse
-        res = pp.execute(logger=self._logger, options=options)
+        if plan_executor is None:
+            res = pp.execute(logger=self._logger, options=options)
+        else:
+            res = execute_parsing_plan_concurrently(pp, self._logger, options, executor=plan_executor)
         # print('')
         self._logger.info('')
 
         return res
 
 
+# the RootParsers used by the module-level parse_item and parse_collection, built on first use (one per logger)
+_default_root_parsers = dict()  # type: Dict[Logger, RootParser]
+
+
+def get_default_root_parser(logger: Logger = RootParser._default_logger) -> RootParser:
+    """
+    Returns the RootParser with default configuration used by the module-level parse_item and parse_collection for this
+    logger. It is created on first call and then shared by all subsequent calls, so that the plugins are imported and
+    the parsers and converters registered only once per process. Parsers or converters registered on it are therefore
+    visible to all subsequent calls of parse_item and parse_collection, until reset_default_root_parser() is called.
+
+    :param logger:
+    :return:
+    """
+    try:
+        return _default_root_parsers[logger]
+    except KeyError:
+        # if two threads get there at the same time, they will both use the first one stored
+        return _default_root_parsers.setdefault(logger, RootParser('parsyfiles defaults', logger=logger))
+
+
+def reset_default_root_parser():
+    """
+    Discards the RootParsers created by get_default_root_parser, so that the next call to parse_item or
+    parse_collection creates a brand new one. This is mostly useful in tests.
+
+    :return:
+    """
+    _default_root_parsers.clear()
+
+
+class _PicklableType(object):
+    """
+    A picklable representation of a type, used to send item types to worker processes : before python 3.7 the
+    parameterized generic types of the typing module such as Dict[str, int] can not be pickled.
+    """
+
+    def __init__(self, typ: Type[T]):
+        args = getattr(typ, '__args__', None) if sys.version_info < (3, 7) else None
+        if args:
+            self.origin = _PicklableType(typ.__origin__)
+            self.args = tuple(_PicklableType(arg) for arg in args)
+        else:
+            self.origin = typ
+            self.args = None
+
+    def get_type(self) -> Type[T]:
+        if self.args is None:
+            return self.origin
+        else:
+            return self.origin.get_type()[tuple(arg.get_type() for arg in self.args)]
+
+
+# the RootParsers used by the workers of RootParser.iter_collection, built on first use (one per factory)
+_worker_root_parsers = dict()  # type: Dict[Callable[[], RootParser], RootParser]
+
+
+def _parse_item_in_worker(root_parser_factory: Callable[[], RootParser], location: str, item_type: _PicklableType,
+                          file_mapping_conf: FileMappingConfiguration, options: Dict[str, Dict[str, Any]]) -> T:
+    """
+    The parsing task executed by the workers of RootParser.iter_collection. The RootParser is created on first call in
+    each worker process and then reused for all subsequent tasks.
+
+    :param root_parser_factory:
+    :param location:
+    :param item_type:
+    :param file_mapping_conf:
+    :param options:
+    :return:
+    """
+    try:
+        rp = _worker_root_parsers[root_parser_factory]
+    except KeyError:
+        rp = _worker_root_parsers.setdefault(root_parser_factory, root_parser_factory())
+    return rp.parse_item(location, item_type.get_type(), file_mapping_conf=file_mapping_conf, options=options)
+
+
 def parse_item(location: str, item_type: Type[T], item_name_for_log: str = None,
                file_mapping_conf: FileMappingConfiguration = None,
-               logger: Logger = RootParser._default_logger, lazy_mfcollection_parsing: bool = False) -> T:
+               logger: Logger = RootParser._default_logger, lazy_mfcollection_parsing: bool = False,
+               reuse_plan: bool = False) -> T:
     """
-    Creates a RootParser() and calls its parse_item() method
+    Uses the shared default RootParser (see get_default_root_parser) and calls its parse_item() method
 
     :param location:
     :param item_type:
@@ -261,20 +978,22 @@ def parse_item(location: str, item_type: Type[T], item_name_for_log: str = None,
     :param file_mapping_conf:
     :param logger:
     :param lazy_mfcollection_parsing:
+    :param reuse_plan: see RootParser.parse_item
     :return:
     """
-    rp = RootParser('parsyfiles defaults', logger=logger)
+    rp = get_default_root_parser(logger)
     opts = create_parser_options(lazy_mfcollection_parsing=lazy_mfcollection_parsing)
     return rp.parse_item(location, item_type, item_name_for_log=item_name_for_log, file_mapping_conf=file_mapping_conf,
-                         options=opts)
+                         options=opts, reuse_plan=reuse_plan)
 
 
 def parse_collection(location: str, base_item_type: Type[T], item_name_for_log: str = None,
                      file_mapping_conf: FileMappingConfiguration = None, logger: Logger = RootParser._default_logger,
-                     lazy_mfcollection_parsing: bool = False)\
-        -> Dict[str, T]:
+                     lazy_mfcollection_parsing: bool = False, reuse_plan: bool = False,
+                     process_pool: Executor = None) -> Dict[str, T]:
     """
-    Utility method to create a RootParser() with default configuration and call its parse_collection() method
+    Utility method to call the parse_collection() method of the shared default RootParser
+    (see get_default_root_parser)
 
     :param location:
     :param base_item_type:
@@ -282,9 +1001,12 @@ def parse_collection(location: str, base_item_type: Type[T], item_name_for_log:
     :param file_mapping_conf:
     :param logger:
     :param lazy_mfcollection_parsing:
+    :param reuse_plan: see RootParser.parse_collection
+    :param process_pool: see RootParser.parse_collection. The workers use a RootParser with default configuration.
     :return:
     """
-    rp = RootParser('parsyfiles defaults', logger=logger)
+    rp = get_default_root_parser(logger)
     opts = create_parser_options(lazy_mfcollection_parsing=lazy_mfcollection_parsing)
     return rp.parse_collection(location, base_item_type, item_name_for_log=item_name_for_log,
-                               file_mapping_conf=file_mapping_conf, options=opts)
\ No newline at end of file
+                               file_mapping_conf=file_mapping_conf, options=opts, reuse_plan=reuse_plan,
+                               process_pool=process_pool)
\ No newline at end of file
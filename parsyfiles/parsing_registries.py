@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from bisect import bisect_right
 from io import StringIO
 from logging import Logger
 from pprint import pprint
@@ -10,7 +11,7 @@ from parsyfiles.filesystem_mapping import PersistedObject
 from parsyfiles.parsing_combining_parsers import ParsingChain, CascadingParser, DelegatingParser, \
     print_error_to_io_stream
 from parsyfiles.parsing_core import _InvalidParserException
-from parsyfiles.parsing_core_api import Parser, ParsingPlan, T
+from parsyfiles.parsing_core_api import Parser, ParsingPlan, T, _BaseParserDeclarationForRegistries
 from parsyfiles.type_inspection_tools import get_pretty_type_str, get_base_generic_type, get_pretty_type_keys_dict, \
     robust_isinstance
 from parsyfiles.var_checker import check_var
@@ -133,6 +134,34 @@ class NoParserFoundForObjectType(Exception):
         return e
 
 
+class RegistryFrozenError(Exception):
+    """
+    Raised whenever a parser or a converter is registered in a registry that has been frozen
+    """
+    def __init__(self, contents):
+        """
+        We actually can't put more than 1 argument in the constructor, it creates a bug in Nose tests
+        https://github.com/nose-devs/nose/issues/725
+        That's why we have a helper static method create()
+
+        :param contents:
+        """
+        super(RegistryFrozenError, self).__init__(contents)
+
+    @staticmethod
+    def create(registry, item):
+        """
+        Helper method provided because we actually can't put that in the constructor, it creates a bug in Nose tests
+        https://github.com/nose-devs/nose/issues/725
+
+        :param registry:
+        :param item: the parser or converter that was being registered
+        :return:
+        """
+        return RegistryFrozenError('Cannot register ' + str(item) + ' in registry ' + str(registry) + ' : it has '
+                                   'been frozen. Please register all parsers and converters before calling freeze()')
+
+
 def insert_element_to_dict_of_list(dict_of_list, key, parser):
     """
     Utility method
@@ -148,6 +177,21 @@ def insert_element_to_dict_of_list(dict_of_list, key, parser):
         dict_of_list[key] = [parser]
 
 
+def insert_element_to_dict_of_set(dict_of_set, key, element):
+    """
+    Utility method
+
+    :param dict_of_set:
+    :param key:
+    :param element:
+    :return:
+    """
+    if key in dict_of_set.keys():
+        dict_of_set[key].add(element)
+    else:
+        dict_of_set[key] = {element}
+
+
 def insert_element_to_dict_of_dicts_of_list(dict_of_dict_of_list, first_key, second_key, parser):
     """
     Utility method
@@ -380,6 +424,18 @@ class AbstractParserCache(metaclass=ABCMeta):
         pass
 
 
+def _uses_default_matching_rules(parser: Parser) -> bool:
+    """
+    Returns True if the parser uses the default implementation of is_able_to_parse without custom function, so that
+    whether it matches a query can be determined from its supported types and extensions only.
+
+    :param parser:
+    :return:
+    """
+    return type(parser).is_able_to_parse is _BaseParserDeclarationForRegistries.is_able_to_parse \
+        and getattr(parser, 'is_able_to_parse_func', True) is None
+
+
 class ParserCache(AbstractParserCache):
     """
     This object is responsible to store parsers in memory, and provide ways to access the information by queries
@@ -390,10 +446,61 @@ class ParserCache(AbstractParserCache):
         self._specific_parsers = list()
         self._generic_parsers = list()
 
+        # the registration rank of each parser of the above lists, see _get_registration_rank
+        self._specific_parsers_ranks = list()
+        self._generic_parsers_ranks = list()
+
         # new attempt: simply store the list of supported types and exts
         self._strict_types_to_ext = dict()
         self._ext_to_strict_types = dict()
 
+        # indexes of the specific parsers using the default matching rules, by position in self._specific_parsers :
+        # by supported ext, by supported type, and by base class of a supported type (for non-strict matching)
+        self._indexed_specific_parsers = set()
+        self._ext_to_specific_parsers = dict()
+        self._type_to_specific_parsers = dict()
+        self._base_type_to_specific_parsers = dict()
+
+        # positions of the specific parsers with custom matching rules, that have to be asked one by one
+        self._custom_specific_parsers = list()
+
+        # memoized results of find_all_matching_parsers, cleared whenever the registry changes
+        self._matching_parsers_cache = dict()
+
+        # True when no parser can be registered anymore, see freeze()
+        self._frozen = False
+
+    def freeze(self):
+        """
+        Freezes this registry: parsers can not be registered anymore (a RegistryFrozenError is raised), and the
+        registered parsers are stored in immutable tuples. Subclasses precompute their lookups here.
+
+        Since the results of the lookups can not change anymore, a frozen registry may be shared by several threads
+        without any lock: lookups that were not precomputed are memoized on first use, and storing them in a dict is
+        atomic.
+
+        :return: self, for convenience
+        """
+        self._frozen = True
+        self._specific_parsers = tuple(self._specific_parsers)
+        self._generic_parsers = tuple(self._generic_parsers)
+        self._custom_specific_parsers = tuple(self._custom_specific_parsers)
+        return self
+
+    def is_frozen(self) -> bool:
+        """
+        Returns True if this registry has been frozen, see freeze()
+        :return:
+        """
+        return self._frozen
+
+    def _clear_caches(self):
+        """
+        Clears all memoized lookups. This is called whenever a parser is registered, since the results may change.
+        :return:
+        """
+        self._matching_parsers_cache = dict()
+
     def register_parser(self, parser: Parser):
         """
         Utility method to register any parser. Parsers that support any type will be stored in the "generic"
@@ -404,12 +511,31 @@ class ParserCache(AbstractParserCache):
         if (not parser.supports_multifile()) and (not parser.supports_singlefile()):
             # invalid
             raise _InvalidParserException.create(parser)
+        if self._frozen:
+            raise RegistryFrozenError.create(self, parser)
 
-        # (1) store in the main lists
+        # (1) store in the main lists, after all parsers with the same or a lower rank
+        rank = self._get_registration_rank()
         if parser.is_generic():
-            self._generic_parsers.append(parser)
+            pos = bisect_right(self._generic_parsers_ranks, rank)
+            self._generic_parsers.insert(pos, parser)
+            self._generic_parsers_ranks.insert(pos, rank)
         else:
-            self._specific_parsers.append(parser)
+            pos = bisect_right(self._specific_parsers_ranks, rank)
+            self._specific_parsers.insert(pos, parser)
+            self._specific_parsers_ranks.insert(pos, rank)
+
+            # index it. If it was not appended, the positions of the next parsers have changed
+            if pos == len(self._specific_parsers) - 1:
+                self._index_specific_parser(pos, parser)
+            else:
+                self._indexed_specific_parsers = set()
+                self._ext_to_specific_parsers = dict()
+                self._type_to_specific_parsers = dict()
+                self._base_type_to_specific_parsers = dict()
+                self._custom_specific_parsers = list()
+                for i, p in enumerate(self._specific_parsers):
+                    self._index_specific_parser(i, p)
 
         # (2) simpler : simply store the ext <> type maps
         for ext in parser.supported_exts:
@@ -417,6 +543,40 @@ class ParserCache(AbstractParserCache):
                 insert_element_to_dict_of_list(self._strict_types_to_ext, typ, ext)
                 insert_element_to_dict_of_list(self._ext_to_strict_types, ext, typ)
 
+        # (3) previous lookups are not valid anymore
+        self._clear_caches()
+
+    def _get_registration_rank(self) -> int:
+        """
+        Returns the rank of the parsers being registered. Parsers are stored in registration order within each rank,
+        and all parsers of a rank come before the parsers of the next ranks, whatever the order in which they were
+        registered. By default all parsers have rank 0, so they are simply stored in registration order. Subclasses may
+        override this method to register a group of parsers later on, at the position it would have had if it had been
+        registered first (see RootParser).
+
+        :return:
+        """
+        return 0
+
+    def _index_specific_parser(self, pos: int, parser: Parser):
+        """
+        Adds the specific parser stored at position pos to the indexes used by _find_indexed_specific_parsers
+
+        :param pos:
+        :param parser:
+        :return:
+        """
+        if _uses_default_matching_rules(parser):
+            self._indexed_specific_parsers.add(pos)
+            for ext in parser.supported_exts:
+                insert_element_to_dict_of_set(self._ext_to_specific_parsers, ext, pos)
+            for typ in parser.supported_types:
+                insert_element_to_dict_of_set(self._type_to_specific_parsers, typ, pos)
+                for base_typ in getattr(typ, '__mro__', (typ,)):
+                    insert_element_to_dict_of_set(self._base_type_to_specific_parsers, base_typ, pos)
+        else:
+            self._custom_specific_parsers.append(pos)
+
     def get_all_parsers(self, strict_type_matching: bool) -> List[Parser]:
         """
         Returns the list of all parsers in order of relevance.
@@ -459,8 +619,38 @@ class ParserCache(AbstractParserCache):
             -> Tuple[Tuple[List[Parser], List[Parser], List[Parser]],
                      List[Parser], List[Parser], List[Parser]]:
         """
-        Implementation of the parent method by lookin into the registry to find the most appropriate parsers to use in
-        order
+        Implementation of the parent method. The results of _find_all_matching_parsers are memoized for each
+        (strict, desired_type, required_ext) query until the next registration, so that parsing many items of the
+        same type and extension does not repeat the same lookup. The returned lists are copies and may be modified.
+
+        :param strict:
+        :param desired_type:
+        :param required_ext:
+        :return: match=(matching_parsers_generic, matching_parsers_approx, matching_parsers_exact),
+                 no_type_match_but_ext_match, no_ext_match_but_type_match, no_match
+        """
+        key = (strict, desired_type, required_ext)
+        try:
+            res = self._matching_parsers_cache.get(key, None)
+        except TypeError:
+            # unhashable type: do not memoize
+            key, res = None, None
+
+        if res is None:
+            res = self._find_all_matching_parsers(strict=strict, desired_type=desired_type, required_ext=required_ext)
+            if key is not None:
+                self._matching_parsers_cache[key] = res
+
+        (matching_generic, matching_approx, matching_exact), no_type_match_but_ext_match, \
+            no_ext_match_but_type_match, no_match = res
+        return (list(matching_generic), list(matching_approx), list(matching_exact)), \
+               list(no_type_match_but_ext_match), list(no_ext_match_but_type_match), list(no_match)
+
+    def _find_all_matching_parsers(self, strict: bool, desired_type: Type[Any] = None, required_ext: str = None) \
+            -> Tuple[Tuple[List[Parser], List[Parser], List[Parser]],
+                     List[Parser], List[Parser], List[Parser]]:
+        """
+        Looks into the registry to find the most appropriate parsers to use in order, see find_all_matching_parsers
 
         :param strict:
         :param desired_type:
@@ -471,9 +661,9 @@ class ParserCache(AbstractParserCache):
 
         if desired_type is None and required_ext is None:
             # Easy : return everything (GENERIC first, SPECIFIC then) in order (make a copy first :) )
-            matching_parsers_generic = self._generic_parsers.copy()
+            matching_parsers_generic = list(self._generic_parsers)
             matching_parsers_approx = []
-            matching_parsers_exact = self._specific_parsers.copy()
+            matching_parsers_exact = list(self._specific_parsers)
             no_type_match_but_ext_match = []
             no_ext_match_but_type_match = []
             no_match = []
@@ -503,31 +693,101 @@ class ParserCache(AbstractParserCache):
                     # type matches always
                     no_ext_match_but_type_match.append(p)
 
-            # then the specific
-            for p in self._specific_parsers:
+            # then the specific. We first find the list where each one should go, by position
+            destination_lists = self._find_indexed_specific_parsers(strict, desired_type, required_ext,
+                                                                    matching_parsers_approx, matching_parsers_exact,
+                                                                    no_type_match_but_ext_match,
+                                                                    no_ext_match_but_type_match)
+
+            # -- the ones with custom matching rules have to be asked
+            for pos in self._custom_specific_parsers:
+                p = self._specific_parsers[pos]
                 match, exact_match = p.is_able_to_parse(desired_type=desired_type, desired_ext=required_ext,
                                                         strict=strict)
                 if match:
                     if not is_any_type(desired_type):
                         if exact_match is None or exact_match:
-                            matching_parsers_exact.append(p)
+                            destination_lists[pos] = matching_parsers_exact
                         else:
-                            matching_parsers_approx.append(p)
+                            destination_lists[pos] = matching_parsers_approx
                     else:
                         # special case: dont register as a type match
-                        no_type_match_but_ext_match.append(p)
+                        destination_lists[pos] = no_type_match_but_ext_match
                 else:
                     if p.is_able_to_parse(desired_type=None, desired_ext=required_ext, strict=strict)[0]:
-                        no_type_match_but_ext_match.append(p)
+                        destination_lists[pos] = no_type_match_but_ext_match
                     elif p.is_able_to_parse(desired_type=desired_type, desired_ext=None, strict=strict)[0]:
-                        no_ext_match_but_type_match.append(p)
-                    else:
-                        no_match.append(p)
+                        destination_lists[pos] = no_ext_match_but_type_match
+
+            # -- fill the lists in registration order. All others do not match at all
+            for pos in sorted(destination_lists.keys()):
+                destination_lists[pos].append(self._specific_parsers[pos])
+            no_match = [p for pos, p in enumerate(self._specific_parsers) if pos not in destination_lists]
 
         return (matching_parsers_generic, matching_parsers_approx, matching_parsers_exact), \
                no_type_match_but_ext_match, no_ext_match_but_type_match, no_match
 
 
+    def _find_indexed_specific_parsers(self, strict: bool, desired_type: Type[Any], required_ext: str,
+                                       matching_parsers_approx: List[Parser], matching_parsers_exact: List[Parser],
+                                       no_type_match_but_ext_match: List[Parser],
+                                       no_ext_match_but_type_match: List[Parser]) -> Dict[int, List[Parser]]:
+        """
+        Uses the indexes to find the specific parsers using the default matching rules (see
+        _BaseParserDeclarationForRegistries.is_able_to_parse) that match the query on type, on extension, or both. This
+        only costs the number of such parsers, not the number of registered parsers.
+
+        :param strict:
+        :param desired_type: the validated desired type, or None for 'wildcard'
+        :param required_ext: the required extension, or None for 'wildcard'
+        :param matching_parsers_approx:
+        :param matching_parsers_exact:
+        :param no_type_match_but_ext_match:
+        :param no_ext_match_but_type_match:
+        :return: a dictionary {position of parser: list where it should go}, for the matching parsers only
+        """
+        # -- extension
+        if required_ext is None:
+            ext_match = self._indexed_specific_parsers
+        else:
+            check_var(required_ext, var_types=str, var_name='desired_ext')
+            ext_match = self._ext_to_specific_parsers.get(required_ext, set())
+
+        # -- type
+        if desired_type is None:
+            exact_type_match = type_match = self._indexed_specific_parsers
+        else:
+            check_var(desired_type, var_types=type, var_name='desired_type_of_output')
+            check_var(strict, var_types=bool, var_name='strict')
+            exact_type_match = self._type_to_specific_parsers.get(desired_type, set())
+            if strict:
+                type_match = exact_type_match
+            elif type(desired_type) is type:
+                # no custom subclass check: subclasses of desired_type have it in their mro
+                type_match = exact_type_match | self._base_type_to_specific_parsers.get(desired_type, set())
+            else:
+                # abstract classes or generic types may have virtual subclasses, issubclass has to be called
+                type_match = exact_type_match | {pos for pos in self._indexed_specific_parsers
+                                                 if any(issubclass(supported, desired_type)
+                                                        for supported in self._specific_parsers[pos].supported_types)}
+
+        destination_lists = dict()
+        for pos in (ext_match & type_match):
+            if is_any_type(desired_type):
+                # special case: dont register as a type match
+                destination_lists[pos] = no_type_match_but_ext_match
+            elif pos in exact_type_match:
+                destination_lists[pos] = matching_parsers_exact
+            else:
+                destination_lists[pos] = matching_parsers_approx
+        for pos in (ext_match - type_match):
+            destination_lists[pos] = no_type_match_but_ext_match
+        for pos in (type_match - ext_match):
+            destination_lists[pos] = no_ext_match_but_type_match
+
+        return destination_lists
+
+
 class ParserRegistry(ParserCache, ParserFinder, DelegatingParser):
     """
     A manager of specific and generic parsers
@@ -547,6 +807,9 @@ class ParserRegistry(ParserCache, ParserFinder, DelegatingParser):
         check_var(strict_matching, var_types=bool, var_name='strict_matching')
         self.is_strict = strict_matching
 
+        # memoized parsers built by build_parser_for_fileobject_and_desiredtype, for each (type, ext)
+        self._parsers_for_type_and_ext_cache = dict()
+
         # add provided parsers
         if initial_parsers_to_register is not None:
             self.register_parsers(initial_parsers_to_register)
@@ -554,6 +817,39 @@ class ParserRegistry(ParserCache, ParserFinder, DelegatingParser):
     def __str__(self):
         return self.pretty_name
 
+    def _clear_caches(self):
+        """
+        Overrides the parent method to also clear the memoized parsers
+        :return:
+        """
+        super(ParserRegistry, self)._clear_caches()
+        self._parsers_for_type_and_ext_cache = dict()
+
+    def freeze(self):
+        """
+        Overrides the parent method to precompute the parser to use for every supported type and extension.
+
+        :return: self, for convenience
+        """
+        super(ParserRegistry, self).freeze()
+
+        exts = {ext for p in self._specific_parsers + self._generic_parsers for ext in p.supported_exts}
+        for typ in self._get_types_to_precompute():
+            for ext in exts:
+                matching = self.find_all_matching_parsers(strict=self.is_strict, desired_type=typ, required_ext=ext)[0]
+                matching_parsers = matching[0] + matching[1] + matching[2]
+                if len(matching_parsers) > 0:
+                    self._parsers_for_type_and_ext_cache[(typ, ext)] = self._combine_parsers(matching_parsers)
+        return self
+
+    def _get_types_to_precompute(self) -> Set[Type]:
+        """
+        Returns the types for which freeze() precomputes the lookups: all types supported by the registered parsers
+
+        :return:
+        """
+        return {typ for p in self._specific_parsers + self._generic_parsers for typ in p.supported_types}
+
     def _create_parsing_plan(self, desired_type: Type[T], filesystem_object: PersistedObject, logger: Logger) \
             -> ParsingPlan[T]:
         """
@@ -579,6 +875,9 @@ class ParserRegistry(ParserCache, ParserFinder, DelegatingParser):
         and checks if they support the provided object format (single or multifile) and type.
         If several parsers match, it returns a cascadingparser that will try them in order.
 
+        The parser is memoized for each (type, extension) until the next registration, so the same parser (or
+        cascading parser) is returned for all objects with the same extension.
+
         :param obj_on_filesystem:
         :param object_typ:
         :param logger:
@@ -588,6 +887,30 @@ class ParserRegistry(ParserCache, ParserFinder, DelegatingParser):
         # first remove any non-generic customization
         object_type = get_base_generic_type(object_typ)
 
+        # memoized ?
+        key = (object_type, obj_on_filesystem.ext)
+        try:
+            parser = self._parsers_for_type_and_ext_cache.get(key, None)
+        except TypeError:
+            # unhashable type: do not memoize
+            key, parser = None, None
+
+        if parser is None:
+            parser = self._build_parser_for_fileobject_and_desiredtype(obj_on_filesystem, object_type)
+            if key is not None:
+                self._parsers_for_type_and_ext_cache[key] = parser
+        return parser
+
+    def _build_parser_for_fileobject_and_desiredtype(self, obj_on_filesystem: PersistedObject, object_type: Type[T]) \
+            -> Parser:
+        """
+        Builds from the registry a parser to parse object obj_on_filesystem as an object of type object_type, see
+        build_parser_for_fileobject_and_desiredtype
+
+        :param obj_on_filesystem:
+        :param object_type:
+        :return:
+        """
         # find all matching parsers for this
         matching, no_type_match_but_ext_match, no_ext_match_but_type_match, no_match = \
             self.find_all_matching_parsers(strict=self.is_strict, desired_type=object_type, required_ext=obj_on_filesystem.ext)
@@ -607,7 +930,18 @@ class ParserRegistry(ParserCache, ParserFinder, DelegatingParser):
                                                         [p.supported_types for p in no_type_match_but_ext_match]
                                                         for typ_ in typ_set]))
 
-        elif len(matching_parsers) == 1:
+        else:
+            return self._combine_parsers(matching_parsers)
+
+    @staticmethod
+    def _combine_parsers(matching_parsers: List[Parser]) -> Parser:
+        """
+        Returns the parser to use given a non-empty list of matching parsers, ordered from less relevant to most relevant
+
+        :param matching_parsers:
+        :return:
+        """
+        if len(matching_parsers) == 1:
             # return the match directly
             return matching_parsers[0]
         else:
@@ -832,183 +1166,179 @@ class AbstractConverterCache(ConversionFinder):
         pass
 
 
+def _get_chain_sort_key(indices: Tuple[int, ...]) -> Tuple:
+    """
+    Returns the sort key of a conversion chain, from the registration indices of its converters. Chains are sorted by
+    decreasing length, and then by order of creation: chains are created when their most recent converter is
+    registered, starting with the converter alone, then the existing chains followed by it, then the existing chains
+    preceded by it, and finally the combinations of both.
+
+    :param indices: the registration indices of the converters of the chain, in order
+    :return:
+    """
+    if len(indices) == 0:
+        return ()
+    last_registered = max(indices)
+    if len(indices) == 1:
+        position = 0
+    elif indices[-1] == last_registered:
+        position = 1
+    elif indices[0] == last_registered:
+        position = 2
+    else:
+        position = 3
+    others = tuple(idx for idx in indices if idx != last_registered)
+    return -len(indices), last_registered, position, _get_chain_sort_key(others)
+
+
 class ConverterCache(AbstractConverterCache):
     """
     This object is responsible to store converters in memory, and provide ways to access the information by queries
     (by from_type, by to_type, both, none), using strict mode, or inference mode (subclass allowed). Note that
     due to the complexity of conversion chains, strict mode is set at creation time, not at query time.
+
+    Conversion chains are not computed when converters are registered. The converters are the edges of a graph, where
+    a converter leads to the converters that can be appended to it. The chains matching a query are found by a search
+    in this graph the first time the query is made, and the results are cached until the next registration.
     """
     def __init__(self, strict_matching: bool):
         super(ConverterCache, self).__init__(strict_matching)
 
-        self._specific_conversion_chains = list()
-        self._specific_non_strict_conversion_chains = list()
-        self._generic_conversion_chains = list()
-        self._generic_nonstrict_conversion_chains = list()
+        # the registered converters, in registration order within each rank (see _get_registration_rank), and their ranks
+        self._converters = list()
+        self._converters_ranks = list()
+
+        # the conversion graph and the memoized query results, cleared whenever a converter is registered
+        self._conversion_graph = None
+        self._conversion_chains_cache = dict()
+
+        # True when no converter can be registered anymore, see freeze()
+        self._frozen = False
+
+    def freeze(self):
+        """
+        Freezes this cache: converters can not be registered anymore (a RegistryFrozenError is raised), the registered
+        converters are stored in an immutable tuple, and the conversion graph and the conversion chains to all known
+        types are precomputed. A frozen cache may be shared by several threads without any lock.
+
+        :return: self, for convenience
+        """
+        self._frozen = True
+        self._converters = tuple(self._converters)
+        self._get_conversion_graph()
+        for typ in {c.to_type for c in self._converters}:
+            self.get_all_conversion_chains_to_type(to_type=typ)
+        return self
 
     def register_converter(self, converter: Converter[S, T]):
         """
-        Utility method to register any converter. Converters that support any type will be stored in the "generic"
-        lists, and the others will be stored in front of the types they support
+        Utility method to register any converter. Conversion chains using this converter will be created when needed.
         :return:
         """
         check_var(converter, var_types=Converter, var_name='converter')
+        if self._frozen:
+            raise RegistryFrozenError.create(self, converter)
+        rank = self._get_registration_rank()
+        pos = bisect_right(self._converters_ranks, rank)
+        self._converters.insert(pos, converter)
+        self._converters_ranks.insert(pos, rank)
 
-        # compute all possible chains and save them
-        generic_chains, generic_nonstrict_chains, specific_chains, specific_nonstrict_chains \
-            = self._create_all_new_chains(converter)
-        self._generic_nonstrict_conversion_chains += generic_nonstrict_chains
-        self._generic_conversion_chains += generic_chains
-        self._specific_non_strict_conversion_chains += specific_nonstrict_chains
-        self._specific_conversion_chains += specific_chains
+        # previous searches are not valid anymore
+        self._conversion_graph = None
+        self._conversion_chains_cache = dict()
 
-        # sort all lists by length
-        self._generic_nonstrict_conversion_chains = sorted(self._generic_nonstrict_conversion_chains, key=len,
-                                                           reverse=True)
-        self._generic_conversion_chains = sorted(self._generic_conversion_chains, key=len, reverse=True)
-        self._specific_non_strict_conversion_chains = sorted(self._specific_non_strict_conversion_chains, key=len,
-                                                             reverse=True)
-        self._specific_conversion_chains = sorted(self._specific_conversion_chains, key=len, reverse=True)
-
-
-    def _create_all_new_chains(self, converter) -> Tuple[List[Converter], List[Converter],
-                                                         List[Converter], List[Converter]]:
+    def _get_registration_rank(self) -> int:
         """
-        Creates all specific and generic chains that may be built by adding this converter to the existing chains.
+        Returns the rank of the converters being registered, see ParserCache._get_registration_rank. By default all
+        converters have rank 0, so they are simply stored in registration order.
 
-        :param converter:
-        :return: generic_chains, generic_nonstrict_chains, specific_chains, specific_nonstrict_chains
-        """
-
-        specific_chains, specific_nonstrict_chains, generic_chains, generic_nonstrict_chains = [], [], [], []
-
-        if converter.is_generic():
-            # the smaller chain :)
-            generic_chains.append(ConversionChain(initial_converters=[converter], strict_chaining=True))
-
-            # create new generic chain by appending this converter at the end of an existing *non-generic* one
-            for existing_specific in self._specific_conversion_chains:
-                if converter.can_be_appended_to(existing_specific, strict=True):
-                    if ConversionChain.are_worth_chaining(existing_specific, converter):
-                        generic_chains.append(ConversionChain.chain(existing_specific, converter, strict=True))
-                elif (not self.strict) and converter.can_be_appended_to(existing_specific, strict=False):
-                    if ConversionChain.are_worth_chaining(existing_specific, converter):
-                        generic_nonstrict_chains.append(ConversionChain.chain(existing_specific, converter,
-                                                                          strict=False))
-
-            for existing_specific_ns in self._specific_non_strict_conversion_chains:
-                if converter.can_be_appended_to(existing_specific_ns, strict=False):
-                    if ConversionChain.are_worth_chaining(existing_specific_ns, converter):
-                        generic_nonstrict_chains.append(ConversionChain.chain(existing_specific_ns, converter,
-                                                                          strict=False))
-
-            # FOLLOWING IS NOT POSSIBLE : generic
-            # by inserting this converter at the beginning of an existing one
-            # by combining both created chains into a big one
+        :return:
+        """
+        return 0
+
+    def _get_conversion_graph(self) -> Tuple[List[List[Tuple[int, bool]]], List[List[Tuple[int, bool]]]]:
+        """
+        Returns the conversion graph, created on first call after a registration. For each converter (by registration
+        index) it contains the converters that can be appended to it (successors) and the converters it can be appended
+        to (predecessors), with a boolean indicating if the link is strict. Generic converters have no successors.
+
+        :return: a tuple (successors, predecessors)
+        """
+        graph = self._conversion_graph
+        if graph is None:
+            successors = [[] for _ in self._converters]
+            predecessors = [[] for _ in self._converters]
+            for i, left in enumerate(self._converters):
+                if left.is_generic():
+                    continue
+                for j, right in enumerate(self._converters):
+                    if i == j:
+                        continue
+                    if right.can_be_appended_to(left, strict=True):
+                        strict_link = True
+                    elif (not self.strict) and right.can_be_appended_to(left, strict=False):
+                        strict_link = False
+                    else:
+                        continue
+                    successors[i].append((j, strict_link))
+                    predecessors[j].append((i, strict_link))
+            graph = self._conversion_graph = (successors, predecessors)
+        return graph
+
+    def _create_conversion_chains(self, from_type: Type[Any] = None, to_type: Type[Any] = None) \
+            -> Tuple[List[Converter], List[Converter], List[Converter], List[Converter]]:
+        """
+        Creates all the conversion chains that may match the query, by searching the conversion graph. A chain is a
+        path in the graph where it is worth chaining each converter with all the following ones (see
+        ConversionChain.are_worth_chaining) : since a converter can not be worth chaining with a converter
+        producing its own source type, there are no cycles and the search terminates. If to_type is provided, the
+        paths are searched backwards from the converters able to produce it, otherwise forwards from the converters
+        able to convert from_type (or all converters).
+
+        :param from_type: a required type of input object, or None for 'wildcard'(*)
+        :param to_type: a required (validated) type of output object, or None for 'wildcard'(*)
+        :return: generic_chains, generic_nonstrict_chains, specific_chains, specific_nonstrict_chains, each sorted
+        from less relevant (longer) to most relevant
+        """
+        successors, predecessors = self._get_conversion_graph()
+        converters = self._converters
+        worth_chaining = dict()
+
+        def is_worth_chaining(i, j):
+            res = worth_chaining.get((i, j), None)
+            if res is None:
+                res = worth_chaining[(i, j)] = Converter.are_worth_chaining(converters[i], converters[j])
+            return res
+
+        # -- search all paths with an explicit stack of (path, all links strict ?)
+        found = []
+        if to_type is not None:
+            stack = [((i,), True) for i, c in enumerate(converters)
+                     if c.is_able_to_convert(self.strict, from_type=None, to_type=to_type)[0]]
+            while len(stack) > 0:
+                path, strict_path = stack.pop()
+                found.append((path, strict_path))
+                for i, strict_link in predecessors[path[0]]:
+                    if i not in path and all(is_worth_chaining(i, j) for j in path):
+                        stack.append(((i,) + path, strict_path and strict_link))
         else:
-            # the smaller chain :)
-            specific_chains.append(ConversionChain(initial_converters=[converter], strict_chaining=True))
-
-            # 1) create new specific chains by adding this converter at the beginning or end of all *non-generic* ones
-            # -- non-strict
-            new_c_at_end_ns = []
-            new_c_at_beginning_ns = []
-            if not self.strict:
-                # then there are non-strict chains already. Try to connect to them
-                for existing_specific_nonstrict in self._specific_non_strict_conversion_chains:
-                    if converter.can_be_appended_to(existing_specific_nonstrict, strict=False):
-                        if ConversionChain.are_worth_chaining(existing_specific_nonstrict, converter):
-                            new_c_at_end_ns.append(ConversionChain.chain(existing_specific_nonstrict, converter,
-                                                                         strict=False))
-                    if existing_specific_nonstrict.can_be_appended_to(converter, strict=False):
-                        if ConversionChain.are_worth_chaining(converter, existing_specific_nonstrict):
-                            new_c_at_beginning_ns.append(ConversionChain.chain(converter, existing_specific_nonstrict,
-                                                                               strict=False))
-
-            # -- strict
-            new_c_at_end = []
-            new_c_at_beginning = []
-            for existing_specific in self._specific_conversion_chains:
-                # first try *strict* mode
-                if converter.can_be_appended_to(existing_specific, strict=True):
-                    if ConversionChain.are_worth_chaining(existing_specific, converter):
-                        new_c_at_end.append(ConversionChain.chain(existing_specific, converter, strict=True))
-                elif (not self.strict) and converter.can_be_appended_to(existing_specific, strict=False):
-                    if ConversionChain.are_worth_chaining(existing_specific, converter):
-                        new_c_at_end_ns.append(ConversionChain.chain(existing_specific, converter, strict=False))
-
-                if existing_specific.can_be_appended_to(converter, strict=True):
-                    if ConversionChain.are_worth_chaining(converter, existing_specific):
-                        new_c_at_beginning.append(ConversionChain.chain(converter, existing_specific, strict=True))
-                elif (not self.strict) and existing_specific.can_be_appended_to(converter, strict=False):
-                    if ConversionChain.are_worth_chaining(converter, existing_specific):
-                        new_c_at_beginning_ns.append(ConversionChain.chain(converter, existing_specific, strict=False))
-
-            specific_chains += new_c_at_end
-            specific_chains += new_c_at_beginning
-            specific_nonstrict_chains += new_c_at_end_ns
-            specific_nonstrict_chains += new_c_at_beginning_ns
-
-            # by combining all created chains into a big one
-            for a in new_c_at_end:
-                for b in new_c_at_beginning:
-                    b_ = b.remove_first()
-                    if b_.can_be_appended_to(a, strict=True):
-                        if ConversionChain.are_worth_chaining(a, b_):
-                            specific_chains.append(ConversionChain.chain(a, b_, strict=True))
-                for b in new_c_at_beginning_ns:
-                    b_ = b.remove_first()
-                    if b_.can_be_appended_to(a, strict=False):
-                        if ConversionChain.are_worth_chaining(a, b_):
-                            specific_nonstrict_chains.append(ConversionChain.chain(a, b_, strict=False))
-            for a in new_c_at_end_ns:
-                for b in (new_c_at_beginning_ns + new_c_at_beginning):
-                    b_ = b.remove_first()
-                    if b_.can_be_appended_to(a, strict=False):
-                        if ConversionChain.are_worth_chaining(a, b_):
-                            specific_nonstrict_chains.append(ConversionChain.chain(a, b_, strict=False))
-
-            # by inserting this converter at the beginning of an existing *generic*
-            new_c_at_beginning_generic = []
-            new_c_at_beginning_generic_ns = []
-            for existing_specific in self._generic_conversion_chains:
-                # start with strict
-                if existing_specific.can_be_appended_to(converter, strict=True):
-                    if ConversionChain.are_worth_chaining(converter, existing_specific):
-                        new_c_at_beginning_generic.append(ConversionChain.chain(converter, existing_specific,
-                                                                                strict=True))
-                elif (not self.strict) and existing_specific.can_be_appended_to(converter, strict=False):
-                    if ConversionChain.are_worth_chaining(converter, existing_specific):
-                        new_c_at_beginning_generic_ns.append(ConversionChain.chain(converter, existing_specific,
-                                                                                   strict=False))
-
-            for existing_specific_ns in self._generic_nonstrict_conversion_chains:
-                if existing_specific_ns.can_be_appended_to(converter, strict=False):
-                    if ConversionChain.are_worth_chaining(converter, existing_specific_ns):
-                        new_c_at_beginning_generic_ns.append(ConversionChain.chain(converter, existing_specific_ns,
-                                                                               strict=False))
-            generic_chains += new_c_at_beginning_generic
-            generic_nonstrict_chains += new_c_at_beginning_generic_ns
-
-
-            # by combining specific and generic created chains into a big one
-            for a in new_c_at_end:
-                for b in new_c_at_beginning_generic:
-                    b_ = b.remove_first()
-                    if b_.can_be_appended_to(a, strict=True):
-                        if ConversionChain.are_worth_chaining(a, b_):
-                            generic_chains.append(ConversionChain.chain(a, b_, strict=True))
-                for b in new_c_at_beginning_generic_ns:
-                    b_ = b.remove_first()
-                    if b_.can_be_appended_to(a, strict=False):
-                        if ConversionChain.are_worth_chaining(a, b_):
-                            generic_nonstrict_chains.append(ConversionChain.chain(a, b_, strict=False))
-            for a in new_c_at_end_ns:
-                for b in (new_c_at_beginning_generic_ns + new_c_at_beginning_generic):
-                    b_ = b.remove_first()
-                    if b_.can_be_appended_to(a, strict=False):
-                        if ConversionChain.are_worth_chaining(a, b_):
-                            generic_nonstrict_chains.append(ConversionChain.chain(a, b_, strict=False))
+            stack = [((i,), True) for i, c in enumerate(converters)
+                     if from_type is None or c.is_able_to_convert(self.strict, from_type=from_type, to_type=None)[0]]
+            while len(stack) > 0:
+                path, strict_path = stack.pop()
+                found.append((path, strict_path))
+                for j, strict_link in successors[path[-1]]:
+                    if j not in path and all(is_worth_chaining(i, j) for i in path):
+                        stack.append((path + (j,), strict_path and strict_link))
+
+        # -- create the chains, in the order in which they would have been created by successive registrations
+        generic_chains, generic_nonstrict_chains, specific_chains, specific_nonstrict_chains = [], [], [], []
+        for path, strict_path in sorted(found, key=lambda item: _get_chain_sort_key(item[0])):
+            chain = ConversionChain(initial_converters=[converters[i] for i in path], strict_chaining=strict_path)
+            if converters[path[-1]].is_generic():
+                (generic_chains if strict_path else generic_nonstrict_chains).append(chain)
+            else:
+                (specific_chains if strict_path else specific_nonstrict_chains).append(chain)
 
         return generic_chains, generic_nonstrict_chains, specific_chains, specific_nonstrict_chains
 
@@ -1026,23 +1356,51 @@ class ConverterCache(AbstractConverterCache):
         converters able to produce any type of object", which is different from "to_type=None" which means "all
         converters whatever type they are able to produce".
         :return: a tuple of lists of matching converters, by type of *dest_type* match : generic, approximate, exact.
-        The order of each list is from *less relevant* to *most relevant*
+        The order of each list is from *less relevant* to *most relevant*. The lists are copies and may be modified.
+        """
+        key = (self.strict, from_type, to_type)
+        try:
+            res = self._conversion_chains_cache.get(key, None)
+        except TypeError:
+            # unhashable type: do not memoize
+            key, res = None, None
+
+        if res is None:
+            res = self._find_all_conversion_chains(from_type=from_type, to_type=to_type)
+            if key is not None:
+                self._conversion_chains_cache[key] = res
+
+        matching_dest_generic, matching_dest_approx, matching_dest_exact = res
+        return list(matching_dest_generic), list(matching_dest_approx), list(matching_dest_exact)
+
+    def _find_all_conversion_chains(self, from_type: Type[Any] = None, to_type: Type[Any] = None) \
+            -> Tuple[List[Converter], List[Converter], List[Converter]]:
+        """
+        Finds the converters or conversion chains matching a query, see get_all_conversion_chains
+
+        :param from_type:
+        :param to_type:
+        :return:
         """
 
         if from_type is None and to_type is None:
-            matching_dest_generic = self._generic_nonstrict_conversion_chains.copy() + \
-                                    self._generic_conversion_chains.copy()
+            generic_chains, generic_nonstrict_chains, specific_chains, specific_nonstrict_chains = \
+                self._create_conversion_chains()
+            matching_dest_generic = generic_nonstrict_chains + generic_chains
             matching_dest_approx = []
-            matching_dest_exact = self._specific_non_strict_conversion_chains.copy() + \
-                                  self._specific_conversion_chains.copy()
+            matching_dest_exact = specific_nonstrict_chains + specific_chains
 
         else:
             # first transform any 'Any' type requirement into the official class for that
             to_type = get_validated_type(to_type, 'to_type', enforce_not_none=False)
             matching_dest_generic, matching_dest_approx, matching_dest_exact = [], [], []
 
+            # create the candidate chains
+            generic_chains, generic_nonstrict_chains, specific_chains, specific_nonstrict_chains = \
+                self._create_conversion_chains(from_type=from_type, to_type=to_type)
+
             # handle generic converters first
-            for p in (self._generic_nonstrict_conversion_chains + self._generic_conversion_chains):
+            for p in (generic_nonstrict_chains + generic_chains):
                 match = p.is_able_to_convert(strict=self.strict, from_type=from_type, to_type=to_type)[0]
                 if match:
                     # match
@@ -1053,7 +1411,7 @@ class ConverterCache(AbstractConverterCache):
                         matching_dest_exact.append(p)
 
             # then the specific
-            for p in (self._specific_non_strict_conversion_chains + self._specific_conversion_chains):
+            for p in (specific_nonstrict_chains + specific_chains):
                 match, source_exact, dest_exact = p.is_able_to_convert(strict=self.strict, from_type=from_type,
                                                                        to_type=to_type)
                 if match:
@@ -1095,7 +1453,36 @@ class ParserRegistryWithConverters(ConverterCache, ParserRegistry, ConversionFin
         if initial_converters_to_register is not None:
             self.register_converters(initial_converters_to_register)
 
-    def find_all_matching_parsers(self, strict: bool, desired_type: Type[Any] = None, required_ext: str = None) \
+    def register_converter(self, converter: Converter[S, T]):
+        """
+        Overrides the parent method to clear the memoized lookups, since new parsing chains may now be created
+        :param converter:
+        :return:
+        """
+        super(ParserRegistryWithConverters, self).register_converter(converter)
+        self._clear_caches()
+
+    def freeze(self):
+        """
+        Freezes both the converters and the parsers, see ConverterCache.freeze() and ParserRegistry.freeze(). After
+        this call, parsing plans are built from precomputed lookups, and the registry may be shared by several threads
+        without any lock.
+
+        :return: self, for convenience
+        """
+        ConverterCache.freeze(self)
+        ParserRegistry.freeze(self)
+        return self
+
+    def _get_types_to_precompute(self) -> Set[Type]:
+        """
+        Overrides the parent method to also precompute the lookups for the destination types of the converters
+        :return:
+        """
+        return super(ParserRegistryWithConverters, self)._get_types_to_precompute() \
+            | {c.to_type for c in self._converters}
+
+    def _find_all_matching_parsers(self, strict: bool, desired_type: Type[Any] = None, required_ext: str = None) \
         -> Tuple[Tuple[List[Parser], List[Parser], List[Parser]],
                  List[Parser], List[Parser], List[Parser]]:
         """
@@ -1110,9 +1497,9 @@ class ParserRegistryWithConverters(ConverterCache, ParserRegistry, ConversionFin
         """
         # (1) call the super method to find all parsers
         matching, no_type_match_but_ext_match, no_ext_match_but_type_match, no_match = \
-            super(ParserRegistryWithConverters, self).find_all_matching_parsers(strict=self.is_strict,
-                                                                                desired_type=desired_type,
-                                                                                required_ext=required_ext)
+            super(ParserRegistryWithConverters, self)._find_all_matching_parsers(strict=self.is_strict,
+                                                                                 desired_type=desired_type,
+                                                                                 required_ext=required_ext)
         # these are ordered with 'preferred last'
         matching_p_generic, matching_p_approx, matching_p_exact = matching
 
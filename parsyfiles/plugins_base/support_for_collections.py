@@ -1,11 +1,13 @@
 from collections import Mapping, ItemsView, ValuesView, MutableSet, MutableSequence, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor, TimeoutError, wait
 from io import TextIOBase
-from logging import Logger
+from logging import Logger, INFO
 from typing import Dict, Any, List, Union, Type, Set, Tuple, Callable, AbstractSet
 
 from parsyfiles.converting_core import Converter, ConverterFunction
 from parsyfiles.filesystem_mapping import PersistedObject, FolderAndFilesStructureError
 from parsyfiles.parsing_core import SingleFileParserFunction, AnyParser, MultiFileParser, ParsingPlan, T
+from parsyfiles.parsing_core_api import get_parsing_plan_log_str
 from parsyfiles.parsing_registries import ParserFinder, ConversionFinder
 from parsyfiles.type_inspection_tools import _extract_collection_base_type, get_pretty_type_str, get_base_generic_type
 from parsyfiles.var_checker import check_var
@@ -288,6 +290,73 @@ class LazyDictionary(dict):
         return getattr(self.inner_dict_readonly_wrapper, name)
 
 
+class BackgroundDictionary(LazyDictionary):
+    """
+    A read-only dictionary whose items are loaded in the background by a pool of threads, starting as soon as it is
+    created. Accessing an item blocks until this item is loaded, and raises the error caught while loading it if any.
+    """
+
+    def __init__(self, keys: List[str], loading_method: Callable[[str], Any], max_workers: int = None,
+                 executor: Executor = None):
+        """
+        Constructor. All items are submitted to the pool, in the order of keys.
+
+        :param keys:
+        :param loading_method:
+        :param max_workers: if no executor is provided, the number of threads of the pool created for this dictionary.
+        Default is None, meaning that the default of ThreadPoolExecutor is used
+        :param executor: an optional concurrent.futures.Executor where the items are submitted, so that several
+        dictionaries may share the same pool. It is not shut down by this dictionary. Default is None, meaning that a
+        pool is created for this dictionary, and shut down once all items are loaded.
+        """
+        check_var(keys, var_types=list, var_name='keys')
+        check_var(loading_method, var_types=Callable, var_name='loading_method')
+        check_var(max_workers, var_types=int, var_name='max_workers', enforce_not_none=False, min_value=1)
+        check_var(executor, var_types=Executor, var_name='executor', enforce_not_none=False)
+
+        self._futures = dict()
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for key in keys:
+                self._futures[key] = executor.submit(loading_method, key)
+        finally:
+            if own_executor:
+                # no more items will be submitted : the threads exit once all items are loaded
+                executor.shutdown(wait=False)
+
+        super(BackgroundDictionary, self).__init__(keys, loading_method=lambda key: self._futures[key].result())
+
+    def __repr__(self):
+        if self.done():
+            return dict(self.items()).__repr__()
+        else:
+            return 'BackgroundDictionary - not entirely loaded yet. Keys: ' + str(self.lazyloadable_keys)
+
+    def done(self) -> bool:
+        """
+        Returns True if all items are loaded (or failed to load)
+        :return:
+        """
+        return all(future.done() for future in self._futures.values())
+
+    def wait(self, timeout: float = None):
+        """
+        Blocks until all items are loaded. If some items failed to load, the error of the first one in key order is
+        raised.
+
+        :param timeout: the maximum number of seconds to wait. Default is None (no limit). A TimeoutError is raised if
+        some items are still loading when it expires
+        :return:
+        """
+        not_done = wait(self._futures.values(), timeout=timeout).not_done
+        if len(not_done) > 0:
+            raise TimeoutError(str(len(not_done)) + ' items are still loading after ' + str(timeout) + ' seconds')
+        for key in sorted(self.lazyloadable_keys):
+            self[key]
+
+
 class MultifileCollectionParser(MultiFileParser):
     """
     This class is able to read any collection type as long as they are PEP484 specified (Dict, List, Set, Tuple), from
@@ -351,13 +420,37 @@ class MultifileCollectionParser(MultiFileParser):
 
         # -- for each child create a plan with the appropriate parser
         children_plan = dict()
+        # the parser and the first plan created for each (type, ext, singlefile) signature, so that similar children
+        # do not need to look for a parser nor to build a plan again
+        templates = dict()
         # use sorting for reproducible results in case of multiple errors
         for (child_name, child_fileobject), child_typ in zip(sorted(obj_on_fs.get_multifile_children().items()),
                                                            subtypes):
-            # -- use the parserfinder to find the plan
-            child_parser = self.parser_finder.build_parser_for_fileobject_and_desiredtype(child_fileobject, child_typ,
-                                                                                          logger)
+            signature = (child_typ, child_fileobject.ext, child_fileobject.is_singlefile)
+            try:
+                child_parser, template = templates[signature]
+            except KeyError:
+                child_parser, template = None, None
+            except TypeError:
+                # unhashable type: no template
+                signature, child_parser, template = None, None, None
+
+            if template is not None:
+                # -- stamp out the plan from the template
+                pp = template._stamp(child_fileobject)
+                if pp is not None:
+                    if logger.isEnabledFor(INFO):
+                        logger.info(get_parsing_plan_log_str(child_fileobject, child_typ, child_parser))
+                    children_plan[child_name] = pp
+                    continue
+
+            if child_parser is None:
+                # -- use the parserfinder to find the parser
+                child_parser = self.parser_finder.build_parser_for_fileobject_and_desiredtype(child_fileobject,
+                                                                                              child_typ, logger)
             children_plan[child_name] = child_parser.create_parsing_plan(child_typ, child_fileobject, logger)
+            if signature is not None and template is None:
+                templates[signature] = (child_parser, children_plan[child_name])
 
         return children_plan
 
@@ -365,7 +458,41 @@ class MultifileCollectionParser(MultiFileParser):
         return self.get_id_for_options() + ': \n' \
                ' -- \'lazy_parsing\': a boolean indicating if parsing should be done later, when the item is actually ' \
                'used. \n' + \
-               ' -- \'background_parsing\': not implemented yet'
+               ' -- \'background_parsing\': a boolean indicating if parsing should be done in the background by a ' \
+               'pool of threads. The method returns immediately, and accessing an item blocks until it is ' \
+               'parsed. \n' + \
+               ' -- \'background_workers\': the number of threads used for background parsing. Default is the ' \
+               'default of ThreadPoolExecutor \n' + \
+               ' -- \'executor\': a concurrent.futures.Executor used to parse the children concurrently (when ' \
+               'neither lazy nor background parsing is used). \n' + \
+               ' -- \'max_workers\': if no executor is provided, the number of threads of a pool created to parse ' \
+               'the children concurrently. Default is None (children are parsed one after the other)'
+
+    def _parses_children_later(self, options: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Implementation of the parent method : children are parsed later in lazy and background parsing modes
+
+        :param options:
+        :return:
+        """
+        opts = self._get_applicable_options(options)
+        return opts.get('lazy_parsing', False) or opts.get('background_parsing', False)
+
+    def _get_options_for_children(self, options: Dict[str, Dict[str, Any]], opts: Dict[str, Any]) \
+            -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the options to use to parse the children in the background: children collections are parsed
+        sequentially by the thread parsing them, so that they do not create their own pool.
+
+        :param options: the options received
+        :param opts: the options applicable to this parser
+        :return:
+        """
+        children_options = dict(options)
+        children_options[self.get_id_for_options()] = {opt_key: opt_val for opt_key, opt_val in opts.items()
+                                                       if opt_key not in {'background_parsing', 'executor',
+                                                                          'max_workers'}}
+        return children_options
 
     def _parse_multifile(self, desired_type: Type[Union[Dict, List, Set, Tuple]], obj: PersistedObject,
                          parsing_plan_for_children: Dict[str, ParsingPlan], logger: Logger,
@@ -375,8 +502,20 @@ class MultifileCollectionParser(MultiFileParser):
         Options may contain a section with id 'MultifileCollectionParser' containing the following options:
         * lazy_parsing: if True, the method will return immediately without parsing all the contents. Instead, the
         returned collection will perform the parsing the first time an item is required.
-        * background_parsing: if True, the method will return immediately while a thread parses all the contents in
-        the background. Note that users cannot set both lazy_parsing and background_parsing to True at the same time
+        * background_parsing: if True, the method will return immediately while a pool of threads parses all the
+        contents in the background (see BackgroundDictionary). Accessing an item blocks until it is parsed, and raises
+        the error caught while parsing it if any. Children collections are parsed entirely by the thread parsing them.
+        Note that users cannot set both lazy_parsing and background_parsing to True at the same time
+        * background_workers: the number of threads of the pool created for background parsing, if no executor is
+        provided. Default is None, meaning that the default of ThreadPoolExecutor is used
+        * executor: a concurrent.futures.Executor used to parse the children concurrently, when lazy_parsing is not
+        set. With background_parsing, the children are parsed in the background on this executor instead of on a pool
+        created for the collection, so that several parses may share the same threads. Otherwise the results are still
+        assembled in key order, and if several children fail the error raised is the one of the first child in key
+        order, as in sequential mode. In both cases the descendants of the children are parsed sequentially by the
+        thread parsing them.
+        * max_workers: if no executor is provided, the number of threads of a pool created to parse the children
+        concurrently, see executor. Default is None, meaning that the children are parsed one after the other
 
         :param desired_type:
         :param obj:
@@ -389,13 +528,22 @@ class MultifileCollectionParser(MultiFileParser):
         # first get the options and check them
         lazy_parsing = False
         background_parsing = False
+        background_workers = None
+        executor = None
+        max_workers = None
 
         opts = self._get_applicable_options(options)
         for opt_key, opt_val in opts.items():
-            if opt_key is 'lazy_parsing':
+            if opt_key == 'lazy_parsing':
                 lazy_parsing = opt_val
-            elif opt_key is 'background_parsing':
+            elif opt_key == 'background_parsing':
                 background_parsing = opt_val
+            elif opt_key == 'background_workers':
+                background_workers = opt_val
+            elif opt_key == 'executor':
+                executor = opt_val
+            elif opt_key == 'max_workers':
+                max_workers = opt_val
             else:
                 raise Exception('Invalid option in MultiFileCollectionParser : ' + opt_key)
 
@@ -413,18 +561,23 @@ class MultifileCollectionParser(MultiFileParser):
                         + ' (lazy parsing: children will be parsed when used) ')
 
         elif background_parsing:
-            # -- TODO create a thread to perform the parsing in the background
-            raise ValueError('Background parsing is not yet supported')
+            children_options = self._get_options_for_children(options, opts)
+
+            # build a dictionary parsed in the background
+            results = BackgroundDictionary(sorted(list(parsing_plan_for_children.keys())),
+                                           loading_method=lambda x: parsing_plan_for_children[x].execute(
+                                               logger, children_options),
+                                           max_workers=background_workers, executor=executor)
+            logger.info('Assembling a ' + get_pretty_type_str(desired_type) + ' from all children of ' + str(obj)
+                        + ' (background parsing: children are being parsed) ')
 
         else:
             # Parse right now
-            results = {}
-
             # parse all children according to their plan
             # -- use key-based sorting on children to lead to reproducible results
             # (in case of multiple errors, the same error will show up first everytime)
-            for child_name, child_plan in sorted(parsing_plan_for_children.items()):
-                results[child_name] = child_plan.execute(logger, options)
+            results = self._execute_children_plans(parsing_plan_for_children, logger, options, executor=executor,
+                                                   max_workers=max_workers)
             logger.info('Assembling a ' + get_pretty_type_str(desired_type) + ' from all parsed children of '
                         + str(obj))
 
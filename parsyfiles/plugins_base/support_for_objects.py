@@ -1,6 +1,6 @@
 from inspect import Parameter
 from logging import Logger, warning
-from typing import Type, Any, List, Dict, Union, Tuple, Set
+from typing import Type, Any, List, Dict, Union, Tuple, Set, BinaryIO
 
 from parsyfiles.converting_core import Converter, T, ConverterFunction, AnyObject
 from parsyfiles.filesystem_mapping import PersistedObject
@@ -26,12 +26,29 @@ def read_object_from_pickle(desired_type: Type[T], file_path: str, encoding: str
     :param kwargs:
     :return:
     """
+    with open(file_path, mode='rb') as file_object:
+        return read_object_from_pickle_stream(desired_type, file_object, None, fix_imports=fix_imports, errors=errors,
+                                              encoding=encoding)
+
+
+def read_object_from_pickle_stream(desired_type: Type[T], file_object: BinaryIO, logger: Logger,
+                                   fix_imports: bool = True, errors: str = 'strict', encoding: str = 'utf-8', *args,
+                                   **kwargs) -> Any:
+    """
+    Parses a pickle file from a binary stream.
+
+    :param desired_type:
+    :param file_object:
+    :param logger:
+    :param fix_imports:
+    :param errors:
+    :param encoding: the encoding used by pickle to decode the 8-bit string instances pickled by Python 2
+    :param args:
+    :param kwargs:
+    :return:
+    """
     import pickle
-    file_object = open(file_path, mode='rb')
-    try:
-        return pickle.load(file_object, fix_imports=fix_imports, encoding=encoding, errors=errors)
-    finally:
-        file_object.close()
+    return pickle.load(file_object, fix_imports=fix_imports, encoding=encoding, errors=errors)
 
 
 def base64_ascii_str_pickle_to_object(desired_type: Type[T], b64_ascii_str: str, logger: Logger,
@@ -295,8 +312,10 @@ def get_default_object_parsers(parser_finder: ParserFinder, conversion_finder: C
     RootParser
     :return:
     """
-    return [SingleFileParserFunction(parser_function=read_object_from_pickle,
-                                     streaming_mode=False,
+    return [SingleFileParserFunction(parser_function=read_object_from_pickle_stream,
+                                     custom_name='read_object_from_pickle',
+                                     streaming_mode=True,
+                                     binary_mode=True,
                                      supported_exts={'.pyc'},
                                      supported_types={AnyObject}),
             MultifileObjectParser(parser_finder, conversion_finder)
@@ -371,6 +390,12 @@ class MultifileObjectParser(MultiFileParser):
         else:
             return super(MultifileObjectParser, self).is_able_to_parse(desired_type, desired_ext, strict)
 
+    def options_hints(self):
+        return self.get_id_for_options() + ': \n' \
+               ' -- \'executor\': a concurrent.futures.Executor used to parse the attribute files concurrently. \n' + \
+               ' -- \'max_workers\': if no executor is provided, the number of threads of a pool created to parse ' \
+               'the attribute files concurrently. Default is None (attributes are parsed one after the other)'
+
     def __str__(self):
         return 'Multifile Object parser (' + str(self.parser_finder) + ')'
         #'(based on \'' + str(self.parser_finder) + '\' to find the parser for each ' \
@@ -441,6 +466,12 @@ class MultifileObjectParser(MultiFileParser):
                          parsing_plan_for_children: Dict[str, AnyParser._RecursiveParsingPlan], logger: Logger,
                          options: Dict[str, Dict[str, Any]]) -> T:
         """
+        Options may contain a section with id 'MultifileObjectParser' containing the following options:
+        * executor: a concurrent.futures.Executor used to parse the attribute files concurrently before assembling the
+        object. The error raised if several attributes fail is the one of the first attribute in name order, as in
+        sequential mode. The descendants of the attributes are parsed sequentially by the thread parsing them.
+        * max_workers: if no executor is provided, the number of threads of a pool created to parse the attribute files
+        concurrently, see executor. Default is None, meaning that the attributes are parsed one after the other
 
         :param desired_type:
         :param obj:
@@ -450,14 +481,25 @@ class MultifileObjectParser(MultiFileParser):
         :return:
         """
 
-        # Parse children right now
-        results = {}
+        # first get the options and check them
+        executor = None
+        max_workers = None
+
+        opts = self._get_applicable_options(options)
+        for opt_key, opt_val in opts.items():
+            if opt_key == 'executor':
+                executor = opt_val
+            elif opt_key == 'max_workers':
+                max_workers = opt_val
+            else:
+                raise Exception('Invalid option in MultifileObjectParser : ' + opt_key)
 
+        # Parse children right now
         # 1) first parse all children according to their plan
         # -- use key-based sorting on children to lead to reproducible results
         # (in case of multiple errors, the same error will show up first everytime)
-        for child_name, child_plan in sorted(parsing_plan_for_children.items()):
-            results[child_name] = child_plan.execute(logger, options)
+        results = self._execute_children_plans(parsing_plan_for_children, logger, options, executor=executor,
+                                               max_workers=max_workers)
 
         # 2) finally build the resulting object
         logger.info('Assembling a ' + get_pretty_type_str(desired_type) + ' from all parsed children of ' + str(obj)
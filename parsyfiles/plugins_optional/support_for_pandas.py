@@ -1,5 +1,6 @@
+from io import TextIOBase
 from logging import Logger
-from typing import Dict, List, Any, Union, Type
+from typing import Dict, List, Any, Union, Type, BinaryIO
 
 import pandas as pd
 
@@ -7,17 +8,6 @@ from parsyfiles.converting_core import Converter, ConverterFunction, T
 from parsyfiles.parsing_core import SingleFileParserFunction, AnyParser
 
 
-# def read_simpledf_from_xls_streaming(desired_type: Type[pd.DataFrame], file_object: TextIOBase,
-#                            logger: Logger, **kwargs) -> pd.DataFrame:
-#     """
-#     Helper method to read a dataframe from a xls file stream. By default this is well suited for a dataframe with
-#     headers in the first row, for example a parameter dataframe.
-#     :param file_object:
-#     :return:
-#     """
-#     return pd.read_excel(file_object, **kwargs)
-
-
 def pandas_parsers_option_hints_xls():
     return 'all options from read_excel are supported, see http://pandas.pydata.org/pandas-docs/stable/generated/pandas.read_excel.html'
 
@@ -25,10 +15,7 @@ def pandas_parsers_option_hints_xls():
 def read_dataframe_from_xls(desired_type: Type[T], file_path: str, encoding: str,
                             logger: Logger, **kwargs) -> pd.DataFrame:
     """
-    We register this method rather than the other because pandas guesses the encoding by itself.
-
-    Also, it is easier to put a breakpoint and debug by trying various options to find the good one (in streaming mode
-    you just have one try and then the stream is consumed)
+    Helper method to read a dataframe from a xls file. See read_dataframe_from_xls_stream.
 
     :param desired_type:
     :param file_path:
@@ -37,14 +24,29 @@ def read_dataframe_from_xls(desired_type: Type[T], file_path: str, encoding: str
     :param kwargs:
     :return:
     """
-    return pd.read_excel(file_path, **kwargs)
+    with open(file_path, 'rb') as file_object:
+        return read_dataframe_from_xls_stream(desired_type, file_object, logger, **kwargs)
+
+
+def read_dataframe_from_xls_stream(desired_type: Type[T], file_object: BinaryIO,
+                                   logger: Logger, **kwargs) -> pd.DataFrame:
+    """
+    Helper method to read a dataframe from a xls file stream. By default this is well suited for a dataframe with
+    headers in the first row, for example a parameter dataframe.
+
+    :param desired_type:
+    :param file_object:
+    :param logger:
+    :param kwargs:
+    :return:
+    """
+    return pd.read_excel(file_object, **kwargs)
 
 
 def read_df_or_series_from_csv(desired_type: Type[pd.DataFrame], file_path: str, encoding: str,
                                logger: Logger, **kwargs) -> pd.DataFrame:
     """
-    Helper method to read a dataframe from a csv file. By default this is well suited for a dataframe with
-    headers in the first row, for example a parameter dataframe.
+    Helper method to read a dataframe from a csv file. See read_df_or_series_from_csv_stream.
 
     :param desired_type:
     :param file_path:
@@ -53,6 +55,22 @@ def read_df_or_series_from_csv(desired_type: Type[pd.DataFrame], file_path: str,
     :param kwargs:
     :return:
     """
+    with open(file_path, 'r', encoding=encoding) as file_object:
+        return read_df_or_series_from_csv_stream(desired_type, file_object, logger, **kwargs)
+
+
+def read_df_or_series_from_csv_stream(desired_type: Type[pd.DataFrame], file_object: TextIOBase,
+                                      logger: Logger, **kwargs) -> pd.DataFrame:
+    """
+    Helper method to read a dataframe from a csv file stream, already decoded with the file encoding. By default this
+    is well suited for a dataframe with headers in the first row, for example a parameter dataframe.
+
+    :param desired_type:
+    :param file_object:
+    :param logger:
+    :param kwargs:
+    :return:
+    """
     if desired_type is pd.Series:
         # as recommended in http://pandas.pydata.org/pandas-docs/stable/generated/pandas.Series.from_csv.html
         # and from http://stackoverflow.com/questions/15760856/how-to-read-a-pandas-series-from-a-csv-file
@@ -61,9 +79,9 @@ def read_df_or_series_from_csv(desired_type: Type[pd.DataFrame], file_path: str,
         # note : squeeze=true only works for row-oriented, so we dont use it. We rather expect that a row-oriented
         # dataframe would be convertible to a series using the df to series converter below
         if 'index_col' not in kwargs.keys():
-            one_col_df = pd.read_csv(file_path, encoding=encoding, index_col=0, **kwargs)
+            one_col_df = pd.read_csv(file_object, index_col=0, **kwargs)
         else:
-            one_col_df = pd.read_csv(file_path, encoding=encoding, **kwargs)
+            one_col_df = pd.read_csv(file_object, **kwargs)
 
         if one_col_df.shape[1] == 1:
             return one_col_df[one_col_df.columns[0]]
@@ -72,7 +90,7 @@ def read_df_or_series_from_csv(desired_type: Type[pd.DataFrame], file_path: str,
                             ' Probably the parsing chain $read_df_or_series_from_csv => single_row_or_col_df_to_series$'
                             'will work, though.')
     else:
-        return pd.read_csv(file_path, encoding=encoding, **kwargs)
+        return pd.read_csv(file_object, **kwargs)
 
 
 def pandas_parsers_option_hints_csv():
@@ -84,13 +102,16 @@ def get_default_pandas_parsers() -> List[AnyParser]:
     Utility method to return the default parsers able to parse a dictionary from a file.
     :return:
     """
-    return [SingleFileParserFunction(parser_function=read_dataframe_from_xls,
-                                     streaming_mode=False,
+    return [SingleFileParserFunction(parser_function=read_dataframe_from_xls_stream,
+                                     custom_name='read_dataframe_from_xls',
+                                     streaming_mode=True,
+                                     binary_mode=True,
                                      supported_exts={'.xls', '.xlsx', '.xlsm'},
                                      supported_types={pd.DataFrame},
                                      option_hints=pandas_parsers_option_hints_xls),
-            SingleFileParserFunction(parser_function=read_df_or_series_from_csv,
-                                     streaming_mode=False,
+            SingleFileParserFunction(parser_function=read_df_or_series_from_csv_stream,
+                                     custom_name='read_df_or_series_from_csv',
+                                     streaming_mode=True,
                                      supported_exts={'.csv', '.txt'},
                                      supported_types={pd.DataFrame, pd.Series},
                                      option_hints=pandas_parsers_option_hints_csv),
@@ -0,0 +1,736 @@
+import gc
+import os
+import pickle
+import re
+import tarfile
+from io import BytesIO
+from logging import getLogger, Logger, Handler, INFO
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event, Thread, current_thread
+from time import time, sleep
+from typing import Type, Dict
+from unittest import TestCase
+from unittest.mock import patch
+from zipfile import ZipFile
+
+import parsyfiles.filesystem_mapping
+from parsyfiles.filesystem_mapping import WrappedFileMappingConfiguration, FlatFileMappingConfiguration, \
+    MULTIFILE_EXT, ObjectPresentMultipleTimesOnFileSystemError, WrappedZipFileMappingConfiguration, \
+    FlatTarFileMappingConfiguration, WrappedTarFileMappingConfiguration, MemoryFileMappingConfiguration
+from parsyfiles.parsing_core import SingleFileParserFunction
+from parsyfiles.parsing_core_api import ParsingException
+from parsyfiles.parsing_fw import RootParser
+from parsyfiles.plugins_base.support_for_objects import read_object_from_pickle
+
+
+class TestWrappedFileMapping(TestCase):
+
+    def setUp(self):
+        """
+        Creates the following structure in a temporary folder
+
+        root/
+        |-a.txt
+        |-b/
+          |-c.txt
+          |-d.cfg
+          |-e/
+          |-f/
+            |-g.txt
+        |-h.txt
+        |-h.cfg
+        :return:
+        """
+        self.root = mkdtemp()
+        for path in ['a.txt', 'b/c.txt', 'b/d.cfg', 'b/f/g.txt', 'h.txt', 'h.cfg']:
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write('1')
+        os.makedirs(os.path.join(self.root, 'b', 'e'))
+        self.logger = getLogger('parsyfiles.tests')
+
+    def tearDown(self):
+        rmtree(self.root)
+
+    def test_wrapped_object_tree(self):
+        """
+        Checks that the persisted object tree is correct
+        :return:
+        """
+        conf = WrappedFileMappingConfiguration()
+        obj = conf.create_persisted_object(os.path.join(self.root, 'b'), logger=self.logger)
+
+        self.assertFalse(obj.is_singlefile)
+        children = obj.get_multifile_children()
+        self.assertEqual(list(children.keys()), ['c', 'd', 'e', 'f'])
+        self.assertEqual(children['c'].get_singlefile_path(), os.path.join(self.root, 'b', 'c.txt'))
+        self.assertEqual(children['d'].ext, '.cfg')
+        self.assertEqual(children['e'].ext, MULTIFILE_EXT)
+        self.assertEqual(children['e'].get_multifile_children(), dict())
+        self.assertEqual(list(children['f'].get_multifile_children().keys()), ['g'])
+
+        # the snapshots do not survive the scan
+        self.assertIsNone(conf._get_scan_snapshots())
+
+        with self.assertRaises(ObjectPresentMultipleTimesOnFileSystemError):
+            conf.create_persisted_object(os.path.join(self.root, 'h'), logger=self.logger)
+        self.assertIsNone(conf._get_scan_snapshots())
+
+    def test_wrapped_each_folder_listed_once(self):
+        """
+        Checks that during a scan each folder is listed only once
+        :return:
+        """
+        listed = []
+        real_scandir = parsyfiles.filesystem_mapping.scandir
+
+        def counting_scandir(path):
+            listed.append(os.path.normpath(path))
+            return real_scandir(path)
+
+        with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+            WrappedFileMappingConfiguration().create_persisted_object(os.path.join(self.root, 'b') + os.sep,
+                                                                      logger=self.logger)
+
+        self.assertEqual(len(listed), len(set(listed)))
+        self.assertEqual(set(listed), {os.path.join(self.root, 'b'), os.path.join(self.root, 'b', 'e'),
+                                       os.path.join(self.root, 'b', 'f')})
+
+    def test_wrapped_concurrent_scan(self):
+        """
+        Checks that the concurrent scan creates the same tree and lists each folder once
+        :return:
+        """
+        def to_tuple(obj):
+            if obj.is_singlefile:
+                return obj.location, obj.ext, obj.get_singlefile_path()
+            else:
+                return obj.location, obj.ext, [to_tuple(child) for child in obj.get_multifile_children().values()]
+
+        listed = []
+        real_scandir = parsyfiles.filesystem_mapping.scandir
+
+        def counting_scandir(path):
+            listed.append(os.path.normpath(path))
+            return real_scandir(path)
+
+        conf = WrappedFileMappingConfiguration()
+        location = os.path.join(self.root, 'b')
+        with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+            obj = conf.create_persisted_object(location, logger=self.logger, scan_workers=4)
+
+        self.assertEqual(len(listed), len(set(listed)))
+        self.assertEqual(to_tuple(obj), to_tuple(conf.create_persisted_object(location, logger=self.logger)))
+
+        # errors are the same than in sequential mode
+        with self.assertRaises(ObjectPresentMultipleTimesOnFileSystemError):
+            WrappedFileMappingConfiguration(scan_workers=4).create_persisted_object(os.path.join(self.root, 'h'),
+                                                                                    logger=self.logger)
+
+    def test_wrapped_concurrent_scan_no_siblings(self):
+        """
+        Checks that the concurrent scan lists the parent folder, but not the sibling folders of the object
+        :return:
+        """
+        for path in ['s/t.txt', 's/u/v.txt']:
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write('1')
+
+        listed = []
+        real_scandir = parsyfiles.filesystem_mapping.scandir
+
+        def counting_scandir(path):
+            listed.append(os.path.normpath(path))
+            return real_scandir(path)
+
+        location = os.path.join(self.root, 'b')
+        with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+            WrappedFileMappingConfiguration(scan_workers=4).create_persisted_object(location, logger=self.logger)
+
+        self.assertEqual(len(listed), len(set(listed)))
+        self.assertEqual(set(listed), {os.path.normpath(self.root), location, os.path.join(location, 'e'),
+                                       os.path.join(location, 'f')})
+
+    def test_wrapped_overlapping_scans(self):
+        """
+        Checks that a scan started while another one is in progress in another thread lists the folders again, so
+        that it sees the files added in the meantime
+        :return:
+        """
+        listing_f = Event()
+        release = Event()
+        real_scandir = parsyfiles.filesystem_mapping.scandir
+
+        def blocking_scandir(path):
+            if current_thread() is scan_thread and os.path.normpath(path) == os.path.join(location, 'f'):
+                listing_f.set()
+                release.wait(10)
+            return real_scandir(path)
+
+        conf = WrappedFileMappingConfiguration()
+        location = os.path.join(self.root, 'b')
+        objs = []
+        scan_thread = Thread(target=lambda: objs.append(conf.create_persisted_object(location, logger=self.logger)))
+        with patch('parsyfiles.filesystem_mapping.scandir', blocking_scandir):
+            scan_thread.start()
+            try:
+                self.assertTrue(listing_f.wait(10))
+                with open(os.path.join(location, 'x.txt'), 'w') as f:
+                    f.write('1')
+                obj = conf.create_persisted_object(location, logger=self.logger)
+                self.assertEqual(list(obj.get_multifile_children().keys()), ['c', 'd', 'e', 'f', 'x'])
+            finally:
+                release.set()
+                scan_thread.join()
+
+        # the first scan only saw the files present when it listed the folder
+        self.assertEqual(list(objs[0].get_multifile_children().keys()), ['c', 'd', 'e', 'f'])
+        self.assertIsNone(conf._get_scan_snapshots())
+
+    def test_wrapped_lazy_scan(self):
+        """
+        Checks that in lazy mode the children are scanned on first access only, and that the tree is the same
+        :return:
+        """
+        listed = []
+        real_scandir = parsyfiles.filesystem_mapping.scandir
+
+        def counting_scandir(path):
+            listed.append(os.path.normpath(path))
+            return real_scandir(path)
+
+        conf = WrappedFileMappingConfiguration(lazy_scan=True)
+        location = os.path.join(self.root, 'b')
+        with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+            obj = conf.create_persisted_object(location, logger=self.logger)
+            self.assertIsInstance(obj, WrappedFileMappingConfiguration.LazyPersistedObject)
+            self.assertEqual(set(listed), {os.path.normpath(self.root), location})
+
+            children = obj.get_multifile_children()
+            self.assertEqual(list(children.keys()), ['c', 'd', 'e', 'f'])
+            self.assertEqual(set(listed), {os.path.normpath(self.root), location, os.path.join(location, 'e'),
+                                           os.path.join(location, 'f')})
+
+            # cached
+            self.assertIs(obj.get_multifile_children(), children)
+
+        self.assertEqual(children['c'].get_singlefile_path(), os.path.join(location, 'c.txt'))
+        self.assertEqual(list(children['f'].get_multifile_children().keys()), ['g'])
+
+        # errors are raised on access
+        obj = conf.create_persisted_object(self.root, logger=self.logger)
+        with self.assertRaises(ObjectPresentMultipleTimesOnFileSystemError):
+            obj.get_multifile_children()
+
+    def test_wrapped_compact_tree(self):
+        """
+        Checks that the compact tree is the same than the default one, and that its objects have no __dict__
+        :return:
+        """
+        def to_tuple(obj):
+            if obj.is_singlefile:
+                return obj.location, obj.ext, obj.get_singlefile_path(), obj.get_singlefile_encoding()
+            else:
+                return obj.location, obj.ext, [(name, to_tuple(child))
+                                               for name, child in obj.get_multifile_children().items()]
+
+        conf = WrappedFileMappingConfiguration(compact=True)
+        location = os.path.join(self.root, 'b')
+        obj = conf.create_persisted_object(location, logger=self.logger)
+        self.assertIsInstance(obj, WrappedFileMappingConfiguration.CompactPersistedObject)
+        self.assertFalse(hasattr(obj, '__dict__'))
+        self.assertFalse(hasattr(obj.get_multifile_children()['c'], '__dict__'))
+        self.assertEqual(to_tuple(obj), to_tuple(conf.create_persisted_object(location, logger=self.logger,
+                                                                              compact=False)))
+
+        # the objects can be parsed
+        rp = RootParser(logger=self.logger)
+        self.assertEqual(rp.parse_item(os.path.join(location, 'f'), Dict[str, int], file_mapping_conf=conf), {'g': 1})
+
+        with self.assertRaises(ValueError):
+            conf.create_persisted_object(location, logger=self.logger, lazy_scan=True)
+
+    def test_wrapped_iter_children(self):
+        """
+        Checks that children are yielded as soon as they are scanned, and that items can be parsed the same way
+        :return:
+        """
+        listed = []
+        real_scandir = parsyfiles.filesystem_mapping.scandir
+
+        def counting_scandir(path):
+            listed.append(os.path.normpath(path))
+            return real_scandir(path)
+
+        conf = WrappedFileMappingConfiguration()
+        location = os.path.join(self.root, 'b')
+        with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+            children = conf.iter_children(location, logger=self.logger)
+            name, child = next(children)
+            self.assertEqual((name, child.get_singlefile_path()), ('c', os.path.join(location, 'c.txt')))
+            self.assertNotIn(os.path.join(location, 'f'), listed)
+            # no scan is left in progress while the caller works on a child
+            self.assertIsNone(conf._get_scan_snapshots())
+            self.assertEqual([name for name, child in children], ['d', 'e', 'f'])
+            self.assertIn(os.path.join(location, 'f'), listed)
+        self.assertIsNone(conf._get_scan_snapshots())
+        # the scan of each child reuses the listing of the folder
+        self.assertEqual(len(listed), len(set(listed)))
+
+        with self.assertRaises(ValueError):
+            list(conf.iter_children(os.path.join(location, 'c'), logger=self.logger))
+        self.assertIsNone(conf._get_scan_snapshots())
+
+        rp = RootParser(logger=self.logger)
+        self.assertEqual(list(rp.iter_collection(os.path.join(location, 'f'), int)), [('g', 1)])
+
+    def test_wrapped_deep_tree(self):
+        """
+        Checks that trees deeper than the recursion limit can be scanned, and that errors are logged from the innermost
+        to the outermost object being built
+        :return:
+        """
+        depth = 500
+        path = self.root
+        for i in range(depth):
+            path = os.path.join(path, 'd')
+            os.mkdir(path)
+        with open(os.path.join(path, 'x.txt'), 'w') as f:
+            f.write('1')
+        location = os.path.join(self.root, 'd')
+
+        for compact in (False, True):
+            obj = WrappedFileMappingConfiguration(compact=compact).create_persisted_object(location,
+                                                                                          logger=self.logger)
+            for i in range(depth - 1):
+                obj = obj.get_multifile_children()['d']
+            self.assertEqual(obj.location, path)
+            self.assertEqual(obj.get_multifile_children()['x'].get_singlefile_path(), os.path.join(path, 'x.txt'))
+
+        # errors
+        with open(os.path.join(path, 'x.cfg'), 'w') as f:
+            f.write('1')
+        messages = []
+        handler = Handler()
+        handler.emit = lambda record: messages.append(record.getMessage())
+        self.logger.addHandler(handler)
+        old_level = self.logger.level
+        self.logger.setLevel(INFO)
+        try:
+            for compact in (False, True):
+                messages.clear()
+                with self.assertRaises(ObjectPresentMultipleTimesOnFileSystemError):
+                    WrappedFileMappingConfiguration(compact=compact).create_persisted_object(location,
+                                                                                             logger=self.logger)
+                self.assertEqual(messages[-depth - 1:],
+                                 [os.path.join(path, 'x')]
+                                 + [os.path.join(self.root, *(['d'] * i)) for i in range(depth, 0, -1)])
+        finally:
+            self.logger.removeHandler(handler)
+            self.logger.setLevel(old_level)
+
+    def test_wrapped_reusable_plan(self):
+        """
+        Checks that a reusable parsing plan is reused as long as the files do not change
+        :return:
+        """
+        # folders modified too recently can not be fingerprinted
+        location = os.path.join(self.root, 'b', 'f')
+        past = time() - 10
+        for path in [self.root, os.path.join(self.root, 'b'), location]:
+            os.utime(path, (past, past))
+
+        rp = RootParser(logger=self.logger)
+        pp = rp.create_reusable_parsing_plan(location, Dict[str, int])
+        self.assertFalse(pp.is_up_to_date())
+        self.assertEqual(pp.execute(), {'g': 1})
+        first_plan = pp._parsing_plan
+        self.assertTrue(pp.is_up_to_date())
+
+        # file contents are read again, but the plan is reused
+        with open(os.path.join(location, 'g.txt'), 'w') as f:
+            f.write('2')
+        self.assertEqual(pp.execute(), {'g': 2})
+        self.assertIs(pp._parsing_plan, first_plan)
+
+        # a new file changes the fingerprint
+        with open(os.path.join(location, 'h.txt'), 'w') as f:
+            f.write('3')
+        self.assertFalse(pp.is_up_to_date())
+        self.assertEqual(pp.execute(), {'g': 2, 'h': 3})
+        self.assertIsNot(pp._parsing_plan, first_plan)
+
+        # registering a parser invalidates the plans
+        rp.register_parser(SingleFileParserFunction(lambda desired_type, file_object, logger: file_object.read(),
+                                                    supported_types={str}, supported_exts={'.foo'}))
+        self.assertFalse(pp.is_up_to_date())
+
+        # parse_collection keeps its plans
+        os.utime(location, (past, past))
+        self.assertEqual(rp.parse_collection(location, int, reuse_plan=True), {'g': 2, 'h': 3})
+        self.assertEqual(rp.parse_collection(location, int, reuse_plan=True), {'g': 2, 'h': 3})
+        self.assertEqual(len(rp._reusable_plans), 1)
+        self.assertTrue(list(rp._reusable_plans.values())[0].is_up_to_date())
+
+        # only the most recently used plans are kept
+        rp = RootParser(logger=self.logger, max_reusable_plans=2)
+        for item_type in [int, str, int, float]:
+            rp.parse_collection(location, item_type, reuse_plan=True)
+        self.assertEqual([key[0] for key in rp._reusable_plans.keys()], [Dict[str, int], Dict[str, float]])
+
+    def test_wrapped_reusable_plan_modified_during_scan(self):
+        """
+        Checks that a reusable parsing plan is not reused if a folder was modified during the scan, even if the
+        modification happened more than RACY_DELAY seconds before the end of the scan
+        :return:
+        """
+        location = os.path.join(self.root, 'b', 'f')
+        past = time() - 10
+        for path in [self.root, os.path.join(self.root, 'b'), location]:
+            os.utime(path, (past, past))
+
+        class ModifiedDuringScan(WrappedFileMappingConfiguration):
+            def create_persisted_object(self, location, logger, **kwargs):
+                obj = super(ModifiedDuringScan, self).create_persisted_object(location, logger, **kwargs)
+                if not os.path.exists(os.path.join(location, 'h.txt')):
+                    # a file is added after the folder was listed, and the scan goes on for a while
+                    with open(os.path.join(location, 'h.txt'), 'w') as f:
+                        f.write('3')
+                    sleep(0.2)
+                return obj
+
+        with patch.object(parsyfiles.filesystem_mapping._ScanManifest, 'RACY_DELAY', 0.05):
+            pp = RootParser(logger=self.logger).create_reusable_parsing_plan(location, Dict[str, int],
+                                                                             file_mapping_conf=ModifiedDuringScan())
+            self.assertEqual(pp.execute(), {'g': 1})
+            self.assertFalse(pp.is_up_to_date())
+            self.assertEqual(pp.execute(), {'g': 1, 'h': 3})
+
+    def test_wrapped_reusable_plan_overlapping_scan(self):
+        """
+        Checks that a reusable parsing plan created while another scan is in progress is built from its own listings,
+        so that it is consistent with its fingerprint
+        :return:
+        """
+        location = os.path.join(self.root, 'b', 'f')
+        conf = WrappedFileMappingConfiguration()
+        listed = Event()
+        release = Event()
+
+        def other_scan():
+            # a scan that lists the folder, and goes on while the reusable plan is created
+            conf._begin_scan()
+            try:
+                conf._get_dir_snapshot(location)
+                listed.set()
+                release.wait(10)
+            finally:
+                conf._end_scan()
+
+        scan_thread = Thread(target=other_scan)
+        scan_thread.start()
+        try:
+            self.assertTrue(listed.wait(10))
+            with open(os.path.join(location, 'h.txt'), 'w') as f:
+                f.write('3')
+            past = time() - 10
+            for path in [self.root, os.path.join(self.root, 'b'), location]:
+                os.utime(path, (past, past))
+
+            pp = RootParser(logger=self.logger).create_reusable_parsing_plan(location, Dict[str, int],
+                                                                             file_mapping_conf=conf)
+            self.assertEqual(pp.execute(), {'g': 1, 'h': 3})
+            self.assertTrue(pp.is_up_to_date())
+        finally:
+            release.set()
+            scan_thread.join()
+
+    def test_wrapped_scan_manifest(self):
+        """
+        Checks that with a scan manifest, only the folders that were modified are listed again
+        :return:
+        """
+        manifest = os.path.join(mkdtemp(), 'manifest.json')
+        location = os.path.join(self.root, 'b')
+
+        # make all folders look old, so that their listings can be reused
+        old_time = time() - 60
+        for folder in [self.root, location, os.path.join(location, 'e'), os.path.join(location, 'f')]:
+            os.utime(folder, (old_time, old_time))
+
+        try:
+            obj = WrappedFileMappingConfiguration(scan_manifest=manifest).create_persisted_object(location,
+                                                                                                  logger=self.logger)
+            self.assertTrue(os.path.exists(manifest))
+
+            listed = []
+            real_scandir = parsyfiles.filesystem_mapping.scandir
+
+            def counting_scandir(path):
+                listed.append(os.path.normpath(path))
+                return real_scandir(path)
+
+            # nothing changed: no folder is listed, and the tree is the same
+            with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+                obj2 = WrappedFileMappingConfiguration(scan_manifest=manifest).create_persisted_object(
+                    location, logger=self.logger)
+            self.assertEqual(listed, [])
+            self.assertEqual(list(obj2.get_multifile_children().keys()), list(obj.get_multifile_children().keys()))
+
+            # a file is added in a folder: only this folder is listed again
+            with open(os.path.join(location, 'new.txt'), 'w') as f:
+                f.write('1')
+            with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+                obj3 = WrappedFileMappingConfiguration(scan_manifest=manifest).create_persisted_object(
+                    location, logger=self.logger)
+            self.assertEqual(listed, [location])
+            self.assertEqual(list(obj3.get_multifile_children().keys()), ['c', 'd', 'e', 'f', 'new'])
+        finally:
+            rmtree(os.path.dirname(manifest))
+
+    def test_wrapped_include_exclude(self):
+        """
+        Checks that excluded files and folders are ignored, and that excluded folders are not listed
+        :return:
+        """
+        listed = []
+        real_scandir = parsyfiles.filesystem_mapping.scandir
+
+        def counting_scandir(path):
+            listed.append(os.path.normpath(path))
+            return real_scandir(path)
+
+        # without exclusion 'h' is present twice (h.txt and h.cfg)
+        conf = WrappedFileMappingConfiguration(exclude=['*.cfg', 'e/'])
+        with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+            obj = conf.create_persisted_object(self.root, logger=self.logger)
+        self.assertEqual(list(obj.get_multifile_children().keys()), ['a', 'b', 'h'])
+        self.assertEqual(list(obj.get_multifile_children()['b'].get_multifile_children().keys()), ['c', 'f'])
+        self.assertNotIn(os.path.join(self.root, 'b', 'e'), listed)
+
+        conf = WrappedFileMappingConfiguration(include=[re.compile(r'.*\.cfg')], exclude=[re.compile('f/')])
+        obj = conf.create_persisted_object(os.path.join(self.root, 'b'), logger=self.logger)
+        self.assertEqual(list(obj.get_multifile_children().keys()), ['d', 'e'])
+
+
+class TestFlatFileMapping(TestCase):
+
+    def setUp(self):
+        """
+        Creates the following structure in a temporary folder
+
+        root/
+        |-a.txt
+        |-b--c.txt
+        |-b--d.cfg
+        |-b--f--g.txt
+        |-b--f--h.txt
+        |-bb--i.txt
+        :return:
+        """
+        self.root = mkdtemp()
+        for path in ['a.txt', 'b--c.txt', 'b--d.cfg', 'b--f--g.txt', 'b--f--h.txt', 'bb--i.txt']:
+            with open(os.path.join(self.root, path), 'w') as f:
+                f.write('1')
+        self.logger = getLogger('parsyfiles.tests')
+
+    def tearDown(self):
+        rmtree(self.root)
+
+    def test_flat_object_tree(self):
+        """
+        Checks that the persisted object tree is correct, and that the folder is listed only once
+        :return:
+        """
+        listed = []
+        real_scandir = parsyfiles.filesystem_mapping.scandir
+
+        def counting_scandir(path):
+            listed.append(path)
+            return real_scandir(path)
+
+        conf = FlatFileMappingConfiguration(separator='--')
+        with patch('parsyfiles.filesystem_mapping.scandir', counting_scandir):
+            obj = conf.create_persisted_object(os.path.join(self.root, 'b'), logger=self.logger)
+
+        self.assertEqual(listed, [self.root])
+        children = obj.get_multifile_children()
+        self.assertEqual(list(children.keys()), ['c', 'd', 'f'])
+        self.assertEqual(children['d'].get_singlefile_path(), os.path.join(self.root, 'b--d.cfg'))
+        self.assertEqual(list(children['f'].get_multifile_children().keys()), ['g', 'h'])
+
+        # the root folder itself
+        obj = conf.create_persisted_object(self.root, logger=self.logger)
+        self.assertEqual(list(obj.get_multifile_children().keys()), ['a', 'b', 'bb'])
+
+
+class TestArchiveFileMapping(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        self.logger = getLogger('parsyfiles.tests')
+
+    def tearDown(self):
+        rmtree(self.tmp_dir)
+
+    def test_wrapped_zip(self):
+        """
+        Checks that objects can be found and parsed in a zip file, in wrapped mode
+        :return:
+        """
+        archive = os.path.join(self.tmp_dir, 'data.zip')
+        with ZipFile(archive, 'w') as zf:
+            zf.writestr('a.txt', 'hello')
+            zf.writestr('b/c.txt', 'world')
+            zf.writestr('b/d.cfg', 'foo')
+            zf.writestr('b/e/', '')
+            zf.writestr('b/f/g.txt', 'bar')
+
+        conf = WrappedZipFileMappingConfiguration(archive)
+        try:
+            obj = conf.create_persisted_object(archive, logger=self.logger)
+            self.assertEqual(list(obj.get_multifile_children().keys()), ['a', 'b'])
+            children = obj.get_multifile_children()['b'].get_multifile_children()
+            self.assertEqual(list(children.keys()), ['c', 'd', 'e', 'f'])
+            self.assertEqual(children['e'].ext, MULTIFILE_EXT)
+            self.assertFalse(children['c'].has_local_singlefile_path())
+
+            # streaming parser
+            rp = RootParser(logger=self.logger)
+            self.assertEqual(rp.parse_item(os.path.join(archive, 'b', 'c'), str, file_mapping_conf=conf), 'world')
+
+            # non-streaming parser: the file is copied to a temporary file
+            def read_str_from_path(desired_type: Type[str], file_path: str, encoding: str, logger: Logger) -> str:
+                with open(file_path, 'r', encoding=encoding) as f:
+                    return f.read()
+
+            rp = RootParser(register_default_parsers=False, logger=self.logger)
+            rp.register_parser(SingleFileParserFunction(read_str_from_path, streaming_mode=False,
+                                                        supported_types={str}, supported_exts={'.cfg'}))
+            self.assertEqual(rp.parse_item(os.path.join(archive, 'b', 'd'), str, file_mapping_conf=conf), 'foo')
+        finally:
+            conf.close()
+
+    def test_wrapped_zip_pickle(self):
+        """
+        Checks that pickle files are read from the archive as binary streams, without temporary copy
+        :return:
+        """
+        archive = os.path.join(self.tmp_dir, 'data.zip')
+        with ZipFile(archive, 'w') as zf:
+            zf.writestr('a.pyc', pickle.dumps({'x': [1, 2]}))
+
+        rp = RootParser(logger=self.logger)
+        conf = WrappedZipFileMappingConfiguration(archive)
+        try:
+            with patch('parsyfiles.parsing_core._copy_to_temporary_file') as copy_mock:
+                self.assertEqual(rp.parse_item(os.path.join(archive, 'a'), dict, file_mapping_conf=conf),
+                                 {'x': [1, 2]})
+            copy_mock.assert_not_called()
+        finally:
+            conf.close()
+
+        # the function reading a file path is still available
+        path = os.path.join(self.tmp_dir, 'a.pyc')
+        with open(path, 'wb') as f:
+            f.write(pickle.dumps({'x': [1, 2]}))
+        self.assertEqual(read_object_from_pickle(dict, path, 'utf-8'), {'x': [1, 2]})
+
+    def test_flat_tar(self):
+        """
+        Checks that objects can be found and parsed in a compressed tar file, in flat mode
+        :return:
+        """
+        for name, contents in [('a.txt', 'hello'), ('b--c.txt', 'world'), ('b--f--g.txt', 'bar')]:
+            with open(os.path.join(self.tmp_dir, name), 'w') as f:
+                f.write(contents)
+        archive = os.path.join(self.tmp_dir, 'data.tar.gz')
+        with tarfile.open(archive, 'w:gz') as tf:
+            for name in ['a.txt', 'b--c.txt', 'b--f--g.txt']:
+                tf.add(os.path.join(self.tmp_dir, name), arcname=name)
+
+        with FlatTarFileMappingConfiguration(archive, separator='--') as conf:
+            obj = conf.create_persisted_object(os.path.join(archive, 'b'), logger=self.logger)
+            children = obj.get_multifile_children()
+            self.assertEqual(list(children.keys()), ['c', 'f'])
+            self.assertEqual(list(children['f'].get_multifile_children().keys()), ['g'])
+
+            rp = RootParser(logger=self.logger)
+            self.assertEqual(rp.parse_item(os.path.join(archive, 'b--f--g'), str, file_mapping_conf=conf), 'bar')
+
+            # the archive was decompressed once to a temporary file, deleted on close
+            tmp_path = conf._file_system._tmp_path
+            self.assertTrue(os.path.exists(tmp_path))
+        self.assertFalse(os.path.exists(tmp_path))
+
+        # the temporary files of the configurations that are not closed, such as the copies sent to other processes,
+        # are deleted when they are garbage collected
+        conf = pickle.loads(pickle.dumps(FlatTarFileMappingConfiguration(archive, separator='--')))
+        self.assertEqual(rp.parse_item(os.path.join(archive, 'a'), str, file_mapping_conf=conf), 'hello')
+        tmp_path = conf._file_system._tmp_path
+        self.assertTrue(os.path.exists(tmp_path))
+        del conf
+        gc.collect()
+        self.assertFalse(os.path.exists(tmp_path))
+
+    def test_archive_member_names(self):
+        """
+        Checks that members stored with non-normalized names can be listed and read
+        :return:
+        """
+        archive = os.path.join(self.tmp_dir, 'data.zip')
+        with ZipFile(archive, 'w') as zf:
+            zf.writestr('col\\x.txt', 'x')
+            zf.writestr('col/./y.txt', 'y')
+            zf.writestr('./col/z.txt', 'z')
+
+        rp = RootParser(logger=self.logger)
+        conf = WrappedZipFileMappingConfiguration(archive)
+        try:
+            self.assertEqual(rp.parse_item(os.path.join(archive, 'col'), Dict[str, str], file_mapping_conf=conf),
+                             {'x': 'x', 'y': 'y', 'z': 'z'})
+        finally:
+            conf.close()
+
+        archive = os.path.join(self.tmp_dir, 'data.tar')
+        with tarfile.open(archive, 'w') as tf:
+            for name in ['col\\x.txt', 'col/./y.txt']:
+                info = tarfile.TarInfo(name)
+                info.size = 1
+                tf.addfile(info, BytesIO(name[-5:-4].encode('utf-8')))
+
+        conf = WrappedTarFileMappingConfiguration(archive)
+        try:
+            self.assertEqual(rp.parse_item(os.path.join(archive, 'col'), Dict[str, str], file_mapping_conf=conf),
+                             {'x': 'x', 'y': 'y'})
+        finally:
+            conf.close()
+
+
+class TestMemoryFileMapping(TestCase):
+
+    def test_parse_item_from_memory(self):
+        """
+        Checks that objects can be parsed from a nested dictionary
+        :return:
+        """
+        class A(object):
+            def __init__(self, x: int, y: str):
+                self.x = x
+                self.y = y
+
+        logger = getLogger('parsyfiles.tests')
+        rp = RootParser(logger=logger)
+        contents = {'a': {'x.txt': b'12', 'y.txt': 'hello'}, 'b.txt': 'world'}
+
+        self.assertEqual(rp.parse_item_from_memory(contents, str, location='b'), 'world')
+        a = rp.parse_item_from_memory(contents, A, location='a')
+        self.assertEqual((a.x, a.y), (12, 'hello'))
+        self.assertEqual(rp.parse_item_from_memory(contents['a'], A).x, 12)
+
+        with self.assertRaises(TypeError):
+            MemoryFileMappingConfiguration({'a.txt': 1})
@@ -1,13 +1,20 @@
+import asyncio
 import os
+import re
 import time
-from logging import getLogger
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from io import StringIO
+from logging import getLogger, StreamHandler, INFO
 from pprint import pprint
 from typing import List, Any, Tuple, Dict, Set
 from unittest import TestCase
 
-from parsyfiles import parse_collection, RootParser, parse_item
+from parsyfiles import parse_collection, RootParser, parse_item, get_default_root_parser, reset_default_root_parser, \
+    MemoryFileMappingConfiguration, create_parser_options
 from parsyfiles.converting_core import AnyObject
 from parsyfiles.parsing_core import SingleFileParserFunction
+from parsyfiles.parsing_combining_parsers import CascadeError
+from parsyfiles.plugins_base.support_for_collections import BackgroundDictionary
 from parsyfiles.parsing_core_api import ParsingException
 
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -126,6 +133,347 @@ class AllTests(TestCase):
                                                                                                              str]])
         print(l)
 
+    def test_default_root_parser_shared(self):
+        """
+        Tests that the module-level parse_item and parse_collection reuse the same default root parser until it is
+        reset
+        :return:
+        """
+        reset_default_root_parser()
+        rp = get_default_root_parser()
+        self.assertIs(get_default_root_parser(), rp)
+        self.assertIsNot(get_default_root_parser(logger=getLogger()), rp)
+
+        l = parse_item(fix_path('./test_data/collections'), Tuple[Dict[str, int], List[int], Set[int], Tuple[str, int,
+                                                                                                             str]])
+        self.assertEqual(list(l[1]), [1, 2, 3])
+        self.assertIs(get_default_root_parser(), rp)
+
+        reset_default_root_parser()
+        self.assertIsNot(get_default_root_parser(), rp)
+
+    def test_collection_plan_templates(self):
+        """
+        Tests that the plans of similar children of a collection are stamped out from the first one, and that they
+        remain independent
+        :return:
+        """
+        conf = MemoryFileMappingConfiguration({'a.txt': '1', 'b.txt': '2', 'c.txt': 'not an int', 'd.cfg': '4'})
+        obj = conf.create_persisted_object(conf.get_location(None), logger=getLogger())
+        pp = self.root_parser.create_parsing_plan(Dict[str, int], obj, logger=getLogger())
+
+        children = pp._get_children_parsing_plan()
+        self.assertEqual(sorted(children.keys()), ['a', 'b', 'c', 'd'])
+        for name, child_pp in children.items():
+            self.assertEqual(child_pp.obj_on_fs_to_parse.location, '<memory>/' + name)
+        self.assertIs(children['b'].parser, children['a'].parser)
+        self.assertIsNot(children['b'].active_parsing_plan, children['a'].active_parsing_plan)
+
+        # a failure in one child does not affect the plans of its siblings
+        with self.assertRaises(CascadeError):
+            children['c'].execute(getLogger(), create_parser_options())
+        self.assertEqual(children['b'].execute(getLogger(), create_parser_options()), 2)
+
+    def test_background_collection_parsing(self):
+        """
+        Tests that collections may be parsed in the background, errors being raised on access or by wait()
+        :return:
+        """
+        conf = MemoryFileMappingConfiguration({'a': {'x.txt': '1'}, 'b': {'y.txt': 'not an int'},
+                                               'c': {'z.txt': '3'}})
+        opts = create_parser_options(background_mfcollection_parsing=True)
+        res = self.root_parser.parse_item(conf.get_location(None), Dict[str, Dict[str, int]], file_mapping_conf=conf,
+                                          options=opts)
+        self.assertIsInstance(res, BackgroundDictionary)
+        self.assertEqual(sorted(res.keys()), ['a', 'b', 'c'])
+        # the children collections are parsed entirely by the thread parsing them
+        self.assertEqual(type(res['a']), dict)
+        self.assertEqual(res['c'], {'z': 3})
+        with self.assertRaises(ParsingException):
+            res['b']
+        with self.assertRaises(ParsingException):
+            res.wait()
+        self.assertTrue(res.done())
+
+        # the children may be parsed on a shared executor, that is not shut down
+        with ThreadPoolExecutor(2) as executor:
+            opts['MultifileCollectionParser']['executor'] = executor
+            for _ in range(2):
+                res = self.root_parser.parse_item(conf.get_location(None), Dict[str, Dict[str, int]],
+                                                  file_mapping_conf=conf, options=opts)
+                self.assertEqual(res['c'], {'z': 3})
+                with self.assertRaises(ParsingException):
+                    res.wait()
+
+    def test_concurrent_collection_parsing(self):
+        """
+        Tests that collection children may be parsed concurrently, with the same results and first error than when
+        they are parsed one after the other
+        :return:
+        """
+        conf = MemoryFileMappingConfiguration({'c': {'z.txt': '3'}, 'a': {'x.txt': '1'}, 'b': {'y.txt': '2'}})
+        ref = self.root_parser.parse_item(conf.get_location(None), Dict[str, Dict[str, int]], file_mapping_conf=conf)
+        with ThreadPoolExecutor(4) as executor:
+            for opts in ({'executor': executor}, {'max_workers': 2}):
+                res = self.root_parser.parse_item(conf.get_location(None), Dict[str, Dict[str, int]],
+                                                  file_mapping_conf=conf,
+                                                  options={'MultifileCollectionParser': opts})
+                self.assertEqual(res, ref)
+                self.assertEqual(list(res.keys()), ['a', 'b', 'c'])
+
+        # the error raised is the one of the first failing child in key order
+        conf = MemoryFileMappingConfiguration({'d': {'w.txt': 'nok_d'}, 'a': {'x.txt': '1'},
+                                               'b': {'y.txt': 'nok_b'}})
+        with self.assertRaises(ParsingException) as seq_err:
+            self.root_parser.parse_item(conf.get_location(None), Dict[str, Dict[str, int]], file_mapping_conf=conf)
+        with self.assertRaises(ParsingException) as par_err:
+            self.root_parser.parse_item(conf.get_location(None), Dict[str, Dict[str, int]], file_mapping_conf=conf,
+                                        options={'MultifileCollectionParser': {'max_workers': 3}})
+        for err in (seq_err, par_err):
+            self.assertIn('<memory>/b', str(err.exception))
+            self.assertNotIn('<memory>/d', str(err.exception))
+
+    def test_concurrent_object_parsing(self):
+        """
+        Tests that the attribute files of an object may be parsed concurrently, even when its parent collection is
+        parsed concurrently by the same executor
+        :return:
+        """
+        class ExecOpTest(object):
+            def __init__(self, x: float, y: float, op: str, expected_result: float):
+                self.x = x
+                self.y = y
+                self.op = op
+                self.expected_result = expected_result
+
+        conf = MemoryFileMappingConfiguration({'a': {'x.txt': '1', 'y.txt': '2', 'op.txt': '+',
+                                                     'expected_result.txt': '3'},
+                                               'b': {'x.txt': 'nok_x', 'y.txt': 'nok_y', 'op.txt': '+',
+                                                     'expected_result.txt': '3'}})
+        with ThreadPoolExecutor(1) as executor:
+            opts = {'MultifileObjectParser': {'executor': executor}}
+            res = self.root_parser.parse_item(conf.get_location(None) + '/a', ExecOpTest, file_mapping_conf=conf,
+                                              options=opts)
+            self.assertEqual(vars(res), {'x': 1.0, 'y': 2.0, 'op': '+', 'expected_result': 3.0})
+
+            # the error raised is the one of the first failing attribute in name order
+            with self.assertRaises(ParsingException) as err:
+                self.root_parser.parse_item(conf.get_location(None) + '/b', ExecOpTest, file_mapping_conf=conf,
+                                            options={'MultifileObjectParser': {'max_workers': 2}})
+            self.assertIn('<memory>/b/x', str(err.exception))
+            self.assertNotIn('<memory>/b/y', str(err.exception))
+
+            # the attributes of the collection items are parsed sequentially by the executor thread parsing the item
+            opts['MultifileCollectionParser'] = {'executor': executor}
+            with self.assertRaises(ParsingException) as err:
+                self.root_parser.parse_collection(conf.get_location(None), ExecOpTest, file_mapping_conf=conf,
+                                                  options=opts)
+            self.assertIn('<memory>/b/x', str(err.exception))
+
+    def test_plan_executor(self):
+        """
+        Tests that a whole parsing plan may be executed as a dependency graph by a thread pool, with the same result
+        and error than when it is executed by the calling thread
+        :return:
+        """
+        contents = {'big': {str(i): {'x.txt': str(i), 'y.txt': '0'} for i in range(20)}, 'small': {'z': {'t.txt': '1'}}}
+        conf = MemoryFileMappingConfiguration(contents)
+        typ = Dict[str, Dict[str, Dict[str, int]]]
+        ref = self.root_parser.parse_item(conf.get_location(None), typ, file_mapping_conf=conf)
+        with ThreadPoolExecutor(3) as executor:
+            res = self.root_parser.parse_item(conf.get_location(None), typ, file_mapping_conf=conf,
+                                              plan_executor=executor)
+            self.assertEqual(res, ref)
+            self.assertEqual(list(res['big'].keys()), sorted(str(i) for i in range(20)))
+
+            # lazy collections are executed as a whole
+            res = self.root_parser.parse_item(conf.get_location(None), typ, file_mapping_conf=conf,
+                                              options=create_parser_options(lazy_mfcollection_parsing=True),
+                                              plan_executor=executor)
+            self.assertEqual(dict(res['small']['z']), {'t': 1})
+
+            contents['big']['12']['y.txt'] = 'nok_12'
+            contents['big']['3']['x.txt'] = 'nok_3'
+            conf = MemoryFileMappingConfiguration(contents)
+            with self.assertRaises(ParsingException) as seq_err:
+                self.root_parser.parse_item(conf.get_location(None), typ, file_mapping_conf=conf)
+            with self.assertRaises(ParsingException) as par_err:
+                self.root_parser.parse_item(conf.get_location(None), typ, file_mapping_conf=conf,
+                                            plan_executor=executor)
+            self.assertIn('<memory>/big/12/y', str(par_err.exception))
+            # (only the addresses of the objects in the messages differ)
+            self.assertEqual(re.sub('0x[0-9a-f]+', '', str(par_err.exception)),
+                             re.sub('0x[0-9a-f]+', '', str(seq_err.exception)))
+
+        # tasks that can not be submitted make the parsing fail instead of waiting forever
+        with self.assertRaises(RuntimeError):
+            self.root_parser.parse_item(conf.get_location(None), typ, file_mapping_conf=conf, plan_executor=executor)
+
+        # only thread pools are supported
+        with ProcessPoolExecutor(1) as pool:
+            with self.assertRaises(TypeError):
+                self.root_parser.parse_item(conf.get_location(None), typ, file_mapping_conf=conf, plan_executor=pool)
+
+    def test_process_pool_collection_parsing(self):
+        """
+        Tests that the items of a collection may be parsed by worker processes, each rebuilding its own RootParser
+        :return:
+        """
+        conf = MemoryFileMappingConfiguration({'c': {'z.txt': '3'}, 'a': {'x.txt': '1'}, 'b': {'y.txt': 'nok'}})
+        with ProcessPoolExecutor(2) as pool:
+            it = self.root_parser.iter_collection(conf.get_location(None), Dict[str, int], file_mapping_conf=conf,
+                                                  process_pool=pool)
+            self.assertEqual(next(it), ('a', {'x': 1}))
+            with self.assertRaises(ParsingException):
+                next(it)
+
+            conf = MemoryFileMappingConfiguration({'c': {'z.txt': '3'}, 'a': {'x.txt': '1', 'y.txt': '2'}})
+            res = self.root_parser.parse_collection(conf.get_location(None), Dict[str, int], file_mapping_conf=conf,
+                                                    process_pool=pool, root_parser_factory=RootParser)
+            self.assertEqual(res, self.root_parser.parse_collection(conf.get_location(None), Dict[str, int],
+                                                                    file_mapping_conf=conf))
+
+    def test_async_parsing(self):
+        """
+        Tests the coroutine versions of parse_item and parse_collection
+        :return:
+        """
+        conf = MemoryFileMappingConfiguration({'c': {'z.txt': '3'}, 'a': {'x.txt': '1', 'y.txt': '2'},
+                                               'b': {'w.txt': 'nok'}})
+        loop = asyncio.new_event_loop()
+        try:
+            res = loop.run_until_complete(self.root_parser.parse_item_async(conf.get_location(None) + '/a',
+                                                                            Dict[str, int], file_mapping_conf=conf))
+            self.assertEqual(res, {'x': 1, 'y': 2})
+
+            with ThreadPoolExecutor(4) as executor:
+                coro = self.root_parser.parse_collection_async(conf.get_location(None), Dict[str, int],
+                                                               file_mapping_conf=conf, executor=executor,
+                                                               max_concurrency=2)
+                with self.assertRaises(ParsingException) as err:
+                    loop.run_until_complete(coro)
+                self.assertIn('<memory>/b', str(err.exception))
+
+                conf = MemoryFileMappingConfiguration({'c': {'z.txt': '3'}, 'a': {'x.txt': '1', 'y.txt': '2'}})
+                res = loop.run_until_complete(self.root_parser.parse_collection_async(
+                    conf.get_location(None), Dict[str, int], file_mapping_conf=conf, executor=executor))
+                self.assertEqual(list(res.items()), [('a', {'x': 1, 'y': 2}), ('c', {'z': 3})])
+        finally:
+            loop.close()
+
+    def test_nested_parsing_order(self):
+        """
+        Tests that the children are parsed depth-first in key order, and that the ones following a failing child are
+        not parsed, whatever the depth of the tree
+        :return:
+        """
+        class Foo(object):
+            def __init__(self, a: int, b: Dict[str, int], c: int):
+                self.a, self.b, self.c = a, b, c
+
+        def parsed_locations(logs: StringIO):
+            return [line.split(' ')[1] for line in logs.getvalue().splitlines() if line.startswith('Parsing <')]
+
+        logs = StringIO()
+        logger = getLogger('parsyfiles.tests.nested_parsing_order')
+        logger.setLevel(INFO)
+        logger.propagate = False
+        logger.addHandler(StreamHandler(logs))
+        rp = RootParser(logger=logger)
+
+        # a shallow tree
+        conf = MemoryFileMappingConfiguration({'foo': {'a.txt': '1', 'b': {'x.txt': '2'}, 'c.txt': '3'}})
+        foo = rp.parse_item(conf.get_location(None) + '/foo', Foo, file_mapping_conf=conf)
+        self.assertEqual((foo.a, foo.b, foo.c), (1, {'x': 2}, 3))
+        self.assertEqual(parsed_locations(logs), ['<memory>/foo', '<memory>/foo/a', '<memory>/foo/b',
+                                                  '<memory>/foo/b/x', '<memory>/foo/c'])
+
+        logs.truncate(0)
+        logs.seek(0)
+        conf = MemoryFileMappingConfiguration({'foo': {'a.txt': '1', 'b': {'x.txt': 'nok'}, 'c.txt': '3'}})
+        with self.assertRaises(ParsingException):
+            rp.parse_item(conf.get_location(None) + '/foo', Foo, file_mapping_conf=conf)
+        self.assertNotIn('<memory>/foo/c', parsed_locations(logs))
+
+        # a tree deeper than the recursion limit
+        def deep_tree(depth: int, deepest_contents: Dict[str, str]):
+            contents = {'d': deepest_contents, 'e': {'x.txt': '3'}}
+            for _ in range(depth - 2):
+                contents = {'d': contents}
+            return MemoryFileMappingConfiguration({'d': contents})
+
+        depth = 300
+        item_type = int
+        for _ in range(depth):
+            item_type = Dict[str, item_type]
+        expected = {'d': {'a': 1, 'b': 2}, 'e': {'x': 3}}
+        for _ in range(depth - 2):
+            expected = {'d': expected}
+        conf = deep_tree(depth, {'a.txt': '1', 'b.txt': '2'})
+        location = conf.get_location(None) + '/d' * (depth - 1)
+        logs.truncate(0)
+        logs.seek(0)
+        self.assertEqual(rp.parse_item(conf.get_location(None) + '/d', item_type, file_mapping_conf=conf), expected)
+        self.assertEqual(parsed_locations(logs)[-4:], [location + '/d/a', location + '/d/b', location + '/e',
+                                                       location + '/e/x'])
+
+        # the error in the deepest folder is raised, and the files following it are not parsed
+        conf = deep_tree(depth, {'a.txt': 'nok', 'b.txt': '2'})
+        logs.truncate(0)
+        logs.seek(0)
+        with self.assertRaises(ParsingException):
+            rp.parse_item(conf.get_location(None) + '/d', item_type, file_mapping_conf=conf)
+        self.assertIn(location + '/d/a', parsed_locations(logs))
+        self.assertNotIn(location + '/d/b', parsed_locations(logs))
+        self.assertNotIn(location + '/e', parsed_locations(logs))
+
+    def test_lazy_plugins(self):
+        """
+        Tests that the optional plugins are only loaded when a matching extension or type is looked up, and that the
+        resulting parsers are the same than when they are loaded at construction
+        :return:
+        """
+        rp = RootParser()
+        self.assertEqual(rp.get_loaded_plugins(), ['primitive types', 'collections', 'objects', 'config'])
+        self.assertEqual(rp.get_pending_plugins(), ['jprops', 'yaml', 'numpy', 'pandas'])
+
+        rp.find_all_matching_parsers(strict=False, desired_type=dict, required_ext='.cfg')
+        self.assertEqual(rp.get_pending_plugins(), ['jprops', 'yaml', 'numpy', 'pandas'])
+
+        # only the relevant plugin is loaded
+        rp.find_all_matching_parsers(strict=False, desired_type=dict, required_ext='.yaml')
+        self.assertEqual(rp.get_pending_plugins(), ['jprops', 'numpy', 'pandas'])
+
+        from pandas import DataFrame
+        rp.get_all_conversion_chains_to_type(DataFrame)
+        self.assertEqual(rp.get_pending_plugins(), ['jprops', 'numpy'])
+
+        # a '.txt' file is only read with jprops when a dictionary is asked for
+        rp.find_all_matching_parsers(strict=False, desired_type=int, required_ext='.txt')
+        self.assertEqual(rp.get_pending_plugins(), ['jprops', 'numpy'])
+        rp.find_all_matching_parsers(strict=False, desired_type=dict, required_ext='.txt')
+        self.assertEqual(rp.get_pending_plugins(), ['numpy'])
+
+        rp.load_all_plugins()
+        self.assertEqual(rp.get_pending_plugins(), [])
+
+        # the parsers and converters of each plugin are registered at their declared position
+        eager_rp = RootParser(lazy_plugins=False)
+        self.assertEqual(eager_rp.get_pending_plugins(), [])
+        self.assertEqual([str(p) for p in rp.get_all_parsers(strict_type_matching=False)],
+                         [str(p) for p in eager_rp.get_all_parsers(strict_type_matching=False)])
+        self.assertEqual([str(c) for c in rp._converters], [str(c) for c in eager_rp._converters])
+
+    def test_lazy_plugins_txt(self):
+        """
+        Tests that parsing a '.txt' file into a type that is neither a dict nor a pandas type does not load jprops nor
+        pandas
+        :return:
+        """
+        rp = RootParser()
+        self.assertEqual(rp.parse_item(fix_path('./test_data/collections/dict/a'), int), 1)
+        self.assertEqual(rp.get_pending_plugins(), ['jprops', 'yaml', 'numpy', 'pandas'])
+
 
 class DemoTests(TestCase):
     """
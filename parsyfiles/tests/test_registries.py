@@ -1,12 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from random import shuffle
-from typing import Generic, TypeVar, Dict, Type, Any
+from typing import Generic, TypeVar, Dict, Type, Any, Mapping
 from unittest import TestCase
 
-from parsyfiles.converting_core import AnyObject
+from parsyfiles.converting_core import AnyObject, ConverterFunction, is_any_type, get_validated_type
 from parsyfiles.filesystem_mapping import MULTIFILE_EXT, PersistedObject
 from parsyfiles.parsing_core import SingleFileParserFunction, MultiFileParser, AnyParser, T, _BaseParsingPlan
-from parsyfiles.parsing_registries import ParserCache
+from parsyfiles.parsing_combining_parsers import CascadingParser
+from parsyfiles.parsing_registries import ParserCache, ParserRegistryWithConverters, ConverterCache, \
+    RegistryFrozenError
 from parsyfiles.type_inspection_tools import get_pretty_type_str
 
 
@@ -363,3 +366,181 @@ class TestParserRegistry(TestCase):
                     specific.remove(s)
 
             self.assertEquals(set(matching[2]), specific)
+
+    def test_f_indexed_lookup_same_as_asking_each_parser(self):
+        """
+        Checks that the lookup using the indexes returns the same lists than asking each parser in registration order
+        :return:
+        """
+        def reference_lookup(parsers, strict, desired_type, required_ext):
+            res = [], [], [], [], []
+            for p in parsers:
+                match, exact_match = p.is_able_to_parse(desired_type=desired_type, desired_ext=required_ext,
+                                                        strict=strict)
+                if match:
+                    if is_any_type(desired_type):
+                        res[2].append(p)
+                    else:
+                        res[0 if exact_match is None or exact_match else 1].append(p)
+                elif p.is_able_to_parse(desired_type=None, desired_ext=required_ext, strict=strict)[0]:
+                    res[2].append(p)
+                elif p.is_able_to_parse(desired_type=desired_type, desired_ext=None, strict=strict)[0]:
+                    res[3].append(p)
+                else:
+                    res[4].append(p)
+            return res
+
+        def parse_dict():
+            pass
+
+        r = self.create_shuffled_registry()
+        r.register_parser(SingleFileParserFunction(parse_dict, supported_types={dict}, supported_exts={'.a', '.b'}))
+        custom_parser = SingleFileParserFunction(parse_dict, supported_types={self.A, self.D},
+                                                 supported_exts={'.a', '.c'})
+        custom_parser.is_able_to_parse_func = lambda strict, typ: typ is not self.D
+        r.register_parser(custom_parser)
+        specific_parsers = [p for p in r.get_all_parsers(strict_type_matching=True) if not p.is_generic()]
+
+        for strict in (True, False):
+            for typ in self.all_types | {None, dict, Mapping, object}:
+                for ext in self.all_extensions | {None}:
+                    if typ is None and ext is None:
+                        continue
+                    (_, approx, exact), no_type_match, no_ext_match, no_match = \
+                        r.find_all_matching_parsers(strict=strict, desired_type=typ, required_ext=ext)
+                    expected = reference_lookup(specific_parsers, strict, get_validated_type(typ, 'typ', False), ext)
+                    self.assertEqual([p for p in exact if not p.is_generic()], expected[0])
+                    self.assertEqual(approx, expected[1])
+                    self.assertEqual([p for p in no_type_match if not p.is_generic()], expected[2])
+                    self.assertEqual([p for p in no_ext_match if not p.is_generic()], expected[3])
+                    self.assertEqual(no_match, expected[4])
+
+
+class TestParserLookupCache(TestCase):
+
+    def test_lookup_memoized_and_invalidated(self):
+        """
+        Checks that parser lookups are memoized, and that registering a parser or a converter invalidates them
+        :return:
+        """
+        def read_str(desired_type: Type[str], file_object, logger: Logger, *args, **kwargs) -> str:
+            return file_object.read()
+
+        def read_int(desired_type: Type[int], file_object, logger: Logger, *args, **kwargs) -> int:
+            return int(file_object.read())
+
+        def int_to_float(desired_type: Type[float], i: int, logger: Logger, *args, **kwargs) -> float:
+            return float(i)
+
+        class FakeObject(object):
+            ext = '.txt'
+
+        p_str = SingleFileParserFunction(read_str, supported_types={str}, supported_exts={'.txt'})
+        registry = ParserRegistryWithConverters('test', strict_matching=False, initial_parsers_to_register=[p_str])
+
+        # memoized, but returned lists are copies
+        res = registry.find_all_matching_parsers(strict=False, desired_type=str, required_ext='.txt')
+        self.assertEqual(res[0][2], [p_str])
+        res[0][2].clear()
+        self.assertEqual(registry.find_all_matching_parsers(strict=False, desired_type=str, required_ext='.txt'),
+                         (([], [], [p_str]), [], [], []))
+        self.assertIs(registry.build_parser_for_fileobject_and_desiredtype(FakeObject(), str), p_str)
+
+        # registering a parser invalidates the lookups
+        p_str_2 = SingleFileParserFunction(read_str, supported_types={str}, supported_exts={'.txt'},
+                                           custom_name='read_str_2')
+        registry.register_parser(p_str_2)
+        parser = registry.build_parser_for_fileobject_and_desiredtype(FakeObject(), str)
+        self.assertIsInstance(parser, CascadingParser)
+        self.assertIs(registry.build_parser_for_fileobject_and_desiredtype(FakeObject(), str), parser)
+
+        # registering a converter too
+        registry.register_parser(SingleFileParserFunction(read_int, supported_types={int}, supported_exts={'.cfg'}))
+        self.assertEqual(registry.find_all_matching_parsers(strict=False, desired_type=float,
+                                                            required_ext='.cfg')[0], ([], [], []))
+        registry.register_converter(ConverterFunction(int, float, int_to_float))
+        self.assertEqual(len(registry.find_all_matching_parsers(strict=False, desired_type=float,
+                                                                required_ext='.cfg')[0][2]), 1)
+
+    def test_frozen_registry(self):
+        """
+        Checks that a frozen registry rejects registrations and serves the precomputed lookups, including from threads
+        :return:
+        """
+        def read_int(desired_type: Type[int], file_object, logger: Logger, *args, **kwargs) -> int:
+            return int(file_object.read())
+
+        def int_to_float(desired_type: Type[float], i: int, logger: Logger, *args, **kwargs) -> float:
+            return float(i)
+
+        class FakeObject(object):
+            ext = '.cfg'
+
+        p_int = SingleFileParserFunction(read_int, supported_types={int}, supported_exts={'.cfg'})
+        registry = ParserRegistryWithConverters('test', strict_matching=False, initial_parsers_to_register=[p_int])
+        registry.register_converter(ConverterFunction(int, float, int_to_float))
+        self.assertIs(registry.freeze(), registry)
+        self.assertTrue(registry.is_frozen())
+
+        # the lookups for the parser and converter types are precomputed
+        self.assertIs(registry._parsers_for_type_and_ext_cache[(int, '.cfg')], p_int)
+        self.assertIn((float, '.cfg'), registry._parsers_for_type_and_ext_cache)
+
+        with self.assertRaises(RegistryFrozenError):
+            registry.register_parser(SingleFileParserFunction(read_int, supported_types={int}, supported_exts={'.a'}))
+        with self.assertRaises(RegistryFrozenError):
+            registry.register_converter(ConverterFunction(float, int, int_to_float))
+
+        # concurrent lookups all get the same parser
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parsers = list(executor.map(lambda i: registry.build_parser_for_fileobject_and_desiredtype(FakeObject(),
+                                                                                                      float),
+                                        range(20)))
+        self.assertTrue(all(p is parsers[0] for p in parsers))
+
+
+class TestConverterCache(TestCase):
+
+    def test_chains_found_on_demand(self):
+        """
+        Checks that registering converters does not create chains, and that the chains found at query time are cached
+        until the next registration
+        :return:
+        """
+        class A(object):
+            pass
+
+        class B(object):
+            pass
+
+        class C(object):
+            pass
+
+        def convert(desired_type: Type[Any], source: Any, logger: Logger, *args, **kwargs) -> Any:
+            pass
+
+        a_to_b = ConverterFunction(A, B, convert, custom_name='a_to_b')
+        b_to_c = ConverterFunction(B, C, convert, custom_name='b_to_c')
+        c_to_any = ConverterFunction(C, AnyObject, convert, custom_name='c_to_any')
+        cache = ConverterCache(strict_matching=True)
+        cache.register_converters([a_to_b, b_to_c, c_to_any])
+        self.assertIsNone(cache._conversion_graph)
+
+        def to_lists(res):
+            return [[chain._converters_list for chain in chains] for chains in res]
+
+        generic, approx, exact = cache.get_all_conversion_chains(to_type=C)
+        self.assertEqual(to_lists((generic, approx, exact)),
+                         [[[a_to_b, b_to_c, c_to_any], [b_to_c, c_to_any], [c_to_any]], [],
+                          [[a_to_b, b_to_c], [b_to_c]]])
+
+        # cached
+        self.assertIs(cache.get_all_conversion_chains(to_type=C)[2][0], exact[0])
+        self.assertEqual(to_lists(cache.get_all_conversion_chains(from_type=A, to_type=AnyObject)),
+                         [[], [], [[a_to_b, b_to_c, c_to_any]]])
+        self.assertEqual(len(cache.get_all_conversion_chains()[0]), 3)
+
+        # a new converter invalidates the results
+        c_to_a = ConverterFunction(C, A, convert, custom_name='c_to_a')
+        cache.register_converter(c_to_a)
+        self.assertEqual(to_lists(cache.get_all_conversion_chains(from_type=B, to_type=A))[2], [[b_to_c, c_to_a]])